@@ -64,8 +64,9 @@ def compute_stats_from_cog_bytes(
     """
     Compute zonal statistics from raw COG bytes (used by backfill task).
 
-    Reads band 1 from the COG, replaces nodata with NaN, then delegates
-    to compute_stats_from_array which handles the single-MemoryFile pattern.
+    Reads band 1 from the COG, replaces nodata with NaN and decodes a
+    quantized COG's scale/offset, then delegates to compute_stats_from_array
+    which handles the single-MemoryFile pattern.
     """
     with rasterio.open(io.BytesIO(cog_bytes)) as src:
         data = src.read(1).astype(np.float32)
@@ -75,6 +76,10 @@ def compute_stats_from_cog_bytes(
         if src.nodata is not None:
             data[data == src.nodata] = np.nan
 
+        scale, offset = src.scales[0], src.offsets[0]
+        if (scale, offset) != (1.0, 0.0):
+            data = data * np.float32(scale) + np.float32(offset)
+
     data[~np.isfinite(data)] = np.nan
 
     return compute_stats_from_array(data, transform, crs, boundaries)
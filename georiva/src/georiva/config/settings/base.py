@@ -601,6 +601,13 @@ VUE_FRONTEND_STATIC_PATH = 'vue'
 # Temp directory for intermediate files processing.
 GEORIVA_TEMP_DIR = env("GEORIVA_TEMP_DIR", default="/var/tmp/georiva")
 
+# Source files up to this size are downloaded to GEORIVA_RAM_TEMP_DIR (tmpfs)
+# instead of the OS temp dir, so the reads that follow never touch the disk.
+# Larger files, or ones that won't fit in the tmpfs's free space, use disk.
+# 0 disables.
+GEORIVA_RAM_TEMP_DIR = env("GEORIVA_RAM_TEMP_DIR", default="/dev/shm")
+GEORIVA_RAM_TEMP_MAX_BYTES = env.int("GEORIVA_RAM_TEMP_MAX_BYTES", default=256 * 1024 * 1024)
+
 # Pixel threshold above which variable processing switches to chunked mode.
 # 4096×4096 = 16M pixels ≈ 64MB float32 per array.
 # Increase for machines with more RAM, decrease for constrained workers.
@@ -608,3 +615,96 @@ GEORIVA_CHUNK_THRESHOLD_PIXELS = env.int(
     "GEORIVA_CHUNK_THRESHOLD_PIXELS",
     default=4096 * 4096
 )
+
+# Blocks of a chunked extraction — and the tiles of multi-source transforms
+# and streamed stats — read concurrently, in threads. 1 = serial.
+# Keeps several reads in flight on NVMe / network-backed temp storage.
+# GeoTIFF reads use a handle per thread; NetCDF and GRIB reads go through
+# xarray's backend lock, so they gain little. Multiplies with the variable
+# and timestamp concurrency below.
+GEORIVA_CHUNK_READ_CONCURRENCY = env.int("GEORIVA_CHUNK_READ_CONCURRENCY", default=1)
+
+# Pixel threshold above which a variable's read window (the whole grid, or its
+# clip window) is streamed: read, masked and written into its COG tile by
+# tile, so the full array is never held in memory.
+# 8192×8192 = 64M pixels ≈ 256MB float32. 0 disables streaming.
+GEORIVA_STREAM_THRESHOLD_PIXELS = env.int(
+    "GEORIVA_STREAM_THRESHOLD_PIXELS",
+    default=8192 * 8192
+)
+
+# Largest source grid (in pixels) read at full extent when a boundary-clipped
+# collection's clip window cannot be computed (boundary and source don't
+# intersect). Bigger grids fail the timestamp instead of reading a raster that
+# masking would blank out entirely. 0 always falls back to the full extent.
+GEORIVA_CLIP_FALLBACK_MAX_PIXELS = env.int(
+    "GEORIVA_CLIP_FALLBACK_MAX_PIXELS",
+    default=4096 * 4096
+)
+
+# Boundary masks (one bool per pixel of the clipped grid) kept per worker
+# process, shared across files and derivation units that clip to the same
+# boundary on the same grid. 0 = rasterize once per file only.
+GEORIVA_CLIP_MASK_CACHE_SIZE = env.int("GEORIVA_CLIP_MASK_CACHE_SIZE", default=8)
+
+# Deflate level (1–9) for COG assets. 6 is GDAL's default; lower levels
+# encode faster for a somewhat larger file, higher ones suit archival.
+GEORIVA_COG_DEFLATE_LEVEL = env.int("GEORIVA_COG_DEFLATE_LEVEL", default=6)
+
+# COG encoding first writes the raster uncompressed, then translates it into
+# the final COG. Rasters up to this many uncompressed bytes are staged in
+# memory rather than in GEORIVA_TEMP_DIR — held once per concurrently encoded
+# variable. 0 always stages on disk.
+GEORIVA_COG_RAW_IN_MEMORY_MAX_BYTES = env.int(
+    "GEORIVA_COG_RAW_IN_MEMORY_MAX_BYTES", default=256 * 1024 * 1024
+)
+
+# GDAL threads for COG compression and overview building (GDAL_NUM_THREADS):
+# a count or ALL_CPUS. Lower it when GEORIVA_VARIABLE_CONCURRENCY > 1 so the
+# writers of concurrent variables don't oversubscribe the cores.
+GEORIVA_COG_NUM_THREADS = env.str("GEORIVA_COG_NUM_THREADS", default="ALL_CPUS")
+
+# COG uploads run in the background, in threads, while the next variable is
+# extracted and encoded. Also the most encoded COGs left waiting on local temp
+# disk for their upload before encoding blocks. 0 = upload inline.
+GEORIVA_UPLOAD_CONCURRENCY = env.int("GEORIVA_UPLOAD_CONCURRENCY", default=4)
+
+# Attempts per COG upload before the variable fails; retries back off
+# exponentially (1 s, 2 s, 4 s …).
+GEORIVA_UPLOAD_ATTEMPTS = env.int("GEORIVA_UPLOAD_ATTEMPTS", default=3)
+
+# Variables of one timestamp processed concurrently, in threads. 1 = serial.
+# Reads, COG encoding and uploads release the GIL, so multi-variable
+# collections scale up to roughly the core count. Each thread holds its own
+# extracted array and database connection — size worker memory accordingly.
+# 0 = one thread per CPU (capped at the collection's variable count).
+GEORIVA_VARIABLE_CONCURRENCY = env.int("GEORIVA_VARIABLE_CONCURRENCY", default=1)
+
+# Timestamps of one file processed concurrently, in threads — one pool shared
+# by all the collections the file feeds. 1 = serial. 0 = one thread per CPU
+# (capped at the file's timestamp count).
+# Multiplies with GEORIVA_VARIABLE_CONCURRENCY — a worker may run up to
+# timestamp × variable concurrency extractions (and DB connections) at once.
+GEORIVA_TIMESTAMP_CONCURRENCY = env.int("GEORIVA_TIMESTAMP_CONCURRENCY", default=1)
+
+# Timestamps of one file after which the collection extents and item counts
+# held back during ingestion are written — a worker killed mid-file loses at
+# most this many timestamps' worth. 0 = only once the file is done.
+GEORIVA_EXTENT_FLUSH_TIMESTAMPS = env.int("GEORIVA_EXTENT_FLUSH_TIMESTAMPS", default=24)
+
+# Seconds a failed file ingestion waits before its first retry; each later
+# retry waits twice as long as the one before. Retries are scheduled in Redis
+# and queued by a beat task every few seconds; the sweep only retries
+# failures that are not on that schedule, or are long overdue on it. The
+# default matches the sweep interval, so the retries span ~15 minutes as
+# they did when the sweep queued them.
+GEORIVA_INGESTION_RETRY_DELAY = env.int("GEORIVA_INGESTION_RETRY_DELAY", default=300)
+
+# Bucket scans (the sweeps) list each top-level directory — one per
+# organisation — on its own thread, this many at a time. Listing is bound by
+# storage round-trips, so threads scale close to linearly. 1 = serial.
+GEORIVA_LISTING_CONCURRENCY = env.int("GEORIVA_LISTING_CONCURRENCY", default=8)
+
+# Above this many pixels, asset mean/std are computed from a regular subsample
+# of about this size (min/max stay exact). 0 keeps stats exact for every asset.
+GEORIVA_STATS_MAX_PIXELS = env.int("GEORIVA_STATS_MAX_PIXELS", default=0)
@@ -26,6 +26,9 @@ Value format (JSON):
 
 import json
 import logging
+from functools import lru_cache
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -56,37 +59,47 @@ def build_colormap_256(palette_stops: list, vmin: float, vmax: float) -> dict:
 
     Clamps values outside the stop range to the nearest stop color.
     Returns a grayscale fallback if stops are empty or range is degenerate.
+
+    The table only depends on its inputs, and STAC responses rebuild it for
+    every style they list, so it is memoized on them; each call still gets
+    its own dict to mutate.
     """
-    if not palette_stops:
-        return {i: [i, i, i, 255] for i in range(256)}
+    key = tuple((value, tuple(color)) for value, color in palette_stops)
+    table = _colormap_256(key, vmin, vmax)
+    return {i: list(color) for i, color in enumerate(table)}
+
+
+@lru_cache(maxsize=512)
+def _colormap_256(stops: tuple, vmin: float, vmax: float) -> tuple:
+    """build_colormap_256's table as a tuple of 256 (r, g, b, a) tuples."""
+    if not stops:
+        return tuple((i, i, i, 255) for i in range(256))
 
     val_range = vmax - vmin
     if val_range == 0:
-        color = _ensure_rgba(palette_stops[0][1])
-        return {i: color for i in range(256)}
-
-    stops = sorted(palette_stops, key=lambda s: s[0])
-    positions = [(s[0] - vmin) / val_range * 255 for s in stops]
-    colors = [_ensure_rgba(s[1]) for s in stops]
-
-    result = {}
-    for i in range(256):
-        if i <= positions[0]:
-            result[i] = colors[0]
-        elif i >= positions[-1]:
-            result[i] = colors[-1]
-        else:
-            for j in range(len(positions) - 1):
-                if positions[j] <= i <= positions[j + 1]:
-                    span = positions[j + 1] - positions[j]
-                    t = (i - positions[j]) / span if span > 0 else 0
-                    result[i] = [
-                        round(colors[j][k] + t * (colors[j + 1][k] - colors[j][k]))
-                        for k in range(4)
-                    ]
-                    break
-
-    return result
+        return (tuple(_ensure_rgba(list(stops[0][1]))),) * 256
+
+    ordered = sorted(stops, key=lambda s: s[0])
+    positions = np.array([(s[0] - vmin) / val_range * 255 for s in ordered])
+    colors = np.array([_ensure_rgba(list(s[1])) for s in ordered], dtype=float)
+
+    # All 256 entries at once: entry i interpolates between stop k-1 and the
+    # first stop k positioned at or after i — with coincident stops (stepped
+    # styles) that is the left-hand class, as a stop-by-stop scan finds.
+    index = np.arange(256)
+    k = np.clip(np.searchsorted(positions, index, side="left"), 1, len(positions) - 1)
+    left, right = positions[k - 1], positions[k]
+    span = right - left
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(span > 0, (index - left) / span, 0.0)
+    table = np.rint(colors[k - 1] + t[:, None] * (colors[k] - colors[k - 1]))
+
+    # Clamp outside the stop range to the end colors (the first stop wins
+    # where both apply)
+    table[index >= positions[-1]] = colors[-1]
+    table[index <= positions[0]] = colors[0]
+
+    return tuple(map(tuple, table.astype(np.int64).tolist()))
 
 
 def build_variable_payload(variable, style=None) -> dict:
@@ -84,7 +84,7 @@ class Command(BaseCommand):
             prefix = f"{coll.catalog.storage_prefix}/{coll.slug}"
             objects = [
                 f["path"]
-                for f in storage.assets.list_files(prefix, recursive=True)
+                for f in storage.assets.iter_files(prefix, recursive=True)
             ]
             live = set(
                 Asset.objects
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.6 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('georivacore', '0015_alter_variable_value_max_alter_variable_value_min'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='catalog',
+            name='emit_per_variable_metadata',
+            field=models.BooleanField(default=False, help_text="Also write a JSON metadata file next to every variable's COG. Every item gets one metadata file covering all its variables either way."),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.6 on 2026-10-16 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('georivacore', '0016_catalog_emit_per_variable_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='variable',
+            name='quantize',
+            field=models.BooleanField(default=False, help_text="Store this variable's COGs as 16-bit integers over its value range, with a scale/offset that readers apply to decode them back to values. Halves storage and upload size, at a resolution of (max - min) / 65534; values outside the range are clamped to it. Leave off for variables that need full precision."),
+        ),
+    ]
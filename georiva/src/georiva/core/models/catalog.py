@@ -106,6 +106,11 @@ class Catalog(Indexed, TimeStampedModel):
     
     file_format = models.CharField(max_length=20, choices=FileFormat.choices)
     archive_source_files = models.BooleanField(default=False, help_text="Should archive source files")
+    emit_per_variable_metadata = models.BooleanField(
+        default=False,
+        help_text="Also write a JSON metadata file next to every variable's COG. "
+                  "Every item gets one metadata file covering all its variables either way.",
+    )
     is_active = models.BooleanField(default=True)
     
     boundary = models.ForeignKey(
@@ -152,6 +157,7 @@ class Catalog(Indexed, TimeStampedModel):
         MultiFieldPanel([
             FieldPanel('file_format'),
             FieldPanel('archive_source_files'),
+            FieldPanel('emit_per_variable_metadata'),
         ], heading="Ingestion Configuration"),
         MultiFieldPanel([
             FieldPanel('boundary'),
@@ -4,6 +4,7 @@ from typing import Optional
 from django import forms
 from django.contrib.postgres.fields import ArrayField
 from django.db import models
+from django.utils.functional import cached_property
 from django_extensions.db.models import TimeStampedModel
 from modelcluster.models import ClusterableModel
 from wagtail.admin.forms import WagtailAdminModelForm
@@ -321,6 +322,17 @@ class Collection(AbstractCollection, TimeStampedModel, ClusterableModel):
             return self.time_end.strftime('%Y-%m')
         return self.time_end.strftime('%Y-%m-%d')
     
+    @cached_property
+    def active_variables(self) -> list:
+        """
+        Active variables in ``sort_order``, filtered once per instance.
+
+        Filters ``variables.all()`` in Python rather than querying, so an
+        instance fetched with the variables prefetched (as ingestion does)
+        pays no query here, and every timestamp of a file reuses the list.
+        """
+        return [v for v in self.variables.all() if v.is_active]
+    
     def source_variables_list(self):
         """Return a list of source variable names in this collection."""
         source_vars = []
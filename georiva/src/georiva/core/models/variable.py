@@ -185,6 +185,17 @@ class Variable(TimeStampedModel, ClusterableModel, Orderable):
         )
     )
     
+    # Storage
+    quantize = models.BooleanField(
+        default=False,
+        help_text=(
+            "Store this variable's COGs as 16-bit integers over its value range, with a "
+            "scale/offset that readers apply to decode them back to values. Halves storage "
+            "and upload size, at a resolution of (max - min) / 65534; values outside the "
+            "range are clamped to it. Leave off for variables that need full precision."
+        )
+    )
+    
     # Status
     is_active = models.BooleanField(
         default=True,
@@ -214,6 +225,7 @@ class Variable(TimeStampedModel, ClusterableModel, Orderable):
         # surface is the one place that tunes them (ADR 0022).
         StylingSummaryPanel(heading="Styling"),
         FieldPanel('transform_type'),
+        FieldPanel('quantize'),
         FieldPanel('sources'),
     ]
     
@@ -23,6 +23,7 @@ Examples:
 
 import re
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -32,6 +33,8 @@ import pytz
 GEORIVA_REFTIME_PATTERN = re.compile(r'^GR--(\d{8}T\d{4})--(.+)$')
 GEORIVA_REFTIME_FORMAT = '%Y%m%dT%H%M'
 
+_PATH_FIELDS = ('org', 'catalog', 'collection', 'reference_time', 'original_name')
+
 
 # =============================================================================
 # Filename operations
@@ -152,9 +155,19 @@ def parse_path(file_path: str) -> dict:
             'original_name': str,
         }
     """
-    parts = Path(file_path).parts
-    filename = Path(file_path).name
-    parsed = parse_filename(filename)
+    return dict(zip(_PATH_FIELDS, _parse_path(file_path)))
+
+
+@lru_cache(maxsize=4096)
+def _parse_path(file_path: str) -> tuple:
+    """
+    parse_path's fields as an immutable tuple, memoized — the event
+    consumer, the sweeps and retries parse the same keys again and again.
+    Callers each get their own dict built from it.
+    """
+    path = Path(file_path)
+    parts = path.parts
+    parsed = parse_filename(path.name)
 
     if len(parts) >= 4:
         # {org}/{catalog}/{collection}/[...dirs...]/{filename}
@@ -171,13 +184,7 @@ def parse_path(file_path: str) -> dict:
         catalog = None
         collection = None
 
-    return {
-        'org': org,
-        'catalog': catalog,
-        'collection': collection,
-        'reference_time': parsed['reference_time'],
-        'original_name': parsed['original_name'],
-    }
+    return org, catalog, collection, parsed['reference_time'], parsed['original_name']
 
 
 def validate_path(file_path: str) -> dict:
@@ -195,12 +202,13 @@ def validate_path(file_path: str) -> dict:
     Raises:
         ValueError: If path doesn't have at least org/catalog/filename.
     """
-    parts = Path(file_path).parts
+    fields = _parse_path(file_path)
 
-    if len(parts) < 3:
+    # Only paths of fewer than three parts parse without an org
+    if fields[0] is None:
         raise ValueError(
             f"Invalid path: '{file_path}'. "
             f"Expected at minimum: {{org}}/{{catalog}}/filename.ext"
         )
 
-    return parse_path(file_path)
+    return dict(zip(_PATH_FIELDS, fields))
@@ -18,8 +18,11 @@ Flow:
 """
 
 import logging
+import mimetypes
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import BinaryIO, Optional
+from typing import BinaryIO, Iterator, Optional
 
 from django.conf import settings
 from django.core.files.base import ContentFile
@@ -129,6 +132,65 @@ class Bucket:
     def open(self, path: str, mode: str = "rb") -> BinaryIO:
         return self.storage.open(path, mode)
     
+    def download(self, path: str, local_path) -> None:
+        """
+        Copy a file to *local_path* on local disk without holding it in memory.
+
+        S3 buckets use boto3's managed transfer, which fetches large objects
+        as concurrent ranged parts; other backends (and a failed managed
+        transfer) stream through open() in 8 MB chunks.
+        """
+        if self.is_s3:
+            try:
+                self.storage.bucket.download_file(self._s3_key(path), str(local_path))
+                return
+            except Exception as e:
+                logger.warning("S3 download failed, falling back to streaming: %s", e)
+        
+        with self.open(path, "rb") as src, open(local_path, "wb") as dst:
+            shutil.copyfileobj(src, dst, length=8 * 1024 * 1024)
+    
+    def upload(self, local_path, path: str) -> str:
+        """
+        Store the file at *local_path* under *path* without holding it in
+        memory; returns the stored path, as save() does.
+
+        Overwriting S3 buckets use boto3's managed transfer from the path,
+        which reads each multipart chunk from disk as it is sent instead of
+        buffering it; other backends (and a failed managed transfer) go
+        through save() with the open file.
+        """
+        if self.is_s3 and getattr(self.storage, "file_overwrite", False):
+            try:
+                storage = self.storage
+                key = self._s3_key(path)
+                extra_args = dict(storage.get_object_parameters(key))
+                content_type = mimetypes.guess_type(key)[0]
+                if content_type:
+                    extra_args.setdefault("ContentType", content_type)
+                if storage.default_acl:
+                    extra_args.setdefault("ACL", storage.default_acl)
+                storage.bucket.upload_file(
+                    str(local_path), key,
+                    ExtraArgs=extra_args, Config=storage.transfer_config,
+                )
+                return path
+            except Exception as e:
+                logger.warning("S3 upload failed, falling back to save(): %s", e)
+        
+        with open(local_path, "rb") as f:
+            return self.save(path, f)
+    
+    def _s3_key(self, path: str) -> str:
+        """
+        The object key the S3 backend stores *path* under — cleaned and
+        prefixed with its ``location``, as save() and open() do — for
+        calls that go to boto3 directly.
+        """
+        from storages.utils import clean_name
+        
+        return self.storage._normalize_name(clean_name(path))
+    
     def delete(self, path: str) -> bool:
         """Delete a file. Returns True if it existed."""
         if self.exists(path):
@@ -154,32 +216,96 @@ class Bucket:
         Returns:
             List of dicts: {'path', 'size', 'modified'}
         """
-        files = []
-        
+        return list(self.iter_files(path, recursive=recursive))
+    
+    def iter_files(
+            self,
+            path: str = "",
+            recursive: bool = False,
+            page_size: int = 1000,
+            concurrency: int = 1,
+    ) -> Iterator[dict]:
+        """
+        Yield files under a path as they are listed — the streaming form of
+        ``list_files``.
+
+        A recursive listing on S3 pages through ListObjectsV2, *page_size*
+        keys per request, and takes each file's size and modified time from
+        the listing itself rather than a HEAD per file. With *concurrency*
+        above 1, a recursive listing lists each subdirectory of *path* on
+        its own thread — a listing is bound by request round-trips, not by
+        this process. Files then arrive one subdirectory at a time, in
+        completion order. Listing errors are logged and end that part of
+        the iteration early.
+        """
         try:
+            if self.is_s3 and recursive and concurrency <= 1:
+                yield from self._iter_s3_files(path, page_size)
+                return
             dirs, filenames = self.storage.listdir(path)
-            
-            for filename in filenames:
-                file_path = f"{path}/{filename}" if path else filename
-                try:
-                    files.append({
-                        "path": file_path,
-                        "size": self.storage.size(file_path),
-                        "modified": self.storage.get_modified_time(file_path),
-                    })
-                except Exception as e:
-                    logger.warning("Could not get info for %s: %s", file_path, e)
-                    files.append({"path": file_path})
-            
-            if recursive:
-                for dir_name in dirs:
-                    dir_path = f"{path}/{dir_name}" if path else dir_name
-                    files.extend(self.list_files(dir_path, recursive=True))
-        
         except Exception as e:
             logger.error("Failed to list files in %s: %s", path, e)
+            return
+        
+        for filename in filenames:
+            yield self._file_info(f"{path}/{filename}" if path else filename)
         
-        return files
+        if not recursive:
+            return
+        dir_paths = [f"{path}/{dir_name}" if path else dir_name for dir_name in dirs]
+        if concurrency <= 1:
+            for dir_path in dir_paths:
+                yield from self.iter_files(dir_path, recursive=True, page_size=page_size)
+            return
+        
+        def list_dir(dir_path):
+            return list(self.iter_files(dir_path, recursive=True, page_size=page_size))
+        
+        with ThreadPoolExecutor(
+                max_workers=concurrency, thread_name_prefix="georiva-listing",
+        ) as pool:
+            futures = [pool.submit(list_dir, dir_path) for dir_path in dir_paths]
+            for future in as_completed(futures):
+                yield from future.result()
+    
+    def _file_info(self, file_path: str) -> dict:
+        """A listed file's entry, with size and modified time if available."""
+        try:
+            return {
+                "path": file_path,
+                "size": self.storage.size(file_path),
+                "modified": self.storage.get_modified_time(file_path),
+            }
+        except Exception as e:
+            logger.warning("Could not get info for %s: %s", file_path, e)
+            return {"path": file_path}
+    
+    def _iter_s3_files(self, path: str, page_size: int) -> Iterator[dict]:
+        """
+        Every object under *path*, paged through the bucket listing. Uses
+        the client's paginator — unlike the bucket resource, the client is
+        safe to share between listing threads.
+        """
+        location = (self.storage.location or "").strip("/")
+        root = f"{location}/" if location else ""
+        prefix = root + (f"{path.strip('/')}/" if path.strip("/") else "")
+        
+        client = self.storage.connection.meta.client
+        pages = client.get_paginator("list_objects_v2").paginate(
+            Bucket=self.storage.bucket_name,
+            Prefix=prefix,
+            PaginationConfig={"PageSize": page_size},
+        )
+        for page in pages:
+            for obj in page.get("Contents", []):
+                if obj["Key"].endswith("/"):
+                    # Folder placeholder, not a file
+                    continue
+                yield {
+                    "path": obj["Key"][len(root):],
+                    "size": obj["Size"],
+                    "modified": obj["LastModified"],
+                }
     
     def list_directories(self, path: str = "") -> list[str]:
         try:
@@ -223,8 +349,8 @@ class Bucket:
         if self.is_s3:
             try:
                 self.storage.bucket.copy(
-                    {"Bucket": self.storage.bucket_name, "Key": src_path},
-                    dest_path,
+                    {"Bucket": self.storage.bucket_name, "Key": self._s3_key(src_path)},
+                    self._s3_key(dest_path),
                 )
                 return dest_path
             except Exception as e:
@@ -344,7 +470,10 @@ class StorageManager:
         """
         Copy a file between buckets.
 
-        Uses S3 server-side copy when both buckets are S3-backed.
+        Uses S3 server-side copy when both buckets are S3-backed — boto3's
+        managed copy, which splits a large object into parts copied
+        concurrently (a single CopyObject is serial and stops at 5 GB).
+        Otherwise the file is streamed across, never read whole into memory.
 
         Args:
             source: Source bucket.
@@ -359,14 +488,10 @@ class StorageManager:
         
         if source.is_s3 and dest.is_s3:
             try:
-                client = source.storage.connection.meta.client
-                client.copy_object(
-                    Bucket=dest.storage.bucket_name,
-                    Key=dest_path,
-                    CopySource={
-                        "Bucket": source.storage.bucket_name,
-                        "Key": src_path,
-                    },
+                dest.storage.bucket.copy(
+                    {"Bucket": source.storage.bucket_name, "Key": source._s3_key(src_path)},
+                    dest._s3_key(dest_path),
+                    Config=dest.storage.transfer_config,
                 )
                 logger.info(
                     "S3 copy: %s/%s → %s/%s",
@@ -377,9 +502,9 @@ class StorageManager:
             except Exception as e:
                 logger.warning("S3 cross-bucket copy failed, falling back: %s", e)
         
-        # Fallback: read from source, write to dest
-        data = source.read_bytes(src_path)
-        saved = dest.save(dest_path, data)
+        # Fallback: stream from source to dest
+        with source.open(src_path, "rb") as f:
+            saved = dest.save(dest_path, f)
         logger.info(
             "Copied: %s/%s → %s/%s",
             source.bucket_name, src_path,
@@ -496,6 +621,36 @@ class StorageManager:
             f"{filename}"
         )
     
+    @staticmethod
+    def build_item_path(
+            org: str,
+            catalog: str,
+            collection: str,
+            timestamp: datetime,
+            filename: str,
+    ) -> str:
+        """
+        Build a time-partitioned path for an object that describes a whole
+        Item rather than one variable:
+            {org}/{catalog}/{collection}/{yyyy}/{mm}/{dd}/{filename}
+
+        Same rules as ``build_asset_path``: ``org`` is required and
+        ``timestamp`` must be UTC-aware.
+        """
+        import pytz
+        if not org:
+            raise ValueError("org is required to build an item path")
+        if timestamp.tzinfo is None:
+            raise ValueError(
+                f"timestamp must be UTC-aware, got naive datetime: {timestamp}"
+            )
+        ts = timestamp.astimezone(pytz.utc)
+        return (
+            f"{org}/{catalog}/{collection}/"
+            f"{ts.year}/{ts.month:02d}/{ts.day:02d}/"
+            f"{filename}"
+        )
+    
     # ---- Bucket initialization (for Docker/startup) -------------------------
     
     def ensure_buckets(self) -> list[str]:
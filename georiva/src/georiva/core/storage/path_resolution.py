@@ -11,6 +11,8 @@ Catalog slugs are unique per organisation, so ``(org, catalog)`` is the only
 lookup that identifies a catalog unambiguously; a bare ``slug=`` lookup would
 now match an arbitrary org's catalog.
 """
+from django.db.models import Q
+
 from georiva.core.models import Catalog
 from georiva.organisations.models import Organisation
 
@@ -41,17 +43,53 @@ def resolve_org_catalog(org_slug, catalog_slug, *, require_active=True):
     if not catalog_slug:
         return None, "Cannot determine the catalog from the file path."
 
-    organisation = Organisation.objects.filter(slug=org_slug).first()
-    if organisation is None:
-        return None, f"Unknown organisation '{org_slug}'."
-
-    catalogs = Catalog.objects.select_related("boundary", "organisation")
-    catalog = catalogs.filter(organisation=organisation, slug=catalog_slug).first()
+    # One query on the path every ingested file takes; the organisation is
+    # only looked up on its own to word the error when the pair misses.
+    catalog = Catalog.objects.select_related("boundary", "organisation").filter(
+        organisation__slug=org_slug, slug=catalog_slug,
+    ).first()
     if catalog is None:
+        if not Organisation.objects.filter(slug=org_slug).exists():
+            return None, f"Unknown organisation '{org_slug}'."
         return None, (
             f"Catalog '{catalog_slug}' does not belong to organisation '{org_slug}'."
         )
     if require_active and not catalog.is_active:
-        return None, f"Catalog '{org_slug}/{catalog_slug}' is inactive."
+        return None, _inactive(org_slug, catalog_slug)
 
     return catalog, None
+
+
+def resolve_org_catalogs(pairs, *, require_active=True):
+    """``resolve_org_catalog`` for many ``(org_slug, catalog_slug)`` pairs.
+
+    Returns ``{pair: (catalog, error)}``. Every catalog that exists is found
+    by one query, whatever the number of pairs; only the pairs that miss are
+    looked up again, one by one, to word their errors.
+    """
+    pairs = set(pairs)
+    complete = [(org, cat) for org, cat in pairs if org and cat]
+    found = {}
+    if complete:
+        match = Q()
+        for org_slug, catalog_slug in complete:
+            match |= Q(organisation__slug=org_slug, slug=catalog_slug)
+        found = {
+            (catalog.organisation.slug, catalog.slug): catalog
+            for catalog in Catalog.objects.select_related("boundary", "organisation").filter(match)
+        }
+
+    resolved = {}
+    for pair in pairs:
+        catalog = found.get(pair)
+        if catalog is None:
+            resolved[pair] = resolve_org_catalog(*pair, require_active=require_active)
+        elif require_active and not catalog.is_active:
+            resolved[pair] = None, _inactive(*pair)
+        else:
+            resolved[pair] = catalog, None
+    return resolved
+
+
+def _inactive(org_slug, catalog_slug):
+    return f"Catalog '{org_slug}/{catalog_slug}' is inactive."
@@ -1,6 +1,8 @@
 import logging
 
 from celery import shared_task
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone as dj_timezone
 from django_celery_beat.models import IntervalSchedule, PeriodicTask
 
@@ -55,6 +57,40 @@ def prune_forecast_items():
     return f"Pruned {total_deleted} past forecast items"
 
 
+@shared_task(
+    name='georiva.core.tasks.reconcile_item_counts',
+    queue="georiva-default",
+)
+def reconcile_item_counts():
+    """
+    Reset Collection.item_count to the live Item count where they differ.
+
+    Ingestion keeps the counter with an O(1) ``F() + 1`` per new Item rather
+    than a COUNT per timestamp; deletions (forecast pruning, orphan cleanup,
+    admin) don't decrement it, so it is reconciled here — one UPDATE that
+    touches only the collections that drifted.
+    """
+    live_count = Coalesce(
+        Subquery(
+            Item.objects.filter(collection=OuterRef("pk"))
+            .order_by()
+            .values("collection")
+            .annotate(n=Count("pk"))
+            .values("n")
+        ),
+        0,
+    )
+    drifted = Collection.objects.annotate(live_count=live_count).exclude(
+        item_count=F("live_count")
+    )
+    updated = Collection.objects.filter(pk__in=drifted.values("pk")).update(
+        item_count=live_count
+    )
+    
+    logger.info("reconcile_item_counts: corrected %d collection(s)", updated)
+    return updated
+
+
 @app.on_after_finalize.connect
 def setup_periodic_tasks(sender, **kwargs):
     try:
@@ -70,5 +106,17 @@ def setup_periodic_tasks(sender, **kwargs):
                 'enabled': True,
             }
         )
+        schedule_1day, _ = IntervalSchedule.objects.get_or_create(
+            every=1,
+            period=IntervalSchedule.DAYS,
+        )
+        PeriodicTask.objects.update_or_create(
+            name='georiva.core.tasks.reconcile_item_counts',
+            defaults={
+                'task': 'georiva.core.tasks.reconcile_item_counts',
+                'interval': schedule_1day,
+                'enabled': True,
+            }
+        )
     except Exception as e:
-        logger.warning("Could not register prune_forecast_items periodic task: %s", e)
+        logger.warning("Could not register core periodic tasks: %s", e)
@@ -0,0 +1,202 @@
+"""Bucket.download / upload and cross-bucket transfers — files move between
+local disk and storage, and between buckets, without a whole-file read; and
+listings stream page by page."""
+import io
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from django.test import SimpleTestCase
+
+from georiva.core.storage import Bucket, StorageManager
+
+
+def _located(storage, location="data"):
+    """Give a mocked S3 backend django-storages' location-prefixed keys."""
+    storage._normalize_name.side_effect = lambda name: f"{location}/{name}"
+    return storage
+
+
+class BucketDownloadTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.local_path = Path(tmp.name) / "file.grib2"
+        self.bucket = Bucket("incoming", "incoming")
+
+    def test_local_storage_streams_to_disk(self):
+        payload = b"GRIB" * 5_000_000
+        self.bucket._storage = MagicMock(spec=["open", "location"])
+        self.bucket._storage.open.return_value = io.BytesIO(payload)
+
+        self.bucket.download("org/cat/col/file.grib2", self.local_path)
+
+        self.assertEqual(self.local_path.read_bytes(), payload)
+
+    def test_s3_uses_managed_transfer(self):
+        self.bucket._storage = _located(
+            MagicMock(spec=["bucket", "bucket_name", "open", "_normalize_name"])
+        )
+
+        self.bucket.download("org/cat/col/file.grib2", self.local_path)
+
+        self.bucket._storage.bucket.download_file.assert_called_once_with(
+            "data/org/cat/col/file.grib2", str(self.local_path),
+        )
+        self.bucket._storage.open.assert_not_called()
+
+    def test_failed_s3_transfer_falls_back_to_streaming(self):
+        self.bucket._storage = _located(
+            MagicMock(spec=["bucket", "bucket_name", "open", "_normalize_name"])
+        )
+        self.bucket._storage.bucket.download_file.side_effect = RuntimeError("no range support")
+        self.bucket._storage.open.return_value = io.BytesIO(b"GRIB")
+
+        self.bucket.download("org/cat/col/file.grib2", self.local_path)
+
+        self.assertEqual(self.local_path.read_bytes(), b"GRIB")
+
+
+class BucketUploadTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.local_path = Path(tmp.name) / "precip.tif"
+        self.local_path.write_bytes(b"COG")
+        self.bucket = Bucket("assets", "assets")
+
+    def _s3_storage(self, file_overwrite=True):
+        storage = MagicMock(spec=[
+            "bucket", "bucket_name", "save", "file_overwrite", "default_acl",
+            "get_object_parameters", "transfer_config", "_normalize_name",
+        ])
+        _located(storage)
+        storage.file_overwrite = file_overwrite
+        storage.default_acl = None
+        storage.get_object_parameters.return_value = {"CacheControl": "max-age=60"}
+        return storage
+
+    def test_s3_uses_managed_transfer_from_path(self):
+        self.bucket._storage = self._s3_storage()
+
+        stored = self.bucket.upload(self.local_path, "org/cat/col/precip.tif")
+
+        self.assertEqual(stored, "org/cat/col/precip.tif")
+        self.bucket._storage.bucket.upload_file.assert_called_once_with(
+            str(self.local_path), "data/org/cat/col/precip.tif",
+            ExtraArgs={"CacheControl": "max-age=60", "ContentType": "image/tiff"},
+            Config=self.bucket._storage.transfer_config,
+        )
+        self.bucket._storage.save.assert_not_called()
+
+    def test_non_overwriting_s3_keeps_save_naming(self):
+        self.bucket._storage = self._s3_storage(file_overwrite=False)
+        self.bucket._storage.save.side_effect = lambda path, content: path + "_x"
+
+        stored = self.bucket.upload(self.local_path, "org/cat/col/precip.tif")
+
+        self.assertEqual(stored, "org/cat/col/precip.tif_x")
+        self.bucket._storage.bucket.upload_file.assert_not_called()
+
+    def test_local_storage_saves_open_file(self):
+        self.bucket._storage = MagicMock(spec=["save", "location"])
+        self.bucket._storage.save.side_effect = lambda path, content: (path, content.read())
+
+        stored = self.bucket.upload(self.local_path, "org/cat/col/precip.tif")
+
+        self.assertEqual(stored, ("org/cat/col/precip.tif", b"COG"))
+
+
+class TransferTests(SimpleTestCase):
+    def setUp(self):
+        self.source = Bucket("incoming", "incoming")
+        self.dest = Bucket("archive", "archive")
+
+    def test_s3_uses_managed_copy(self):
+        self.source._storage = _located(
+            MagicMock(spec=["bucket", "bucket_name", "_normalize_name"]), "in",
+        )
+        self.source._storage.bucket_name = "georiva-incoming"
+        self.dest._storage = _located(MagicMock(
+            spec=["bucket", "bucket_name", "transfer_config", "save", "_normalize_name"]
+        ), "out")
+
+        stored = StorageManager().transfer(
+            self.source, self.dest, "org/cat/col/file.grib2", "org/incoming/cat/col/file.grib2",
+        )
+
+        self.assertEqual(stored, "org/incoming/cat/col/file.grib2")
+        self.dest._storage.bucket.copy.assert_called_once_with(
+            {"Bucket": "georiva-incoming", "Key": "in/org/cat/col/file.grib2"},
+            "out/org/incoming/cat/col/file.grib2",
+            Config=self.dest._storage.transfer_config,
+        )
+        self.dest._storage.save.assert_not_called()
+
+    def test_local_storage_streams_across(self):
+        self.source._storage = MagicMock(spec=["open", "location"])
+        self.source._storage.open.return_value = io.BytesIO(b"GRIB")
+        self.dest._storage = MagicMock(spec=["save", "location"])
+        self.dest._storage.save.side_effect = lambda path, content: (path, content.read())
+
+        stored = StorageManager().transfer(self.source, self.dest, "org/cat/col/file.grib2")
+
+        self.assertEqual(stored, ("org/cat/col/file.grib2", b"GRIB"))
+
+
+class BucketListingTests(SimpleTestCase):
+    def setUp(self):
+        self.bucket = Bucket("sources", "sources")
+
+    def _s3_storage(self):
+        storage = MagicMock(spec=["connection", "bucket", "bucket_name", "location", "listdir", "size"])
+        storage.location = "data"
+        storage.bucket_name = "georiva-sources"
+        self.paginate = storage.connection.meta.client.get_paginator.return_value.paginate
+        self.paginate.side_effect = lambda Prefix, **kwargs: [{"Contents": [
+            {"Key": Prefix, "Size": 0, "LastModified": None},
+            {"Key": f"{Prefix}col/a.grib2", "Size": 10, "LastModified": "t1"},
+        ]}]
+        return storage
+
+    def test_s3_listing_paged_without_head_requests(self):
+        self.bucket._storage = self._s3_storage()
+
+        files = self.bucket.iter_files("org/cat", recursive=True, page_size=500)
+
+        self.assertEqual(list(files), [
+            {"path": "org/cat/col/a.grib2", "size": 10, "modified": "t1"},
+        ])
+        self.paginate.assert_called_once_with(
+            Bucket="georiva-sources", Prefix="data/org/cat/",
+            PaginationConfig={"PageSize": 500},
+        )
+        self.bucket._storage.size.assert_not_called()
+
+    def test_subdirectories_listed_concurrently(self):
+        self.bucket._storage = self._s3_storage()
+        self.bucket._storage.listdir.return_value = (["org1", "org2", "org3"], [])
+
+        files = self.bucket.iter_files(recursive=True, concurrency=3)
+
+        self.assertCountEqual(
+            [f["path"] for f in files],
+            ["org1/col/a.grib2", "org2/col/a.grib2", "org3/col/a.grib2"],
+        )
+        self.assertEqual(self.paginate.call_count, 3)
+
+    def test_local_listing_walks_directories_lazily(self):
+        self.bucket._storage = MagicMock(spec=["listdir", "size", "get_modified_time", "location"])
+        self.bucket._storage.listdir.side_effect = lambda path: {
+            "": (["org"], ["top.tif"]),
+            "org": ([], ["a.tif"]),
+        }[path]
+
+        files = self.bucket.iter_files(recursive=True)
+
+        self.assertEqual(next(files)["path"], "top.tif")
+        self.bucket._storage.listdir.assert_called_once_with("")
+        self.assertEqual([f["path"] for f in files], ["org/a.tif"])
+        self.assertEqual(
+            [f["path"] for f in self.bucket.list_files(recursive=True)], ["top.tif", "org/a.tif"],
+        )
@@ -79,3 +79,39 @@ class CollectionItemsIngestionBadgeTests(TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.content.decode().count("w-status-tag--primary ci-log-tag"), 2)
+
+
+class ReconcileItemCountsTests(TestCase):
+    def test_drifted_counts_reset_to_live_items(self):
+        from georiva.core.tasks import reconcile_item_counts
+
+        _, surface = _setup()
+        empty = Collection.objects.create(catalog=surface.catalog, name="Upper", slug="upper")
+        _make_item(surface, "incoming:models/a.grib2")
+        _make_item(surface, "incoming:models/b.grib2", t=datetime(2024, 1, 2, tzinfo=timezone.utc))
+        Collection.objects.filter(pk=surface.pk).update(item_count=5)
+        Collection.objects.filter(pk=empty.pk).update(item_count=3)
+
+        self.assertEqual(reconcile_item_counts(), 2)
+
+        surface.refresh_from_db()
+        empty.refresh_from_db()
+        self.assertEqual((surface.item_count, empty.item_count), (2, 0))
+        self.assertEqual(reconcile_item_counts(), 0)
+
+
+class ActiveVariablesTests(TestCase):
+    def test_filters_prefetched_variables_without_querying(self):
+        from georiva.core.models import Unit, Variable
+
+        _, surface = _setup()
+        unit = Unit.objects.create(name="Millimetre", symbol="mm")
+        Variable.objects.create(collection=surface, slug="precip", name="precip", unit=unit)
+        Variable.objects.create(
+            collection=surface, slug="snow", name="snow", unit=unit, is_active=False,
+        )
+        collection = Collection.objects.prefetch_related("variables").get(pk=surface.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual([v.slug for v in collection.active_variables], ["precip"])
+            self.assertIs(collection.active_variables, collection.active_variables)
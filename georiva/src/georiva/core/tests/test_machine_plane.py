@@ -21,7 +21,7 @@ distinguishing them, and each test below is written so that dropping it fails.
 """
 from datetime import datetime, timezone
 
-from django.test import TestCase, override_settings
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.urls import reverse
 
 from georiva.core.machine_plane import (
@@ -285,6 +285,35 @@ class StyledPayloadTests(TestCase):
         self.assertNotIn("colormap", build_variable_payload(self.variable))
 
 
+class ColormapTableTests(SimpleTestCase):
+    """The 256-entry colormap Titiler and the STAC Render extension apply."""
+
+    def test_interpolates_and_clamps_to_the_end_stops(self):
+        cmap = build_colormap_256([[51, [0, 0, 0]], [91.8, [255, 0, 0, 128]]], 0, 102)
+
+        self.assertEqual(cmap[0], [0, 0, 0, 255])
+        self.assertEqual(cmap[127], [0, 0, 0, 255])
+        self.assertEqual(cmap[178], [126, 0, 0, 192])
+        self.assertEqual(cmap[255], [255, 0, 0, 128])
+
+    def test_a_stepped_boundary_takes_the_lower_class(self):
+        # Two classes over 0–10 split at 4, which lands exactly on entry 102:
+        # the boundary entry belongs to the class below it, as the stops read
+        # left to right.
+        stops = [[0, [255, 0, 0]], [4, [255, 0, 0]], [4, [0, 0, 255]], [10, [0, 0, 255]]]
+        cmap = build_colormap_256(stops, 0, 10)
+
+        self.assertEqual(cmap[102], [255, 0, 0, 255])
+        self.assertEqual(cmap[103], [0, 0, 255, 255])
+
+    def test_each_call_gets_its_own_table(self):
+        stops = [[0, [0, 0, 0]], [1, [255, 255, 255]]]
+        first = build_colormap_256(stops, 0, 1)
+        first[0][0] = 99
+
+        self.assertEqual(build_colormap_256(stops, 0, 1)[0], [0, 0, 0, 255])
+
+
 class StyleSignalTests(TestCase):
     """Style edits are live on the next tile: save and delete both re-warm,
     and a deleted variable's key does not wait for the next sweep."""
@@ -7,9 +7,9 @@ from django.core.exceptions import ValidationError
 from django.db import IntegrityError, transaction
 from django.test import TestCase
 
-from georiva.core.storage.filename import parse_path, validate_path
+from georiva.core.storage.filename import _parse_path, parse_path, validate_path
 from georiva.core.models import Catalog
-from georiva.core.storage.path_resolution import resolve_org_catalog
+from georiva.core.storage.path_resolution import resolve_org_catalog, resolve_org_catalogs
 from georiva.core.storage import StorageManager
 from georiva.organisations.testing import make_organisation
 
@@ -73,6 +73,12 @@ class ResolveOrgCatalogTests(TestCase):
         self.assertEqual(catalog, self.catalog)
         self.assertIsNone(error)
 
+    def test_resolution_is_a_single_query(self):
+        with self.assertNumQueries(1):
+            catalog, _ = resolve_org_catalog("kenya", "chirps")
+            self.assertEqual(catalog.organisation.slug, "kenya")
+            self.assertIsNone(catalog.boundary)
+
     def test_unknown_organisation_resolves_to_nothing(self):
         catalog, error = resolve_org_catalog("atlantis", "chirps")
         self.assertIsNone(catalog)
@@ -89,6 +95,28 @@ class ResolveOrgCatalogTests(TestCase):
         self.assertIsNone(catalog)
         self.assertIn("inactive", error)
 
+    def test_many_pairs_resolved_in_one_query(self):
+        rainfall = Catalog.objects.create(
+            organisation=self.uganda, name="Rainfall", slug="rainfall", file_format="geotiff"
+        )
+        pairs = [("kenya", "chirps"), ("uganda", "rainfall"), ("kenya", "chirps")]
+
+        with self.assertNumQueries(1):
+            resolved = resolve_org_catalogs(pairs)
+
+        self.assertEqual(resolved, {
+            ("kenya", "chirps"): (self.catalog, None),
+            ("uganda", "rainfall"): (rainfall, None),
+        })
+
+    def test_many_pairs_word_errors_like_single_lookups(self):
+        Catalog.objects.filter(pk=self.catalog.pk).update(is_active=False)
+        pairs = [("kenya", "chirps"), ("uganda", "chirps"), ("atlantis", "chirps")]
+
+        resolved = resolve_org_catalogs(pairs)
+
+        self.assertEqual(resolved, {pair: resolve_org_catalog(*pair) for pair in pairs})
+
 
 class PathGrammarTests(TestCase):
     """``{org}/{catalog}/[{collection}/]{file}`` on every drop zone."""
@@ -115,6 +143,26 @@ class PathGrammarTests(TestCase):
         self.assertIsNone(meta["org"])
         self.assertIsNone(meta["catalog"])
 
+    def test_repeated_paths_parsed_once(self):
+        path = "kenya/weather/gfs/GR--20250115T0600--gfs.grib2"
+        parse_path(path)
+        hits = _parse_path.cache_info().hits
+
+        validate_path(path)
+        parse_path(path)
+        self.assertEqual(_parse_path.cache_info().hits, hits + 2)
+
+    def test_cached_result_not_shared_with_callers(self):
+        path = "kenya/weather/gfs/GR--20250115T0600--gfs.grib2"
+        meta = parse_path(path)
+        meta["collection"] = None
+
+        self.assertEqual(parse_path(path)["collection"], "gfs")
+        self.assertEqual(
+            validate_path(path)["reference_time"],
+            datetime(2025, 1, 15, 6, 0, tzinfo=pytz.utc),
+        )
+
 
 class AssetPathTests(TestCase):
     """``build_asset_path`` cannot be called without saying which org."""
@@ -145,6 +193,18 @@ class AssetPathTests(TestCase):
             )
 
 
+class ItemPathTests(TestCase):
+    """Item-level objects sit beside the variable folders of their collection."""
+
+    def test_no_variable_segment(self):
+        path = StorageManager.build_item_path(
+            org="kenya", catalog="chirps", collection="rainfall",
+            timestamp=datetime(2025, 1, 15, 6, 0, tzinfo=pytz.utc),
+            filename="item_060000.json",
+        )
+        self.assertEqual(path, "kenya/chirps/rainfall/2025/01/15/item_060000.json")
+
+
 class ArchivePathTests(TestCase):
     """The archive names its origin bucket without displacing the org segment."""
 
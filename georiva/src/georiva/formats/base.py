@@ -237,7 +237,8 @@ class BaseFormatPlugin(ABC):
         """
         Release all cached datasets and close their file handles.
     
-        Call this after finishing all variable reads for a file.
+        Call this after finishing all variable reads for a file, or use the
+        plugin as a context manager so it runs on every exit path.
         """
         for datasets in self._dataset_cache.values():
             for ds in datasets:
@@ -246,3 +247,9 @@ class BaseFormatPlugin(ABC):
                 except Exception:
                     pass
         self._dataset_cache.clear()
+    
+    def __enter__(self) -> "BaseFormatPlugin":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.clear_cache()
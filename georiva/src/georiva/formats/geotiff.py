@@ -11,6 +11,8 @@ Design:
 - open_variable() uses rioxarray for dask-backed lazy access.
 - extract_variable() overrides the base to use rasterio windowed reading
   (more efficient for GeoTIFF than materializing a dask graph).
+- The rasterio handle is opened once per file (per thread) and reused by
+  every metadata lookup and windowed read until clear_cache().
 - Timestamps are parsed from the filename.
 """
 
@@ -18,6 +20,7 @@ from __future__ import annotations
 
 import logging
 import re
+import threading
 from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
@@ -92,7 +95,7 @@ class GeoTIFFFormatPlugin(BaseFormatPlugin):
                         }
                     )
         except Exception as e:
-            self.logger.error(f"Failed to list variables in {file_path}: {e}")
+            self.logger.error("Failed to list variables in %s: %s", file_path, e)
         
         return results
     
@@ -152,20 +155,20 @@ class GeoTIFFFormatPlugin(BaseFormatPlugin):
                 )
             
             # Spatial info from rasterio (more reliable than xarray coords for GeoTIFF)
-            with rasterio.open(file_path) as src:
-                bounds, resolution, crs, needs_flip = self._spatial_from_rasterio(
-                    src, window
-                )
-                full_width = src.width
-                full_height = src.height
-                unit = ""
-                long_name = ""
-                src_units = list(getattr(src, "units", []) or [])
-                src_descs = list(getattr(src, "descriptions", []) or [])
-                if band - 1 < len(src_units):
-                    unit = src_units[band - 1] or ""
-                if band - 1 < len(src_descs):
-                    long_name = src_descs[band - 1] or ""
+            src = self._open_dataset(file_path)
+            bounds, resolution, crs, needs_flip = self._spatial_from_rasterio(
+                src, window
+            )
+            full_width = src.width
+            full_height = src.height
+            unit = ""
+            long_name = ""
+            src_units = list(getattr(src, "units", []) or [])
+            src_descs = list(getattr(src, "descriptions", []) or [])
+            if band - 1 < len(src_units):
+                unit = src_units[band - 1] or ""
+            if band - 1 < len(src_descs):
+                long_name = src_descs[band - 1] or ""
             
             valid_time = timestamp
             if valid_time is None:
@@ -211,58 +214,60 @@ class GeoTIFFFormatPlugin(BaseFormatPlugin):
         file_path = Path(file_path)
         band = self._parse_band_index(variable_name)
         
-        with rasterio.open(file_path) as src:
-            if band < 1 or band > src.count:
-                raise ValueError(f"Band {band} not found (file has {src.count} bands)")
-            
-            rio_window = None
-            if window:
-                x_off, y_off, w, h = window
-                rio_window = Window(col_off=x_off, row_off=y_off, width=w, height=h)
-            
-            data = src.read(band, window=rio_window)
-            
-            # Replace nodata with NaN
-            if src.nodata is not None:
-                data = data.astype(float, copy=False)
-                data = np.where(data == src.nodata, np.nan, data)
-            
-            bounds, resolution, crs, needs_flip = self._spatial_from_rasterio(
-                src, window
-            )
-            if needs_flip:
-                data = np.flipud(data)
-            
-            valid_time = timestamp
-            if valid_time is None:
-                ts = self.get_timestamps(file_path)
-                valid_time = ts[0] if ts else datetime.now(timezone.utc)
-            
-            descriptions = list(getattr(src, "descriptions", []) or [])
-            units = list(getattr(src, "units", []) or [])
-            
-            return ExtractedVariable(
-                data=data,
-                bounds=bounds,
-                crs=crs,
-                width=int(data.shape[1]),
-                height=int(data.shape[0]),
-                resolution=resolution,
-                timestamp=valid_time,
-                variable_name=variable_name,
-                units=units[band - 1] if band - 1 < len(units) else "",
-                metadata={
-                    "source_file": str(file_path),
-                    "long_name": descriptions[band - 1]
-                    if band - 1 < len(descriptions)
-                    else "",
-                    "band_index": band,
-                    "driver": src.driver,
-                    "dtype": str(src.dtypes[band - 1]),
-                    "full_width": int(src.width),
-                    "full_height": int(src.height),
-                },
-            )
+        src = self._open_dataset(file_path)
+        if band < 1 or band > src.count:
+            raise ValueError(f"Band {band} not found (file has {src.count} bands)")
+        
+        rio_window = None
+        if window:
+            x_off, y_off, w, h = window
+            rio_window = Window(col_off=x_off, row_off=y_off, width=w, height=h)
+        
+        # Read straight into float32 — the pipeline's working dtype — so
+        # integer sources are converted by GDAL during the read instead of
+        # via a float64 copy here and a float32 copy downstream.
+        data = src.read(band, window=rio_window, out_dtype=np.float32)
+        
+        # Replace nodata with NaN (compared at float32, as the data now is)
+        if src.nodata is not None:
+            data[data == np.float32(src.nodata)] = np.nan
+        
+        bounds, resolution, crs, needs_flip = self._spatial_from_rasterio(
+            src, window
+        )
+        if needs_flip:
+            data = np.flipud(data)
+        
+        valid_time = timestamp
+        if valid_time is None:
+            ts = self.get_timestamps(file_path)
+            valid_time = ts[0] if ts else datetime.now(timezone.utc)
+        
+        descriptions = list(getattr(src, "descriptions", []) or [])
+        units = list(getattr(src, "units", []) or [])
+        
+        return ExtractedVariable(
+            data=data,
+            bounds=bounds,
+            crs=crs,
+            width=int(data.shape[1]),
+            height=int(data.shape[0]),
+            resolution=resolution,
+            timestamp=valid_time,
+            variable_name=variable_name,
+            units=units[band - 1] if band - 1 < len(units) else "",
+            metadata={
+                "source_file": str(file_path),
+                "long_name": descriptions[band - 1]
+                if band - 1 < len(descriptions)
+                else "",
+                "band_index": band,
+                "driver": src.driver,
+                "dtype": str(src.dtypes[band - 1]),
+                "full_width": int(src.width),
+                "full_height": int(src.height),
+            },
+        )
     
     def get_metadata_for_variable(
             self,
@@ -276,17 +281,41 @@ class GeoTIFFFormatPlugin(BaseFormatPlugin):
         file_path = Path(file_path)
         band = self._parse_band_index(variable_name)
         
-        with rasterio.open(file_path) as src:
-            if band < 1 or band > src.count:
-                raise ValueError(f"Band {band} not found (file has {src.count} bands)")
-            
-            b = src.bounds
-            return {
-                "width": int(src.width),
-                "height": int(src.height),
-                "bounds": (float(b.left), float(b.bottom), float(b.right), float(b.top)),
-                "crs": str(src.crs) if src.crs else "EPSG:4326",
-            }
+        src = self._open_dataset(file_path)
+        if band < 1 or band > src.count:
+            raise ValueError(f"Band {band} not found (file has {src.count} bands)")
+        
+        b = src.bounds
+        return {
+            "width": int(src.width),
+            "height": int(src.height),
+            "bounds": (float(b.left), float(b.bottom), float(b.right), float(b.top)),
+            "crs": str(src.crs) if src.crs else "EPSG:4326",
+            # Internal (rows, cols) tile or strip shape, for aligned reads
+            "block_shape": tuple(src.block_shapes[band - 1]),
+        }
+    
+    # ------------------------------------------------------------------
+    # Internal: dataset handles
+    # ------------------------------------------------------------------
+    
+    def _open_dataset(self, file_path: Path) -> rasterio.io.DatasetReader:
+        """
+        Return the open rasterio handle for *file_path*, opening it on first use.
+
+        Ingestion asks for metadata and then reads every variable (and, for
+        chunked or tiled extraction, every block) from the same file;
+        re-opening it each time re-parses the TIFF header and IFDs. Handles
+        are cached per thread — a DatasetReader must not be shared across
+        threads — and closed by clear_cache().
+        """
+        key = f"{file_path}@{threading.get_ident()}"
+        cached = self._dataset_cache.get(key)
+        if cached and not cached[0].closed:
+            return cached[0]
+        src = rasterio.open(file_path)
+        self._dataset_cache[key] = [src]
+        return src
     
     # ------------------------------------------------------------------
     # Internal: band resolution
@@ -12,11 +12,13 @@ Design:
 - cfgrib internals (filter_by_keys) stay internal — callers never see them.
 - open_variable() is the primary interface: context manager, lazy DataArray.
 - extract_variable() and get_metadata_for_variable() are inherited from BaseFormatPlugin.
+- Every dataset opened on a file is cached and reused until clear_cache().
 """
 
 from __future__ import annotations
 
 import logging
+import threading
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -137,8 +139,7 @@ class GRIBFormatPlugin(BaseFormatPlugin):
         
         if ds is None:
             return []
-        with ds:
-            return sorted(self._collect_timestamps(ds))
+        return sorted(self._collect_timestamps(ds))
     
     @contextmanager
     def open_variable(
@@ -169,67 +170,76 @@ class GRIBFormatPlugin(BaseFormatPlugin):
         if ds is None or xr_name is None:
             raise ValueError(f"Variable '{variable_name}' not found in {file_path}")
         
-        try:
-            var = ds[xr_name]
-            
-            # Time selection
-            time_dim = self._time_dim(var)
-            if timestamp is not None and time_dim:
-                var = var.sel({time_dim: timestamp}, method="nearest")
-            elif time_dim and var[time_dim].size > 0:
-                var = var.isel({time_dim: 0})
-            
-            valid_time = self._resolve_valid_time(var, ds)
-            
-            # Orientation check
-            y_dim, x_dim = self._spatial_dims(var)
-            needs_flip = False
-            if y_dim and y_dim in var.coords:
-                y_vals = var.coords[y_dim].values
-                if len(y_vals) > 1 and y_vals[0] < y_vals[-1]:
-                    needs_flip = True
-            
-            full_height = var.sizes.get(y_dim, var.shape[-2])
-            full_width = var.sizes.get(x_dim, var.shape[-1])
-            
-            # Window slicing (lazy — just adjusts dask graph)
-            if window and y_dim and x_dim:
-                x_off, y_off, w, h = window
-                w = min(w, full_width - x_off)
-                h = min(h, full_height - y_off)
-                var = var.isel(
-                    {x_dim: slice(x_off, x_off + w), y_dim: slice(y_off, y_off + h)}
-                )
-            
-            bounds, resolution = self._spatial_info(var)
-            
-            yield VariableInfo(
-                data=var,
-                bounds=bounds,
-                crs="EPSG:4326",
-                width=var.sizes.get(x_dim, var.shape[-1]),
-                height=var.sizes.get(y_dim, var.shape[-2]),
-                resolution=resolution,
-                timestamp=valid_time,
-                variable_name=variable_name,
-                units=var.attrs.get("units", ""),
-                needs_flip=needs_flip,
-                metadata={
-                    "source_file": str(file_path),
-                    "long_name": var.attrs.get("long_name", ""),
-                    "full_width": int(full_width),
-                    "full_height": int(full_height),
-                },
+        var = ds[xr_name]
+        
+        # Time selection
+        time_dim = self._time_dim(var)
+        if timestamp is not None and time_dim:
+            var = var.sel({time_dim: timestamp}, method="nearest")
+        elif time_dim and var[time_dim].size > 0:
+            var = var.isel({time_dim: 0})
+        
+        valid_time = self._resolve_valid_time(var, ds)
+        
+        # Orientation check
+        y_dim, x_dim = self._spatial_dims(var)
+        needs_flip = False
+        if y_dim and y_dim in var.coords:
+            y_vals = var.coords[y_dim].values
+            if len(y_vals) > 1 and y_vals[0] < y_vals[-1]:
+                needs_flip = True
+        
+        full_height = var.sizes.get(y_dim, var.shape[-2])
+        full_width = var.sizes.get(x_dim, var.shape[-1])
+        
+        # Window slicing (lazy — just adjusts dask graph)
+        if window and y_dim and x_dim:
+            x_off, y_off, w, h = window
+            w = min(w, full_width - x_off)
+            h = min(h, full_height - y_off)
+            var = var.isel(
+                {x_dim: slice(x_off, x_off + w), y_dim: slice(y_off, y_off + h)}
             )
-        finally:
-            ds.close()
+        
+        bounds, resolution = self._spatial_info(var)
+        
+        yield VariableInfo(
+            data=var,
+            bounds=bounds,
+            crs="EPSG:4326",
+            width=var.sizes.get(x_dim, var.shape[-1]),
+            height=var.sizes.get(y_dim, var.shape[-2]),
+            resolution=resolution,
+            timestamp=valid_time,
+            variable_name=variable_name,
+            units=var.attrs.get("units", ""),
+            needs_flip=needs_flip,
+            metadata={
+                "source_file": str(file_path),
+                "long_name": var.attrs.get("long_name", ""),
+                "full_width": int(full_width),
+                "full_height": int(full_height),
+            },
+        )
     
     # ------------------------------------------------------------------
     # Internal: opening GRIB files
     # ------------------------------------------------------------------
     
     def _open(self, file_path: Path, filter_by_keys: dict) -> Optional[xr.Dataset]:
-        """Open a single GRIB view. Returns None if no data matches."""
+        """
+        Open a single GRIB view. Returns None if no data matches.
+
+        Views are cached per (file, filter, thread) — ingestion scans a
+        variable's timestamps and then opens it once per timestamp, and each
+        open re-indexes the messages — and closed by clear_cache().
+        """
+        key = f"{file_path}|{sorted(filter_by_keys.items())}@{threading.get_ident()}"
+        cached = self._dataset_cache.get(key)
+        if cached is not None:
+            return cached[0] if cached else None
+        
+        ds = None
         try:
             ds = xr.open_dataset(
                 file_path,
@@ -237,12 +247,13 @@ class GRIBFormatPlugin(BaseFormatPlugin):
                 chunks={},
                 backend_kwargs={"filter_by_keys": filter_by_keys},
             )
-            if ds.data_vars:
-                return ds
-            ds.close()
+            if not ds.data_vars:
+                ds.close()
+                ds = None
         except Exception as e:
-            logger.debug(f"Failed to open {file_path} with {filter_by_keys}: {e}")
-        return None
+            logger.debug("Failed to open %s with %s: %s", file_path, filter_by_keys, e)
+        self._dataset_cache[key] = [ds] if ds is not None else []
+        return ds
     
     def _open_all(self, file_path: Path) -> list[xr.Dataset]:
         """
@@ -259,7 +270,7 @@ class GRIBFormatPlugin(BaseFormatPlugin):
             self._dataset_cache[key] = datasets
             return datasets
         except Exception as e:
-            logger.error(f"cfgrib.open_datasets failed for {file_path}: {e}")
+            logger.error("cfgrib.open_datasets failed for %s: %s", file_path, e)
             return []
     
     def _iter_variables(self, file_path: PathLike):
@@ -292,7 +303,6 @@ class GRIBFormatPlugin(BaseFormatPlugin):
             xr_name = self._find_xr_name(ds, variable_name)
             if xr_name:
                 return ds, xr_name
-            ds.close()
         return None, None
     
     def _extract_level(self, var, attrs: dict) -> Optional[int]:
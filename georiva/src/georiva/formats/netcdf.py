@@ -10,11 +10,14 @@ Design:
 - open_variable() is the primary interface: context manager, lazy DataArray.
 - extract_variable() and get_metadata_for_variable() are inherited from BaseFormatPlugin.
 - Supports rectilinear and curvilinear grids, CRS detection, and fill-value handling.
+- The dataset is opened once per file (per thread) and reused by every
+  listing, timestamp scan, metadata lookup and read until clear_cache().
 """
 
 from __future__ import annotations
 
 import logging
+import threading
 from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
@@ -66,20 +69,20 @@ class NetCDFFormatPlugin(BaseFormatPlugin):
         results: list[dict] = []
         
         try:
-            with self._open(file_path) as ds:
-                for var_name, var in ds.data_vars.items():
-                    results.append(
-                        {
-                            "name": var_name,
-                            "long_name": var.attrs.get("long_name", var_name),
-                            "units": var.attrs.get("units", ""),
-                            "standard_name": var.attrs.get("standard_name", ""),
-                            "dimensions": list(var.dims),
-                            "shape": tuple(var.shape),
-                        }
-                    )
+            ds = self._open(file_path)
+            for var_name, var in ds.data_vars.items():
+                results.append(
+                    {
+                        "name": var_name,
+                        "long_name": var.attrs.get("long_name", var_name),
+                        "units": var.attrs.get("units", ""),
+                        "standard_name": var.attrs.get("standard_name", ""),
+                        "dimensions": list(var.dims),
+                        "shape": tuple(var.shape),
+                    }
+                )
         except Exception as e:
-            self.logger.error(f"Failed to list variables in {file_path}: {e}")
+            self.logger.error("Failed to list variables in %s: %s", file_path, e)
         
         return results
     
@@ -90,16 +93,16 @@ class NetCDFFormatPlugin(BaseFormatPlugin):
         file_path = Path(file_path)
         
         try:
-            with self._open(file_path) as ds:
-                if variable_name not in ds.data_vars:
-                    return []
-                var = ds[variable_name]
-                time_dim = self._time_dim(var)
-                if not time_dim:
-                    return []
-                return self._collect_timestamps(var.coords[time_dim])
+            ds = self._open(file_path)
+            if variable_name not in ds.data_vars:
+                return []
+            var = ds[variable_name]
+            time_dim = self._time_dim(var)
+            if not time_dim:
+                return []
+            return self._collect_timestamps(var.coords[time_dim])
         except Exception as e:
-            self.logger.error(f"Failed to get timestamps from {file_path}: {e}")
+            self.logger.error("Failed to get timestamps from %s: %s", file_path, e)
             return []
     
     @contextmanager
@@ -116,70 +119,67 @@ class NetCDFFormatPlugin(BaseFormatPlugin):
         file_path = Path(file_path)
         
         ds = self._open(file_path)
-        try:
-            if variable_name not in ds.data_vars:
-                raise ValueError(f"Variable '{variable_name}' not found in {file_path}")
-            
-            var = ds[variable_name]
-            
-            # Time selection (lazy)
-            time_dim = self._time_dim(var)
-            if timestamp is not None and time_dim:
-                sel_ts = timestamp
-                # If the file's time axis is tz-naive but our timestamp is tz-aware,
-                # strip tzinfo before selection — pandas refuses to compare the two.
-                coord_tz = getattr(var.coords[time_dim].dtype, "tz", None)
-                if coord_tz is None and getattr(timestamp, "tzinfo", None) is not None:
-                    sel_ts = timestamp.replace(tzinfo=None)
-                var = var.sel({time_dim: sel_ts}, method="nearest")
-            elif time_dim and var[time_dim].size > 0:
-                var = var.isel({time_dim: 0})
-            
-            valid_time = self._resolve_valid_time(var, ds, timestamp)
-            
-            # Orientation check
-            y_dim, x_dim = self._spatial_dims(var)
-            needs_flip = False
-            if y_dim and y_dim in var.coords:
-                y_vals = var.coords[y_dim].values
-                if len(y_vals) > 1 and y_vals[0] < y_vals[-1]:
-                    needs_flip = True
-            
-            full_height = var.sizes.get(y_dim, var.shape[-2])
-            full_width = var.sizes.get(x_dim, var.shape[-1])
-            
-            # Window slicing (lazy — just adjusts dask graph)
-            if window and y_dim and x_dim:
-                x_off, y_off, w, h = window
-                w = min(w, full_width - x_off)
-                h = min(h, full_height - y_off)
-                var = var.isel(
-                    {x_dim: slice(x_off, x_off + w), y_dim: slice(y_off, y_off + h)}
-                )
-            
-            bounds, resolution, crs = self._spatial_info(var, ds)
-            
-            yield VariableInfo(
-                data=var,
-                bounds=bounds,
-                crs=crs,
-                width=var.sizes.get(x_dim, var.shape[-1]),
-                height=var.sizes.get(y_dim, var.shape[-2]),
-                resolution=resolution,
-                timestamp=valid_time,
-                variable_name=variable_name,
-                units=var.attrs.get("units", ""),
-                needs_flip=needs_flip,
-                metadata={
-                    "source_file": str(file_path),
-                    "long_name": var.attrs.get("long_name", ""),
-                    "standard_name": var.attrs.get("standard_name", ""),
-                    "full_width": int(full_width),
-                    "full_height": int(full_height),
-                },
+        if variable_name not in ds.data_vars:
+            raise ValueError(f"Variable '{variable_name}' not found in {file_path}")
+        
+        var = ds[variable_name]
+        
+        # Time selection (lazy)
+        time_dim = self._time_dim(var)
+        if timestamp is not None and time_dim:
+            sel_ts = timestamp
+            # If the file's time axis is tz-naive but our timestamp is tz-aware,
+            # strip tzinfo before selection — pandas refuses to compare the two.
+            coord_tz = getattr(var.coords[time_dim].dtype, "tz", None)
+            if coord_tz is None and getattr(timestamp, "tzinfo", None) is not None:
+                sel_ts = timestamp.replace(tzinfo=None)
+            var = var.sel({time_dim: sel_ts}, method="nearest")
+        elif time_dim and var[time_dim].size > 0:
+            var = var.isel({time_dim: 0})
+        
+        valid_time = self._resolve_valid_time(var, ds, timestamp)
+        
+        # Orientation check
+        y_dim, x_dim = self._spatial_dims(var)
+        needs_flip = False
+        if y_dim and y_dim in var.coords:
+            y_vals = var.coords[y_dim].values
+            if len(y_vals) > 1 and y_vals[0] < y_vals[-1]:
+                needs_flip = True
+        
+        full_height = var.sizes.get(y_dim, var.shape[-2])
+        full_width = var.sizes.get(x_dim, var.shape[-1])
+        
+        # Window slicing (lazy — just adjusts dask graph)
+        if window and y_dim and x_dim:
+            x_off, y_off, w, h = window
+            w = min(w, full_width - x_off)
+            h = min(h, full_height - y_off)
+            var = var.isel(
+                {x_dim: slice(x_off, x_off + w), y_dim: slice(y_off, y_off + h)}
             )
-        finally:
-            ds.close()
+        
+        bounds, resolution, crs = self._spatial_info(var, ds)
+        
+        yield VariableInfo(
+            data=var,
+            bounds=bounds,
+            crs=crs,
+            width=var.sizes.get(x_dim, var.shape[-1]),
+            height=var.sizes.get(y_dim, var.shape[-2]),
+            resolution=resolution,
+            timestamp=valid_time,
+            variable_name=variable_name,
+            units=var.attrs.get("units", ""),
+            needs_flip=needs_flip,
+            metadata={
+                "source_file": str(file_path),
+                "long_name": var.attrs.get("long_name", ""),
+                "standard_name": var.attrs.get("standard_name", ""),
+                "full_width": int(full_width),
+                "full_height": int(full_height),
+            },
+        )
     
     def extract_variable(
             self,
@@ -225,8 +225,22 @@ class NetCDFFormatPlugin(BaseFormatPlugin):
     # ------------------------------------------------------------------
     
     def _open(self, file_path: Path) -> xr.Dataset:
-        """Open a NetCDF file with lazy loading."""
-        return xr.open_dataset(file_path, chunks={}, engine="netcdf4")
+        """
+        Return the lazily loaded dataset for *file_path*, opening it on first use.
+
+        Ingestion lists variables, scans timestamps and then opens every
+        variable at every timestamp from the same file; re-opening it each
+        time re-reads the header and decodes the coordinates again — 100 ms+
+        for a large or networked file. Datasets are cached per thread, as
+        the GeoTIFF plugin's handles are, and closed by clear_cache().
+        """
+        key = f"{file_path}@{threading.get_ident()}"
+        cached = self._dataset_cache.get(key)
+        if cached:
+            return cached[0]
+        ds = xr.open_dataset(file_path, chunks={}, engine="netcdf4")
+        self._dataset_cache[key] = [ds]
+        return ds
     
     # ------------------------------------------------------------------
     # Internal: time handling
@@ -44,7 +44,7 @@ class FormatRegistry:
             ext_lower = ext.lower().lstrip('.')
             cls._extension_map[ext_lower] = plugin_class.name
         
-        logger.info(f"Registered format plugin: {plugin_class.name}")
+        logger.info("Registered format plugin: %s", plugin_class.name)
         return plugin_class
     
     @classmethod
@@ -1,3 +1,111 @@
-from django.test import TestCase
+import tempfile
+from pathlib import Path
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+import rasterio
+import xarray as xr
+from django.test import SimpleTestCase
+from rasterio.transform import from_origin
+
+from .geotiff import GeoTIFFFormatPlugin
+from .netcdf import NetCDFFormatPlugin
+
+
+class GeoTIFFHandleReuseTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "rain_20240101.tif"
+        with rasterio.open(
+                self.path, "w", driver="GTiff", width=4, height=3, count=1,
+                dtype="float32", crs="EPSG:4326", transform=from_origin(0, 3, 1, 1),
+        ) as dst:
+            dst.write(np.arange(12, dtype=np.float32).reshape(3, 4), 1)
+        self.plugin = GeoTIFFFormatPlugin()
+
+    def test_metadata_and_reads_share_one_handle(self):
+        self.plugin.get_metadata_for_variable(self.path, "band_1")
+        first = self.plugin.extract_variable(self.path, "band_1", window=(0, 0, 2, 2))
+        second = self.plugin.extract_variable(self.path, "band_1", window=(2, 1, 2, 2))
+
+        self.assertEqual(len(self.plugin._dataset_cache), 1)
+        np.testing.assert_array_equal(first.data, [[0, 1], [4, 5]])
+        np.testing.assert_array_equal(second.data, [[6, 7], [10, 11]])
+
+    def test_clear_cache_closes_the_handle(self):
+        self.plugin.get_metadata_for_variable(self.path, "band_1")
+        (src,) = next(iter(self.plugin._dataset_cache.values()))
+
+        self.plugin.clear_cache()
+
+        self.assertTrue(src.closed)
+        self.assertEqual(self.plugin._dataset_cache, {})
+
+    def test_handles_closed_when_plugin_block_exits_with_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.plugin as plugin:
+                plugin.get_metadata_for_variable(self.path, "band_1")
+                (src,) = next(iter(plugin._dataset_cache.values()))
+                raise RuntimeError("boom")
+
+        self.assertTrue(src.closed)
+        self.assertEqual(self.plugin._dataset_cache, {})
+
+
+class GeoTIFFFloat32ReadTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "elevation_20240101.tif"
+        with rasterio.open(
+                self.path, "w", driver="GTiff", width=2, height=2, count=1,
+                dtype="int16", nodata=-9999, crs="EPSG:4326",
+                transform=from_origin(0, 2, 1, 1),
+        ) as dst:
+            dst.write(np.array([[1, -9999], [3, 4]], dtype=np.int16), 1)
+        self.plugin = GeoTIFFFormatPlugin()
+        self.addCleanup(self.plugin.clear_cache)
+
+    def test_integer_band_read_as_float32_with_nodata_as_nan(self):
+        data = self.plugin.extract_variable(self.path, "band_1").data
+
+        self.assertEqual(data.dtype, np.float32)
+        np.testing.assert_array_equal(data, [[1, np.nan], [3, 4]])
+
+
+class NetCDFHandleReuseTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "forecast.nc"
+        xr.Dataset(
+            {
+                "t2m": (("time", "lat", "lon"), np.arange(24, dtype=np.float32).reshape(2, 3, 4)),
+                "tp": (("time", "lat", "lon"), np.zeros((2, 3, 4), dtype=np.float32)),
+            },
+            coords={
+                "time": pd.date_range("2024-01-01", periods=2, freq="6h"),
+                "lat": [2.5, 1.5, 0.5],
+                "lon": [0.5, 1.5, 2.5, 3.5],
+            },
+        ).to_netcdf(self.path, engine="netcdf4")
+        self.plugin = NetCDFFormatPlugin()
+        self.addCleanup(self.plugin.clear_cache)
+
+    def test_listing_scans_and_reads_share_one_dataset(self):
+        self.plugin.list_variables(self.path)
+        timestamps = self.plugin.get_timestamps(self.path, "t2m")
+        first = self.plugin.extract_variable(self.path, "t2m", timestamp=timestamps[1])
+        second = self.plugin.extract_variable(self.path, "tp", timestamp=timestamps[0])
+
+        self.assertEqual(len(self.plugin._dataset_cache), 1)
+        np.testing.assert_array_equal(first.data, np.arange(12, 24).reshape(3, 4))
+        self.assertEqual(second.data.shape, (3, 4))
+
+    def test_clear_cache_releases_the_dataset(self):
+        self.plugin.list_variables(self.path)
+
+        self.plugin.clear_cache()
+
+        self.assertEqual(self.plugin._dataset_cache, {})
@@ -17,17 +17,26 @@ def safe_divide(numerator, denominator):
     """
     Element-wise division with divide-by-zero → NaN (not inf).
 
-    Works for numpy arrays and xarray DataArrays.
+    Works for numpy arrays and xarray DataArrays. For numpy inputs the
+    zero-denominator and non-finite-numerator cells are masked out of the
+    ufunc with ``where=`` rather than divided and cleaned up afterwards; a
+    finite value over ±inf is 0, and an overflowing quotient is NaN.
     """
-    with np.errstate(divide="ignore", invalid="ignore"):
-        result = numerator / denominator
-    # Replace inf/-inf produced by zero denominators with NaN.
-    try:
+    if hasattr(numerator, "where") or hasattr(denominator, "where"):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = numerator / denominator
         return result.where(np.isfinite(result))  # xarray
-    except AttributeError:
-        result = np.asarray(result, dtype="float64")
-        result[~np.isfinite(result)] = np.nan
-        return result
+
+    numerator = np.asarray(numerator, dtype="float64")
+    denominator = np.asarray(denominator, dtype="float64")
+    valid = (denominator != 0) & np.isfinite(numerator)
+
+    result = np.full(np.broadcast_shapes(numerator.shape, denominator.shape), np.nan)
+    with np.errstate(over="ignore"):
+        np.divide(numerator, denominator, out=result, where=valid)
+    # Overflow (huge / tiny) is the only remaining source of inf.
+    result[np.isinf(result)] = np.nan
+    return result
 
 
 def raster_combine(*arrays, op="sum", weights=None):
@@ -1,4 +1,5 @@
 import unittest
+import warnings
 
 import numpy as np
 
@@ -57,6 +58,28 @@ class SafeDivideTests(unittest.TestCase):
         self.assertTrue(np.isnan(out[0]))
         self.assertAlmostEqual(out[1], 1.0)
 
+    def test_zero_over_zero_and_inf_inputs_are_nan_without_warnings(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            out = safe_divide(np.array([0.0, np.inf, 6.0]), np.array([0.0, 2.0, 3.0]))
+        self.assertTrue(np.isnan(out[:2]).all())
+        self.assertAlmostEqual(out[2], 2.0)
+
+    def test_finite_over_inf_is_zero(self):
+        out = safe_divide(np.array([3.0, -3.0]), np.array([np.inf, np.inf]))
+        np.testing.assert_array_equal(out, [0.0, -0.0])
+
+    def test_overflow_is_nan_without_warnings(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            out = safe_divide(np.array([1e308, 4.0]), np.array([1e-308, 2.0]))
+        self.assertTrue(np.isnan(out[0]))
+        self.assertAlmostEqual(out[1], 2.0)
+
+    def test_scalar_denominator_broadcasts(self):
+        out = safe_divide(np.array([[2.0, 4.0]]), 2.0)
+        np.testing.assert_array_equal(out, [[1.0, 2.0]])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,12 +1,18 @@
 import json
 import logging
 import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Iterable, Optional
 
 import numpy as np
 import rasterio
 from django.conf import settings
+from rasterio.io import MemoryFile
 from rasterio.transform import from_bounds
+from rasterio.windows import Window
 from rio_cogeo.cogeo import cog_translate
 from rio_cogeo.profiles import cog_profiles
 
@@ -33,11 +39,34 @@ class AssetWriter:
       - Overview levels are computed from dimensions and block size
       - Compression predictor is derived from data dtype
       - nodata default is derived from data dtype
+
+    ``submit_cog`` uploads on the writer's own worker threads; ``close``
+    (or leaving a ``with`` block) waits for them and stops the pool.
     """
     
     def __init__(self, bucket: Bucket):
         self.bucket = bucket
         self.logger = logging.getLogger("georiva.writer")
+        # Byte size of each uploaded COG by stored path, known locally
+        # before the upload — saves a HEAD request per asset afterwards.
+        self._stored_sizes: dict[str, int] = {}
+        # Background COG uploads, started on first submit_cog
+        self._upload_pool: Optional[ThreadPoolExecutor] = None
+        self._upload_slots: Optional[threading.Semaphore] = None
+        self._upload_pool_lock = threading.Lock()
+    
+    def close(self) -> None:
+        """Wait for pending uploads and stop the upload threads."""
+        with self._upload_pool_lock:
+            pool, self._upload_pool = self._upload_pool, None
+        if pool is not None:
+            pool.shutdown()
+    
+    def __enter__(self) -> "AssetWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
     
     # =========================================================================
     # Public Interface
@@ -50,6 +79,9 @@ class AssetWriter:
             bounds: tuple,
             crs: str = "EPSG:4326",
             nodata: float = None,
+            overviews: bool = True,
+            scale: float = None,
+            offset: float = None,
     ) -> str:
         """
         Write a 2D numpy array to storage as a Cloud-Optimized GeoTIFF.
@@ -72,16 +104,224 @@ class AssetWriter:
             bounds:      (west, south, east, north) in the given CRS.
             crs:         Coordinate reference system (default EPSG:4326).
             nodata:      NoData value. If None, derived from dtype.
+            overviews:   False skips overview building — for rasters that
+                         are only ever read at full resolution.
+            scale:       Band scale of quantized integer data — readers
+                         decode ``value = stored * scale + offset``.
+            offset:      Band offset, with *scale*.
 
         Returns:
             Final stored path.
         """
         height, width = data.shape
-        dtype = data.dtype
         
+        return self._write_cog(
+            lambda dst: dst.write(data, 1),
+            output_path, bounds, width, height, data.dtype, crs, nodata,
+            overviews=overviews, scale=scale, offset=offset,
+        )
+    
+    def submit_cog(
+            self,
+            data: np.ndarray,
+            output_path: str,
+            bounds: tuple,
+            crs: str = "EPSG:4326",
+            nodata: float = None,
+            overviews: bool = True,
+            scale: float = None,
+            offset: float = None,
+    ) -> Future:
+        """
+        write_cog split into pipeline stages: the COG is encoded on the
+        calling thread, then uploaded on the writer's upload pool. Returns
+        a Future of the stored path.
+
+        Encoding is CPU-bound and the upload network-bound, so the caller
+        moves on to its next array while this one uploads. At most
+        GEORIVA_UPLOAD_CONCURRENCY encoded COGs wait on local disk for their
+        upload — past that, the call blocks until one finishes. With the
+        setting at 0 the upload runs inline and the Future is already done.
+        """
+        height, width = data.shape
+        
+        cog_path = self._encode_cog(
+            lambda dst: dst.write(data, 1),
+            bounds, width, height, data.dtype, crs, nodata, overviews=overviews,
+            scale=scale, offset=offset,
+        )
+        
+        pool = self._upload_executor()
+        if pool is None:
+            future = Future()
+            try:
+                future.set_result(self._upload_cog(cog_path, output_path))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        
+        self._upload_slots.acquire()
+        try:
+            future = pool.submit(self._upload_cog, cog_path, output_path)
+        except Exception:
+            self._upload_slots.release()
+            Path(cog_path).unlink(missing_ok=True)
+            raise
+        future.add_done_callback(lambda _: self._upload_slots.release())
+        return future
+    
+    def write_cog_blocks(
+            self,
+            blocks: Iterable[tuple[tuple[int, int, int, int], np.ndarray]],
+            output_path: str,
+            bounds: tuple,
+            *,
+            width: int,
+            height: int,
+            dtype=np.float32,
+            crs: str = "EPSG:4326",
+            nodata: float = None,
+            overviews: bool = True,
+            scale: float = None,
+            offset: float = None,
+    ) -> str:
+        """
+        Write a raster to storage as a COG from a stream of tiles.
+
+        Same output as write_cog, but pass 1 is fed ``((x, y, w, h), array)``
+        tiles covering the width × height grid and writes each into the temp
+        GeoTIFF as it arrives — the full array never has to exist in memory.
+        Pass 2 (cog_translate) already works block by block.
+
+        Returns:
+            Final stored path.
+        """
+        def write_raw(dst):
+            for (x, y, w, h), block in blocks:
+                dst.write(block, 1, window=Window(x, y, w, h))
+        
+        return self._write_cog(
+            write_raw, output_path, bounds, width, height, dtype, crs, nodata,
+            overviews=overviews, scale=scale, offset=offset,
+        )
+    
+    def write_metadata(self, metadata: dict, output_path: str) -> str:
+        """
+        Serialise a metadata dict to JSON and write it to storage.
+
+        Args:
+            metadata:    Dict of variable/asset metadata.
+            output_path: Destination path in the bucket.
+
+        Returns:
+            Final stored path.
+        """
+        content = json.dumps(metadata, indent=2).encode('utf-8')
+        return self.bucket.save(output_path, content)
+    
+    def stored_size(self, path: str) -> Optional[int]:
+        """
+        Byte size of the COG this writer stored at *path*, or None if unknown.
+
+        Each size is handed out once — the caller records it on the Asset.
+        """
+        return self._stored_sizes.pop(path, None)
+    
+    # =========================================================================
+    # Private Helpers
+    # =========================================================================
+    
+    def _write_cog(
+            self,
+            write_raw: Callable,
+            output_path: str,
+            bounds: tuple,
+            width: int,
+            height: int,
+            dtype,
+            crs: str,
+            nodata: float,
+            overviews: bool = True,
+            scale: float = None,
+            offset: float = None,
+    ) -> str:
+        """Two-pass COG write; *write_raw* fills the pass-1 dataset."""
+        cog_path = self._encode_cog(
+            write_raw, bounds, width, height, dtype, crs, nodata,
+            overviews=overviews, scale=scale, offset=offset,
+        )
+        return self._upload_cog(cog_path, output_path)
+    
+    def _upload_executor(self) -> Optional[ThreadPoolExecutor]:
+        """The upload pool, or None when GEORIVA_UPLOAD_CONCURRENCY is 0."""
+        workers = settings.GEORIVA_UPLOAD_CONCURRENCY
+        if workers <= 0:
+            return None
+        with self._upload_pool_lock:
+            if self._upload_pool is None:
+                self._upload_pool = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="georiva-upload",
+                )
+                self._upload_slots = threading.Semaphore(workers)
+            return self._upload_pool
+    
+    def _upload_cog(self, cog_path: str, output_path: str) -> str:
+        """Upload an encoded COG, then delete the local file."""
+        try:
+            size = Path(cog_path).stat().st_size
+            stored = self._upload_with_retry(cog_path, output_path)
+            self._stored_sizes[stored] = size
+            return stored
+        finally:
+            Path(cog_path).unlink(missing_ok=True)
+    
+    def _upload_with_retry(self, local_path: str, output_path: str) -> str:
+        """
+        Upload, retrying a failed attempt up to GEORIVA_UPLOAD_ATTEMPTS times
+        in all with exponential backoff (1 s, 2 s, 4 s …).
+
+        The COG is already encoded on local disk, so a transient storage
+        error costs a re-send instead of failing the variable and, with it,
+        the whole file's re-ingestion.
+        """
+        attempts = max(1, settings.GEORIVA_UPLOAD_ATTEMPTS)
+        for attempt in range(attempts):
+            try:
+                return self.bucket.upload(local_path, output_path)
+            except Exception as e:
+                if attempt == attempts - 1:
+                    raise
+                delay = 2 ** attempt
+                self.logger.warning(
+                    "Upload of %s failed (attempt %d/%d): %s — retrying in %ds",
+                    output_path, attempt + 1, attempts, e, delay,
+                )
+                time.sleep(delay)
+    
+    def _encode_cog(
+            self,
+            write_raw: Callable,
+            bounds: tuple,
+            width: int,
+            height: int,
+            dtype,
+            crs: str,
+            nodata: float,
+            overviews: bool = True,
+            scale: float = None,
+            offset: float = None,
+    ) -> str:
+        """
+        Encode the COG to a local temp file and return its path — the
+        caller owns (and must delete) it. *write_raw* fills the pass-1
+        dataset, which is staged in GDAL's in-memory filesystem when its
+        uncompressed size is within GEORIVA_COG_RAW_IN_MEMORY_MAX_BYTES, and
+        in a temp file otherwise. A *scale* / *offset* is set on the band,
+        and cog_translate carries it into the COG.
+        """
         transform = from_bounds(*bounds, width, height)
         blocksize = self._blocksize(width, height)
-        overview_levels = self._overview_levels(width, height, blocksize)
+        overview_levels = self._overview_levels(width, height, blocksize) if overviews else 0
         _nodata = nodata if nodata is not None else self._default_nodata(dtype)
         _predictor = self._predictor(dtype)
         
@@ -91,6 +331,10 @@ class AssetWriter:
             "blockxsize": blocksize,
             "blockysize": blocksize,
             "predictor": _predictor,
+            "zlevel": settings.GEORIVA_COG_DEFLATE_LEVEL,
+            # Compressed size can't be known up front; IF_NEEDED would
+            # fail a >4 GB output rather than switch to BigTIFF.
+            "BIGTIFF": "IF_SAFER",
         })
         
         raw_profile = {
@@ -102,31 +346,26 @@ class AssetWriter:
             'crs': crs,
             'transform': transform,
             'nodata': _nodata,
+            # Tiled on the COG's own block grid, so pass 2 reads each output
+            # block as one aligned source tile rather than a band of strips.
+            'tiled': True,
+            'blockxsize': blocksize,
+            'blockysize': blocksize,
         }
         
-        tmp_path = None
-        cog_path = None
+        def fill(dst):
+            write_raw(dst)
+            if scale is not None:
+                dst.scales = (scale,)
+                dst.offsets = (offset or 0.0,)
         
-        try:
-            with tempfile.NamedTemporaryFile(
-                    suffix='.tif',
-                    delete=False,
-                    dir=settings.GEORIVA_TEMP_DIR,
-            ) as tmp:
-                tmp_path = tmp.name
-            cog_path = tmp_path.replace('.tif', '_cog.tif')
-            
-            # Pass 1 — write raw data as a plain GeoTIFF
-            # No overviews here — cog_translate handles that in pass 2.
-            with rasterio.open(tmp_path, 'w', **raw_profile) as dst:
-                dst.write(data.astype(dtype), 1)
-            
+        def translate(source):
             # Pass 2 — build overviews and rewrite in true COG byte order.
             # overview_resampling="average" is appropriate for continuous
             # fields (precipitation, temperature). Use "nearest" for
             # categorical data (land cover, alert levels).
             cog_translate(
-                tmp_path,
+                source,
                 cog_path,
                 cog_profile,
                 overview_level=overview_levels,
@@ -134,37 +373,49 @@ class AssetWriter:
                 nodata=_nodata,
                 forward_band_tags=True,  # preserve band-level CF metadata
                 quiet=True,  # suppress progress bar in production
+                # Deflate blocks and build overviews on several threads.
+                config={"GDAL_NUM_THREADS": settings.GEORIVA_COG_NUM_THREADS},
             )
+        
+        raw_bytes = width * height * np.dtype(dtype).itemsize
+        tmp_path = None
+        cog_path = None
+        encoded = False
+        
+        try:
+            with tempfile.NamedTemporaryFile(
+                    suffix='.tif',
+                    delete=False,
+                    dir=settings.GEORIVA_TEMP_DIR,
+            ) as tmp:
+                tmp_path = tmp.name
+            cog_path = tmp_path.replace('.tif', '_cog.tif')
+            
+            # Pass 1 — write raw data as a plain GeoTIFF
+            # No overviews here — cog_translate handles that in pass 2.
+            if raw_bytes <= settings.GEORIVA_COG_RAW_IN_MEMORY_MAX_BYTES:
+                # Uncompressed pass-1 bytes never touch the disk
+                with MemoryFile() as memfile:
+                    with memfile.open(**raw_profile) as dst:
+                        fill(dst)
+                    with memfile.open() as src:
+                        translate(src)
+            else:
+                with rasterio.open(tmp_path, 'w', **raw_profile) as dst:
+                    fill(dst)
+                translate(tmp_path)
             
-            with open(cog_path, 'rb') as f:
-                return self.bucket.save(output_path, f)
+            encoded = True
+            return cog_path
         
         finally:
             # Always clean up temp files — even if an exception is raised.
             # These can be 64MB+ for global datasets so leaking them matters.
             if tmp_path:
                 Path(tmp_path).unlink(missing_ok=True)
-            if cog_path:
+            if cog_path and not encoded:
                 Path(cog_path).unlink(missing_ok=True)
     
-    def write_metadata(self, metadata: dict, output_path: str) -> str:
-        """
-        Serialise a metadata dict to JSON and write it to storage.
-
-        Args:
-            metadata:    Dict of variable/asset metadata.
-            output_path: Destination path in the bucket.
-
-        Returns:
-            Final stored path.
-        """
-        content = json.dumps(metadata, indent=2).encode('utf-8')
-        return self.bucket.save(output_path, content)
-    
-    # =========================================================================
-    # Private Helpers
-    # =========================================================================
-    
     def _blocksize(self, width: int, height: int) -> int:
         """
         Derive internal tile block size from raster dimensions.
@@ -1,13 +1,23 @@
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from typing import Optional, Tuple
 
 import numpy as np
 from adminboundarymanager.models import AdminBoundary
+from django.conf import settings
 from rasterio.features import geometry_mask
 from rasterio.transform import from_bounds
 
 logger = logging.getLogger(__name__)
 
+# Outside-masks (True = pixel to blank) shared by every clipper in the
+# process, least recently used first. Each ingested file and each derivation unit builds its own clipper,
+# but the boundary and the source grid rarely change between them.
+_shared_masks: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+_shared_masks_lock = threading.Lock()
+
 
 class BoundaryClipper:
     """
@@ -26,7 +36,10 @@ class BoundaryClipper:
         self.boundary = boundary
         self.apply_mask = apply_mask
         self._shapely_geom = None
+        self._geometry_key: Optional[bytes] = None
         self._mask_cache: dict = {}
+        self._outside_mask_cache: dict = {}
+        self._window_cache: dict = {}
         self._logger = logging.getLogger("georiva.ingestion.clipper")
     
     @property
@@ -69,6 +82,21 @@ class BoundaryClipper:
         if not self.bbox:
             return None
         
+        # One clipper serves every timestamp of a file, and the grid rarely
+        # changes between them — compute each window once.
+        cache_key = (tuple(src_bounds), src_width, src_height)
+        if cache_key not in self._window_cache:
+            self._window_cache[cache_key] = self._compute_window(
+                tuple(src_bounds), src_width, src_height
+            )
+        return dict(self._window_cache[cache_key])
+    
+    def _compute_window(
+            self,
+            src_bounds: Tuple[float, float, float, float],
+            src_width: int,
+            src_height: int,
+    ) -> dict:
         src_west, src_south, src_east, src_north = src_bounds
         clip_west, clip_south, clip_east, clip_north = self.bbox
         
@@ -109,8 +137,8 @@ class BoundaryClipper:
         exact_south = exact_north - win_height * res_y
         
         self._logger.debug(
-            f"Clip window: ({x_off}, {y_off}) {win_width}x{win_height} "
-            f"from {src_width}x{src_height}"
+            "Clip window: (%d, %d) %dx%d from %dx%d",
+            x_off, y_off, win_width, win_height, src_width, src_height,
         )
         
         return {
@@ -145,28 +173,89 @@ class BoundaryClipper:
         cache_key = (tuple(bounds), width, height)
         
         if cache_key not in self._mask_cache:
-            transform = from_bounds(*bounds, width, height)
-            
-            # geometry_mask returns True where geometry is NOT
-            # So we invert to get True where geometry IS
-            self._mask_cache[cache_key] = ~geometry_mask(
-                [self.shapely_geom],
-                out_shape=(height, width),
-                transform=transform,
-                invert=False
-            )
-            
-            self._logger.debug(
-                "Mask computed and cached for bounds=%s size=%dx%d", bounds, width, height
+            self._mask_cache[cache_key] = np.logical_not(
+                self.outside_mask(bounds, width, height)
             )
         
         return self._mask_cache[cache_key]
     
+    def _shared_outside_mask(
+            self,
+            bounds: Tuple[float, float, float, float],
+            width: int,
+            height: int,
+    ) -> np.ndarray:
+        """
+        The outside-mask from the process-wide LRU, rasterizing it on a miss.
+
+        Keyed by a digest of the geometry, so an edited boundary never
+        reuses a stale mask. Keeps GEORIVA_CLIP_MASK_CACHE_SIZE masks (0
+        disables sharing); they are read-only since every clipper may hold
+        the same array.
+        """
+        key = (self._geometry_digest(), bounds, width, height)
+        with _shared_masks_lock:
+            mask = _shared_masks.get(key)
+            if mask is not None:
+                _shared_masks.move_to_end(key)
+                return mask
+        
+        # rasterio's default output is already True outside the geometry
+        mask = geometry_mask(
+            [self.shapely_geom],
+            out_shape=(height, width),
+            transform=from_bounds(*bounds, width, height),
+        )
+        mask.flags.writeable = False
+        
+        self._logger.debug(
+            "Mask computed and cached for bounds=%s size=%dx%d", bounds, width, height
+        )
+        
+        limit = settings.GEORIVA_CLIP_MASK_CACHE_SIZE
+        if limit > 0:
+            with _shared_masks_lock:
+                _shared_masks[key] = mask
+                while len(_shared_masks) > limit:
+                    _shared_masks.popitem(last=False)
+        return mask
+    
+    def _geometry_digest(self) -> bytes:
+        if self._geometry_key is None:
+            self._geometry_key = hashlib.blake2b(
+                self.shapely_geom.wkb, digest_size=16
+            ).digest()
+        return self._geometry_key
+    
+    def outside_mask(
+            self,
+            bounds: Tuple[float, float, float, float],
+            width: int,
+            height: int,
+    ) -> np.ndarray:
+        """
+        Boolean array where True = outside boundary — the pixels to blank.
+        
+        This is the mask every masking path uses, so it is the one the
+        process-wide LRU holds: one read-only array per boundary and grid,
+        with no per-clipper negated copy. create_mask derives from it.
+        """
+        if not self.shapely_geom:
+            return np.zeros((height, width), dtype=bool)
+        
+        cache_key = (tuple(bounds), width, height)
+        
+        if cache_key not in self._outside_mask_cache:
+            self._outside_mask_cache[cache_key] = self._shared_outside_mask(*cache_key)
+        
+        return self._outside_mask_cache[cache_key]
+    
     def apply_geometry_mask(
             self,
             data: np.ndarray,
             bounds: Tuple[float, float, float, float],
             nodata: float = np.nan,
+            copy: bool = True,
     ) -> np.ndarray:
         """
         Mask data to boundary geometry.
@@ -175,18 +264,49 @@ class BoundaryClipper:
             data: 2D array to mask
             bounds: Data bounds
             nodata: Value to use outside geometry
+            copy: Mask a copy (default). Pass False when *data* is a buffer
+                  the caller owns — the mask is then written into it,
+                  saving a full-size allocation and one pass over memory.
         
         Returns:
-            Masked array (copy)
+            Masked array (a copy unless copy=False)
         """
         if not self.apply_mask or not self.shapely_geom:
             return data
         
         height, width = data.shape[:2]
-        mask = self.create_mask(bounds, width, height)
+        outside = self.outside_mask(bounds, width, height)
         
-        result = data.copy()
-        result[~mask] = nodata
+        if copy:
+            # Copy and mask in a single pass over the data
+            return np.where(outside, nodata, data)
         
-        return result
+        np.copyto(data, nodata, where=outside)
+        return data
     
+    def apply_geometry_mask_block(
+            self,
+            block: np.ndarray,
+            bounds: Tuple[float, float, float, float],
+            width: int,
+            height: int,
+            window: Tuple[int, int, int, int],
+            nodata: float = np.nan,
+    ) -> np.ndarray:
+        """
+        Mask one (x, y, w, h) tile of a width×height grid, in place.
+        
+        Used when a grid is streamed tile by tile — the boolean mask for the
+        full grid is built (and cached) once and sliced per tile.
+        
+        Returns:
+            The masked block
+        """
+        if not self.apply_mask or not self.shapely_geom:
+            return block
+        
+        x, y, w, h = window
+        outside = self.outside_mask(bounds, width, height)[y:y + h, x:x + w]
+        np.copyto(block, nodata, where=outside)
+        
+        return block
@@ -7,17 +7,35 @@ from urllib.parse import unquote
 
 import redis
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections, connection, transaction
+from django.dispatch import receiver
 
 from georiva.core.storage.filename import validate_path
-from georiva.core.storage.path_resolution import resolve_org_catalog
+from georiva.core.storage.path_resolution import resolve_org_catalog, resolve_org_catalogs
 from georiva.core.storage import BucketType, get_bucket_config
 from georiva.ingestion.models import FileIngestion
 from georiva.ingestion.tasks import process_incoming_file
 
+try:
+    # Optional — parses MinIO's batched notifications several times faster
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Both take the raw bytes BLPOP returns; orjson's JSONDecodeError subclasses
+# json's, so callers catch json.JSONDecodeError either way.
+_loads = orjson.loads if orjson is not None else json.loads
+
 REDIS_KEY = getattr(settings, "MINIO_REDIS_KEY", "georiva:minio:events")
 
+# Catalog resolutions — misses included — are reused for this many seconds.
+CATALOG_CACHE_TTL = 60
+CATALOG_CACHE_SIZE = 256
+_catalog_cache: dict[tuple[str, str], tuple[float, tuple]] = {}
+
 
 # Cache bucket config — it's static for the lifetime of the process
 @lru_cache(maxsize=1)
@@ -29,10 +47,64 @@ def _get_ingest_buckets() -> dict:
     }
 
 
+@receiver(setting_changed)
+def _bucket_config_changed(setting, **kwargs):
+    # Only overridden settings (tests) change in-process
+    if setting == "GEORIVA_BUCKETS":
+        _get_ingest_buckets.cache_clear()
+
+
 def _resolve_origin(bucket_name: str):
     return _get_ingest_buckets().get(bucket_name)
 
 
+def _resolve_catalog(org_slug: str, catalog_slug: str) -> tuple:
+    """
+    ``resolve_org_catalog``, remembered for CATALOG_CACHE_TTL seconds.
+
+    A burst of files for one catalog — or for one that does not exist —
+    costs a single lookup. Saving or deleting a Catalog or Organisation
+    clears the cache in that process (``ingestion/signals.py``); other
+    processes see the change once the entry expires.
+    """
+    key = (org_slug, catalog_slug)
+    now = time.monotonic()
+    cached = _catalog_cache.get(key)
+    if cached is not None and now - cached[0] < CATALOG_CACHE_TTL:
+        return cached[1]
+
+    resolved = resolve_org_catalog(org_slug, catalog_slug)
+    _remember_catalog(key, now, resolved)
+    return resolved
+
+
+def _prefetch_catalogs(pairs) -> None:
+    """
+    Resolve the (org_slug, catalog_slug) *pairs* not already cached with
+    one query between them (``resolve_org_catalogs``), so a notification
+    spanning many catalogs does not look each one up on its own.
+    """
+    now = time.monotonic()
+    missing = {
+        pair for pair in pairs
+        if pair not in _catalog_cache or now - _catalog_cache[pair][0] >= CATALOG_CACHE_TTL
+    }
+    if not missing:
+        return
+    for pair, resolved in resolve_org_catalogs(missing).items():
+        _remember_catalog(pair, now, resolved)
+
+
+def _remember_catalog(key: tuple[str, str], now: float, resolved: tuple) -> None:
+    if len(_catalog_cache) >= CATALOG_CACHE_SIZE:
+        _catalog_cache.clear()
+    _catalog_cache[key] = (now, resolved)
+
+
+def clear_catalog_cache() -> None:
+    _catalog_cache.clear()
+
+
 def _required_time_error(catalog, key: str) -> str | None:
     """
     For formats with no native time dimension (time_from_filename), a file's
@@ -75,42 +147,98 @@ def _should_stop(stop_event) -> bool:
 
 
 def _handle_event(ev: dict):
+    _handle_events([ev])
+
+
+def _handle_events(events: list[dict]):
+    """
+    Handle the records of one notification: parse each, register them all
+    with one ``FileIngestion.register_many`` round-trip set instead of a
+    get_or_create per record, resolve their catalogs together, then decide
+    and dispatch file by file. A failing record never stops its siblings.
+
+    A file named by several records (multipart uploads, MinIO redelivery)
+    is handled once, for its first record — the repeats would only queue
+    tasks that lose the processing lock.
+
+    Registration is one transaction that commits without waiting for its
+    WAL flush (``synchronous_commit = off``). A crash can lose only the
+    last few registrations, and the files are still in their buckets for
+    the sweep to find; dispatch starts after the commit either way.
+    """
+    parsed = []
+    seen = set()
+    for event in map(_parse_event, events):
+        if event is None or (event[1], event[2]) in seen:
+            continue
+        seen.add((event[1], event[2]))
+        parsed.append(event)
+    if not parsed:
+        return
+
+    # Register before deciding: a file we refuse to ingest must still leave a
+    # visible, actionable record. It is left in place in its bucket — never
+    # guessed into some other organisation, never deleted.
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL synchronous_commit = off")
+        registered = FileIngestion.register_many([
+            {
+                "bucket": origin_bucket,
+                "file_path": key,
+                "reference_time": meta.get("reference_time"),
+            }
+            for _, origin_bucket, key, meta in parsed
+        ])
+
+    try:
+        _prefetch_catalogs({(meta["org"], meta["catalog"]) for _, _, _, meta in parsed})
+    except Exception as e:
+        # Each file then resolves its own catalog, and reports its own error
+        logger.warning("Catalog prefetch failed: %s", e)
+
+    for bucket_name, origin_bucket, key, meta in parsed:
+        log, created = registered[(origin_bucket, key)]
+        try:
+            _dispatch_file(bucket_name, origin_bucket, key, meta, log, created)
+        except Exception as e:
+            logger.exception("Error handling event for %s: %s", key, e)
+
+
+def _parse_event(ev: dict):
+    """(bucket_name, origin_bucket, key, path meta) of an ingestible record, else None."""
     bucket_name = ev.get("s3", {}).get("bucket", {}).get("name", "")
     key_raw = ev.get("s3", {}).get("object", {}).get("key", "")
     
     if not key_raw or not bucket_name:
-        return
+        return None
     
     key = unquote(key_raw)
 
     # Skip placeholder and hidden files (.keep, .gitkeep, etc.)
     if Path(key).name.startswith('.'):
-        return
+        return None
 
     origin_bucket = _resolve_origin(bucket_name)
     if not origin_bucket:
-        return
+        return None
     
     try:
         meta = validate_path(key)
     except ValueError as e:
         logger.warning("Invalid path %s: %s", key, e)
-        return
-    
+        return None
+
+    return bucket_name, origin_bucket, key, meta
+
+
+def _dispatch_file(bucket_name: str, origin_bucket: str, key: str, meta: dict, log, created: bool):
+    """Refuse, skip or queue one registered file."""
     org_slug = meta["org"]
     catalog_slug = meta["catalog"]
     collection_slug = meta.get("collection")
 
-    catalog, resolution_error = resolve_org_catalog(org_slug, catalog_slug)
-
-    # Register before deciding: a file we refuse to ingest must still leave a
-    # visible, actionable record. It is left in place in its bucket — never
-    # guessed into some other organisation, never deleted.
-    log, created = FileIngestion.register(
-        bucket=origin_bucket,
-        file_path=key,
-        reference_time=meta.get("reference_time"),
-    )
+    catalog, resolution_error = _resolve_catalog(org_slug, catalog_slug)
 
     if catalog is None:
         logger.warning("Refusing %s: %s", key, resolution_error)
@@ -169,7 +297,7 @@ def _consume_loop(stop_event=None):
         
         _, raw = result
         try:
-            payload = json.loads(raw)
+            payload = _loads(raw)
         except json.JSONDecodeError as e:
             logger.warning("Invalid event JSON: %s", e)
             continue
@@ -181,11 +309,14 @@ def _consume_loop(stop_event=None):
         else:
             records = payload.get("Records", [payload])
         
-        for ev in records:
-            try:
-                _handle_event(ev)
-            except Exception as e:
-                logger.exception("Error handling event: %s", e)
+        # A long-lived thread outside any request: drop a connection the
+        # database or PgBouncer has closed (or one past CONN_MAX_AGE) before
+        # it fails this notification's queries.
+        close_old_connections()
+        try:
+            _handle_events(records)
+        except Exception as e:
+            logger.exception("Error handling events: %s", e)
 
 
 def run_minio_consumer(stop_event=None):
@@ -2,17 +2,48 @@ import logging
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import numpy as np
+from django.conf import settings
 
 from georiva.core.models import Variable
 from georiva.formats.base import BaseFormatPlugin
-from georiva.ingestion.utils import apply_unit_conversion
+from georiva.ingestion.utils import RunningStats, apply_unit_conversion, process_tiles
 
 logger = logging.getLogger(__name__)
 
 
+def _vector_magnitude(u: np.ndarray, v: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Wind speed as √(u² + v²).
+
+    Both components are assumed to be in the same units (typically m/s);
+    unit conversion is applied to the magnitude after computation.
+    """
+    return np.hypot(u, v, out=out)
+
+
+def _vector_direction(u: np.ndarray, v: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Meteorological direction (degrees the wind blows FROM, 0 = North,
+    clockwise). Output is always degrees (0–360) — unit conversion on
+    direction is a no-op and should not be configured on VECTOR_DIRECTION
+    variables.
+
+    Runs in a single output buffer — arctan2, degrees, offset and wrap are
+    applied in place, so no intermediate arrays are allocated. Pass *out*
+    to write into an existing buffer instead. Adding 540
+    (180 to flip to FROM, 360 to lift arctan2's negative half) keeps the
+    argument to fmod positive, so the wrap needs no sign handling.
+    """
+    direction = np.arctan2(u, v, out=out)
+    np.degrees(direction, out=direction)
+    direction += 540.0
+    np.fmod(direction, 360.0, out=direction)
+    return direction
+
+
 @dataclass
 class VariableData:
     """
@@ -25,6 +56,25 @@ class VariableData:
     stats: dict = field(default_factory=dict)
 
 
+@dataclass(frozen=True)
+class SourceRead:
+    """A source block resolved to the arguments the format plugin is called with."""
+    
+    variable_name: str
+    kwargs: dict
+
+
+@dataclass(frozen=True)
+class TransformPlan:
+    """
+    A Variable's transform resolved once: the kernel combining its inputs
+    (None for PASSTHROUGH) and the reads feeding it, in kernel argument order.
+    """
+    
+    kernel: Optional[Callable]
+    inputs: tuple[SourceRead, ...]
+
+
 class VariableExtractor:
     """
     Extracts and transforms data for a Variable from source files.
@@ -38,11 +88,20 @@ class VariableExtractor:
         PASSTHROUGH:      reads primary source directly
         VECTOR_MAGNITUDE: √(u² + v²) from u_component + v_component
         VECTOR_DIRECTION: meteorological direction from u_component + v_component
+
+    Multi-source transforms are evaluated tile-by-tile (see _extract_tiled)
+    so peak memory is bounded by the tile size, not the raster size.
     """
     
+    # Edge length of the blocks multi-source transforms are evaluated in —
+    # the same block grid the chunked ingestion path reads with.
+    tile_size = 2048
+    
     def __init__(self, format_plugin: BaseFormatPlugin):
         self.plugin = format_plugin
         self.logger = logging.getLogger("georiva.extractor")
+        self._plans: dict[tuple, TransformPlan] = {}
+        self._metadata: dict[tuple, dict] = {}
     
     def extract(
             self,
@@ -50,6 +109,7 @@ class VariableExtractor:
             file_path: Path,
             timestamp: datetime,
             window: tuple[int, int, int, int] = None,
+            out: np.ndarray = None,
     ) -> np.ndarray:
         """
         Extract data for a Variable, applying its transform and unit conversion.
@@ -59,30 +119,28 @@ class VariableExtractor:
             file_path: Local path to source file
             timestamp: Timestamp to extract
             window:    Optional (x, y, w, h) for chunked/windowed reading
+            out:       Optional float32 (height, width) array — typically a
+                       view into a larger buffer — to write the result into.
+                       Transform kernels and unit conversion then write
+                       straight into it instead of a block-sized temporary.
 
         Returns:
             2D numpy array (height, width) of float32 values in variable.unit
+            (*out* when given)
         """
-        sources = list(variable.sources)
-        
-        if not sources:
-            raise ValueError(f"Variable '{variable.slug}' has no sources defined")
-        
-        transform = variable.transform_type
-        
-        if transform == variable.TransformType.PASSTHROUGH:
-            data = self._extract_passthrough(sources, file_path, timestamp, window)
-        
-        elif transform == variable.TransformType.VECTOR_MAGNITUDE:
-            data = self._extract_vector_magnitude(sources, file_path, timestamp, window)
-        
-        elif transform == variable.TransformType.VECTOR_DIRECTION:
-            data = self._extract_vector_direction(sources, file_path, timestamp, window)
+        plan = self.plan(variable)
         
+        if plan.kernel is None:
+            data = self._extract_source(plan.inputs[0], file_path, timestamp, window, out=out)
         else:
-            raise ValueError(f"Unknown transform type: {transform}")
+            data = self._extract_tiled(plan, file_path, timestamp, window, out=out)
         
-        return apply_unit_conversion(data, variable.source_unit, variable.unit)
+        # A kernel's output is always a fresh array (or *out*), so it can be
+        # converted where it is; a passthrough read may be the plugin's own.
+        return apply_unit_conversion(
+            data, variable.source_unit, variable.unit, out=out,
+            inplace=plan.kernel is not None,
+        )
     
     def get_metadata(
             self,
@@ -91,24 +149,65 @@ class VariableExtractor:
             timestamp: datetime = None,
     ) -> dict:
         """
-        Get spatial metadata for a Variable from its primary source.
+        Get spatial metadata for a Variable from its first input source
+        (the primary source for PASSTHROUGH).
 
         Returns:
             dict with 'width', 'height', 'bounds', 'crs'
         """
+        plan = self.plan(variable)
+        return self._get_source_metadata(plan.inputs[0], file_path, timestamp)
+    
+    # =========================================================================
+    # Transform Plans
+    # =========================================================================
+    
+    # Kernel and the source roles it takes, per multi-source transform type
+    TRANSFORM_KERNELS = {
+        Variable.TransformType.VECTOR_MAGNITUDE: (_vector_magnitude, ('u_component', 'v_component')),
+        Variable.TransformType.VECTOR_DIRECTION: (_vector_direction, ('u_component', 'v_component')),
+    }
+    
+    def plan(self, variable: "Variable") -> TransformPlan:
+        """
+        Resolve a Variable's transform to a kernel and plugin reads.
+
+        The StreamField walk, role lookup and GRIB VariableKey construction
+        depend only on the Variable, yet extract() runs once per tile, per
+        timestamp. Plans are cached on the extractor — which lives for one
+        file — keyed by variable pk, so that work happens once per variable.
+        """
+        key = (variable.pk, variable.transform_type)
+        plan = self._plans.get(key) if variable.pk is not None else None
+        
+        if plan is None:
+            plan = self._build_plan(variable)
+            if variable.pk is not None:
+                self._plans[key] = plan
+        
+        return plan
+    
+    def _build_plan(self, variable: "Variable") -> TransformPlan:
         sources = list(variable.sources)
+        
         if not sources:
-            raise ValueError(f"Variable '{variable.slug}' has no sources")
+            raise ValueError(f"Variable '{variable.slug}' has no sources defined")
         
-        primary = self._get_primary_source(sources)
-        kwargs = self._build_plugin_kwargs(primary)
+        transform = variable.transform_type
         
-        return self.plugin.get_metadata_for_variable(
-            file_path=file_path,
-            variable_name=primary['source_name'],
-            timestamp=timestamp,
-            **kwargs,
-        )
+        if transform == variable.TransformType.PASSTHROUGH:
+            primary = self._get_primary_source(sources)
+            return TransformPlan(kernel=None, inputs=(self._resolve_source(primary),))
+        
+        if transform in self.TRANSFORM_KERNELS:
+            kernel, roles = self.TRANSFORM_KERNELS[transform]
+            inputs = tuple(
+                self._resolve_source(self._get_source_by_role(sources, role))
+                for role in roles
+            )
+            return TransformPlan(kernel=kernel, inputs=inputs)
+        
+        raise ValueError(f"Unknown transform type: {transform}")
     
     # =========================================================================
     # Source Helpers
@@ -131,6 +230,13 @@ class VariableExtractor:
                 return block.value
         raise ValueError(f"No source with role '{role}' found")
     
+    def _resolve_source(self, source) -> SourceRead:
+        """Resolve a source StructValue to its plugin variable name and kwargs."""
+        return SourceRead(
+            variable_name=source['source_name'],
+            kwargs=self._build_plugin_kwargs(source),
+        )
+    
     def _build_plugin_kwargs(self, source) -> dict:
         """
         Build format-specific kwargs from a source StructValue.
@@ -157,84 +263,124 @@ class VariableExtractor:
         
         return kwargs
     
+    def _get_source_metadata(self, read: SourceRead, file_path: Path, timestamp: datetime = None) -> dict:
+        """
+        Spatial metadata (width, height, bounds, crs) for one resolved source.
+
+        The grid is a property of the variable, not of the time step, so the
+        plugin is asked once per source and file; later timestamps get the
+        cached dict (shared — treat it as read-only).
+        """
+        key = (str(file_path), read.variable_name, repr(read.kwargs))
+        meta = self._metadata.get(key)
+        if meta is None:
+            meta = self.plugin.get_metadata_for_variable(
+                file_path=file_path,
+                variable_name=read.variable_name,
+                timestamp=timestamp,
+                **read.kwargs,
+            )
+            self._metadata[key] = meta
+        return meta
+    
     def _extract_source(
             self,
-            source,
+            read: SourceRead,
             file_path: Path,
             timestamp: datetime,
             window: tuple = None,
+            out: np.ndarray = None,
     ) -> np.ndarray:
         """
-        Extract raw data for a single source StructValue using the format plugin.
+        Extract raw data for a single resolved source using the format plugin.
 
         No unit conversion here — conversion is applied once on the final
         output in extract(), after any transform has been applied.
 
         Args:
-            source:    StructValue with source_name, vertical_dimension, vertical_value
+            read:      Resolved source (plugin variable name and kwargs)
             file_path: Path to source file
             timestamp: Timestamp to extract
             window:    Optional spatial subset (x, y, w, h)
+            out:       Optional float32 array to cast the native-dtype read
+                       into, in one pass and without a float32 temporary
 
         Returns:
             2D numpy array (float32) in the source file's native units
+            (*out* when given)
         """
-        kwargs = self._build_plugin_kwargs(source)
-        
         extracted = self.plugin.extract_variable(
             file_path=file_path,
-            variable_name=source['source_name'],
+            variable_name=read.variable_name,
             timestamp=timestamp,
             window=window,
-            **kwargs,
+            **read.kwargs,
         )
         
+        if out is not None:
+            # Same (unsafe) cast asarray() would do, e.g. int16 or float64
+            np.copyto(out, extracted.data, casting="unsafe")
+            return out
         return np.asarray(extracted.data, dtype=np.float32)
     
     # =========================================================================
-    # Transform Implementations
+    # Transform Evaluation
     # =========================================================================
     
-    def _extract_passthrough(self, sources, file_path, timestamp, window) -> np.ndarray:
-        """Direct read from primary source with no computation."""
-        primary = self._get_primary_source(sources)
-        return self._extract_source(primary, file_path, timestamp, window)
-    
-    def _extract_vector_magnitude(self, sources, file_path, timestamp, window) -> np.ndarray:
+    def _extract_tiled(
+            self,
+            plan: TransformPlan,
+            file_path: Path,
+            timestamp: datetime,
+            window: tuple = None,
+            out: np.ndarray = None,
+    ) -> np.ndarray:
         """
-        Compute wind speed as √(u² + v²) from U and V components.
+        Evaluate a multi-source plan's kernel over its inputs, one tile at a time.
 
-        Both components are assumed to be in the same units (typically m/s).
-        Unit conversion is applied to the magnitude after computation.
+        A multi-source transform needs every input in memory at once; read
+        whole, that is one full-resolution float32 grid per input plus the
+        output. Reading tile_size × tile_size blocks of each input and having
+        the kernel write into a view of the preallocated output (kernels take
+        out=) keeps the peak at one block per input regardless of raster size.
+        Tiles are evaluated GEORIVA_CHUNK_READ_CONCURRENCY at a time, each
+        into its own view of the output.
+
+        Without a window the full extent is taken from the first input's
+        metadata. Extents that fit in a single tile are read directly. The
+        output is allocated here unless the caller passes *out*.
         """
-        u_source = self._get_source_by_role(sources, 'u_component')
-        v_source = self._get_source_by_role(sources, 'v_component')
+        if window is None:
+            meta = self._get_source_metadata(plan.inputs[0], file_path, timestamp)
+            x_off, y_off, width, height = 0, 0, meta["width"], meta["height"]
+        else:
+            x_off, y_off, width, height = window
         
-        u = self._extract_source(u_source, file_path, timestamp, window)
-        v = self._extract_source(v_source, file_path, timestamp, window)
+        if width <= self.tile_size and height <= self.tile_size:
+            inputs = [
+                self._extract_source(read, file_path, timestamp, window)
+                for read in plan.inputs
+            ]
+            return plan.kernel(*inputs, out=out)
         
-        magnitude = np.hypot(u, v)
-        del u, v
-        return magnitude
-    
-    def _extract_vector_direction(self, sources, file_path, timestamp, window) -> np.ndarray:
-        """
-        Compute meteorological wind direction from U and V components.
-
-        Convention: direction wind comes FROM, 0 = North, clockwise.
-        Output is always in degrees (0–360) — unit conversion on direction
-        is a no-op and should not be configured on VECTOR_DIRECTION variables.
-        """
-        u_source = self._get_source_by_role(sources, 'u_component')
-        v_source = self._get_source_by_role(sources, 'v_component')
+        if out is None:
+            out = np.empty((height, width), dtype=np.float32)
         
-        u = self._extract_source(u_source, file_path, timestamp, window)
-        v = self._extract_source(v_source, file_path, timestamp, window)
+        def evaluate(x, y, w, h):
+            tile_window = (x_off + x, y_off + y, w, h)
+            inputs = [
+                self._extract_source(read, file_path, timestamp, tile_window)
+                for read in plan.inputs
+            ]
+            # Kernels write straight into the output tile — no per-tile result
+            plan.kernel(*inputs, out=out[y:y + h, x:x + w])
         
-        direction = np.degrees(np.arctan2(u, v)) + 180.0
-        direction = np.mod(direction, 360.0)
-        del u, v
-        return direction
+        process_tiles(
+            width, height, evaluate, block_size=self.tile_size, offset=(x_off, y_off),
+            max_workers=settings.GEORIVA_CHUNK_READ_CONCURRENCY,
+        )
+        
+        return out
     
     # =========================================================================
     # Statistics
@@ -251,8 +397,8 @@ class VariableExtractor:
         Compute global statistics for a Variable in its output units.
 
         For PASSTHROUGH without a clip window, uses lazy/dask-backed loading
-        to avoid materialising the full array in memory. Falls back to full
-        extraction for VECTOR transforms or windowed reads.
+        to avoid materialising the full array in memory. VECTOR transforms,
+        windowed reads and non-lazy plugins are streamed block by block.
 
         Args:
             variable:  Variable to compute stats for
@@ -261,8 +407,7 @@ class VariableExtractor:
             window:    Optional clip window dict with x_off, y_off, width, height
         """
         try:
-            sources = list(variable.sources)
-            if not sources:
+            if not list(variable.sources):
                 return {"min": None, "max": None, "mean": None, "std": None}
             
             window_tuple = None
@@ -277,31 +422,58 @@ class VariableExtractor:
             # Lazy path: PASSTHROUGH only, no window
             if window_tuple is None and variable.transform_type == variable.TransformType.PASSTHROUGH:
                 try:
-                    stats = self._compute_stats_lazy(variable, sources, file_path, timestamp)
+                    stats = self._compute_stats_lazy(variable, file_path, timestamp)
                     if stats:
                         return stats
                 except (NotImplementedError, ValueError):
                     pass  # fall through to full extraction
             
-            # Full extraction path
-            data = self.extract(variable, file_path, timestamp, window=window_tuple)
-            # unit conversion already applied inside extract()
-            
-            return {
-                "min": float(np.nanmin(data)),
-                "max": float(np.nanmax(data)),
-                "mean": float(np.nanmean(data)),
-                "std": float(np.nanstd(data)),
-            }
+            return self._compute_stats_streamed(variable, file_path, timestamp, window_tuple)
         
         except Exception as e:
-            self.logger.warning(f"Stats computation failed for {variable.slug}: {e}")
+            self.logger.warning("Stats computation failed for %s: %s", variable.slug, e)
             return {"min": None, "max": None, "mean": None, "std": None}
-    
+
+    def _compute_stats_streamed(
+            self,
+            variable: "Variable",
+            file_path: Path,
+            timestamp: datetime,
+            window: tuple = None,
+    ) -> dict:
+        """
+        Compute stats by extracting tile_size blocks and folding each into a
+        RunningStats accumulator.
+
+        Only one converted block per worker (GEORIVA_CHUNK_READ_CONCURRENCY)
+        is resident at a time, so stats for VECTOR transforms, windowed reads
+        and plugins without lazy loading no longer need the whole output
+        array in memory.
+        """
+        if window is None:
+            meta = self.get_metadata(variable, file_path, timestamp)
+            x_off, y_off, width, height = 0, 0, meta["width"], meta["height"]
+        else:
+            x_off, y_off, width, height = window
+
+        def tile_stats(x, y, w, h):
+            tile = RunningStats()
+            tile.update(self.extract(variable, file_path, timestamp, window=(x_off + x, y_off + y, w, h)))
+            return tile
+
+        # Each tile is reduced where it is read; only its moments come back
+        stats = RunningStats()
+        for tile in process_tiles(
+                width, height, tile_stats, block_size=self.tile_size, offset=(x_off, y_off),
+                max_workers=settings.GEORIVA_CHUNK_READ_CONCURRENCY,
+        ):
+            stats.merge(tile)
+
+        return stats.result()
+
     def _compute_stats_lazy(
             self,
             variable: "Variable",
-            sources: list,
             file_path: Path,
             timestamp: datetime,
     ) -> Optional[dict]:
@@ -312,14 +484,13 @@ class VariableExtractor:
         stats — no full array materialisation, dask streams in chunks.
         Returns None if the plugin does not support lazy loading.
         """
-        primary = self._get_primary_source(sources)
-        kwargs = self._build_plugin_kwargs(primary)
+        primary = self.plan(variable).inputs[0]
         
         with self.plugin.open_variable(
                 file_path=file_path,
-                variable_name=primary['source_name'],
+                variable_name=primary.variable_name,
                 timestamp=timestamp,
-                **kwargs,
+                **primary.kwargs,
         ) as var_info:
             lazy_data = var_info.data
             
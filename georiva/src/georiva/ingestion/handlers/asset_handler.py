@@ -2,7 +2,7 @@
 AssetHandler — extract raster data for a single variable.
 
 Owns:
-  - Direct and chunked raster extraction
+  - Direct, chunked and streamed raster extraction
 
 Everything downstream of the extracted array — boundary masking, COG / JSON
 writing, Asset DB records, collection extent — is the shared
@@ -10,6 +10,7 @@ AssetMaterializer (``ingestion/materialization.py``), which the derivation
 engine uses too.
 """
 import logging
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Optional
@@ -22,7 +23,7 @@ from georiva.ingestion.asset_writer import AssetWriter
 from georiva.ingestion.clipper import BoundaryClipper
 from georiva.ingestion.extractor import VariableExtractor
 from georiva.ingestion.materialization import AssetMaterializer
-from georiva.ingestion.utils import iter_windows
+from georiva.ingestion.utils import iter_windows, process_tiles
 
 if TYPE_CHECKING:
     from georiva.core.models import Variable
@@ -45,7 +46,13 @@ class AssetHandler:
     ):
         self.writer = writer
         self.extractor = extractor
-        self.materializer = AssetMaterializer(writer)
+        # Ingestion defers Asset rows per timestamp, so each COG uploads in
+        # the background while the next variable is extracted and encoded.
+        self.materializer = AssetMaterializer(writer, background_uploads=True)
+        # Chunked-extraction output buffer and streaming tile buffer, one
+        # per worker thread (variables may run concurrently), reused across
+        # variables and timestamps.
+        self._buffers = threading.local()
 
     # =========================================================================
     # Public entry point
@@ -64,19 +71,55 @@ class AssetHandler:
             height: int,
             clipper: Optional[BoundaryClipper] = None,
             clip_window: Optional[dict] = None,
+            native_block: Optional[tuple] = None,
+            defer_save: bool = False,
+            extra_fields: Optional[dict] = None,
     ) -> list[Asset]:
         """
         Run the full pipeline for *variable* at *timestamp*.
 
+        *defer_save* returns the Asset rows unsaved (see
+        ``AssetMaterializer.save_assets``). *extra_fields* are recorded on
+        the COG Asset. *native_block* is the source's internal (rows, cols)
+        block shape; chunked and streamed reads are cut along it.
+
         Steps:
           1. Extract the raw float array
           2. Hand off to the shared AssetMaterializer (mask, write, record,
              expand collection extent)
 
+        Read windows above GEORIVA_STREAM_THRESHOLD_PIXELS — the whole grid,
+        or the clip window of a clipped one — skip step 1: tiles are streamed
+        straight into the materializer instead.
+
         Returns the list of Asset records created.
         """
         logger.debug("Processing variable: %s", variable.slug)
 
+        outside = self._outside_mask(clipper, bounds, width, height)
+
+        if self._use_streaming(width, height):
+            logger.debug(
+                "Streaming %s (%dx%d) tile by tile", variable.slug, width, height
+            )
+            return self.materializer.materialize_blocks(
+                item=item,
+                variable=variable,
+                blocks=self._iter_blocks(
+                    variable, local_path, timestamp, width, height, clip_window,
+                    outside=outside, native_block=native_block,
+                ),
+                width=width,
+                height=height,
+                bounds=bounds,
+                crs=crs,
+                timestamp=timestamp,
+                clipper=clipper,
+                defer_save=defer_save,
+                extra_fields=extra_fields,
+            )
+
+        chunked = self._use_chunked(width, height)
         final_data = self._extract(
             variable=variable,
             local_path=local_path,
@@ -84,6 +127,8 @@ class AssetHandler:
             width=width,
             height=height,
             clip_window=clip_window,
+            outside=outside,
+            native_block=native_block,
         )
 
         assets = self.materializer.materialize_variable(
@@ -94,9 +139,15 @@ class AssetHandler:
             crs=crs,
             timestamp=timestamp,
             clipper=clipper,
+            # The chunked buffer is allocated here and dropped right after,
+            # so the boundary mask can be written straight into it.
+            owns_data=chunked,
+            defer_save=defer_save,
+            extra_fields=extra_fields,
         )
 
-        # Explicitly release large arrays — can be 64 MB+ for global data.
+        # Release our reference — a chunked buffer stays with _buffers for
+        # the next variable; a direct read can be 64 MB+ for global data.
         del final_data
 
         return assets
@@ -113,28 +164,28 @@ class AssetHandler:
             width: int,
             height: int,
             clip_window: Optional[dict] = None,
+            outside: Optional[np.ndarray] = None,
+            native_block: Optional[tuple] = None,
     ) -> np.ndarray:
         """
         Extract raw data from the source file.
 
         Switches between two strategies based on raster size:
 
-        Direct extraction  — clipped or small rasters (reads full or windowed
-                             array at once).
+        Direct extraction  — small rasters or clip windows (reads the full
+                             or windowed array at once).
 
-        Chunked extraction — large unclipped rasters above
+        Chunked extraction — rasters or clip windows above
                              GEORIVA_CHUNK_THRESHOLD_PIXELS. Processes the
-                             grid in 2048×2048 blocks to avoid OOM on
+                             read window in 2048×2048 blocks to avoid OOM on
                              continental or global datasets.
 
-        Boundary geometry masking happens downstream in the materializer.
+        *width* / *height* are the read window's — the clip window's when
+        there is one. Boundary geometry masking happens downstream in the
+        materializer; *outside* (see ``_outside_mask``) only lets chunked
+        extraction skip reading blocks the mask would blank anyway.
         """
-        use_chunked = (
-                width * height > settings.GEORIVA_CHUNK_THRESHOLD_PIXELS
-                and clip_window is None
-        )
-
-        if use_chunked:
+        if self._use_chunked(width, height):
             logger.debug(
                 "Using chunked extraction for %s (%dx%d)", variable.slug, width, height
             )
@@ -144,6 +195,9 @@ class AssetHandler:
                 timestamp=timestamp,
                 width=width,
                 height=height,
+                clip_window=clip_window,
+                outside=outside,
+                native_block=native_block,
             )
 
         return self._extract_direct(
@@ -153,6 +207,40 @@ class AssetHandler:
             clip_window=clip_window,
         )
 
+    @staticmethod
+    def _use_streaming(width: int, height: int) -> bool:
+        threshold = settings.GEORIVA_STREAM_THRESHOLD_PIXELS
+        return bool(threshold) and width * height > threshold
+
+    @staticmethod
+    def _use_chunked(width: int, height: int) -> bool:
+        return width * height > settings.GEORIVA_CHUNK_THRESHOLD_PIXELS
+
+    @staticmethod
+    def _outside_mask(
+            clipper: Optional[BoundaryClipper],
+            bounds: tuple,
+            width: int,
+            height: int,
+    ) -> Optional[np.ndarray]:
+        """
+        The boundary's outside-mask for the read window, when it will be
+        applied — the clipper caches it, and the materializer masks with
+        the same array.
+        """
+        if clipper is None or not clipper.is_active:
+            return None
+        if not clipper.apply_mask or not clipper.shapely_geom:
+            return None
+        return clipper.outside_mask(tuple(bounds), width, height)
+
+    @staticmethod
+    def _window_offset(clip_window: Optional[dict]) -> tuple[int, int]:
+        """Source-grid (x, y) offset of the read window."""
+        if not clip_window:
+            return 0, 0
+        return clip_window["x_off"], clip_window["y_off"]
+
     def _extract_direct(
             self,
             variable: "Variable",
@@ -179,18 +267,110 @@ class AssetHandler:
             timestamp: datetime,
             width: int,
             height: int,
+            clip_window: Optional[dict] = None,
+            outside: Optional[np.ndarray] = None,
+            native_block: Optional[tuple] = None,
     ) -> np.ndarray:
         """
-        Process large variable in 2048×2048 pixel blocks.
+        Process large variable in 2048×2048 pixel blocks (rounded up to
+        whole *native_block* blocks, see ``iter_windows``).
 
         Keeps peak memory usage bounded regardless of input raster size —
         critical for global datasets (7200×3600) in memory-limited workers.
+        The output buffer is reused rather than reallocated per variable; the
+        blocks tile it exactly, so it needs no zero-fill either. Each block is
+        extracted and converted straight into its view of the buffer.
+
+        With GEORIVA_CHUNK_READ_CONCURRENCY > 1 the blocks are read on a
+        thread pool — the views are disjoint, and reads release the GIL — so
+        the disk or decoder has several requests in flight instead of one.
+
+        Blocks entirely outside the boundary (per *outside*) are filled with
+        NaN instead of read — an irregular boundary's bbox can be mostly
+        outside it.
         """
-        final_data = np.zeros((height, width), dtype=np.float32)
+        final_data = self._chunk_buffer(height, width)
+        x_off, y_off = self._window_offset(clip_window)
+
+        def read(x, y, w, h):
+            if self._blanked(outside, (x, y, w, h)):
+                final_data[y:y + h, x:x + w] = np.nan
+                return
+            self.extractor.extract(
+                variable, local_path, timestamp, (x_off + x, y_off + y, w, h),
+                out=final_data[y:y + h, x:x + w],
+            )
 
-        for x, y, w, h in iter_windows(width, height, block_size=2048):
-            chunk = self.extractor.extract(variable, local_path, timestamp, (x, y, w, h))
-            final_data[y:y + h, x:x + w] = chunk
-            del chunk
+        process_tiles(
+            width, height, read, block_size=2048, offset=(x_off, y_off),
+            native_block=native_block,
+            max_workers=settings.GEORIVA_CHUNK_READ_CONCURRENCY,
+        )
 
         return final_data
+
+    def _iter_blocks(
+            self,
+            variable: "Variable",
+            local_path: Path,
+            timestamp: datetime,
+            width: int,
+            height: int,
+            clip_window: Optional[dict] = None,
+            outside: Optional[np.ndarray] = None,
+            native_block: Optional[tuple] = None,
+    ):
+        """
+        Yield ((x, y, w, h), block) tiles of the variable, read lazily.
+
+        Windows are relative to the read window (the clip window, if any),
+        which is what the materializer's grid — and bounds — describe.
+
+        Every tile is extracted into the same buffer, so a block is only
+        valid until the next one is requested — the materializer masks,
+        folds and writes each before moving on. Tiles entirely outside the
+        boundary are NaN-filled instead of read, as in ``_extract_chunked``.
+        """
+        x_off, y_off = self._window_offset(clip_window)
+        for x, y, w, h in iter_windows(
+                width, height, block_size=2048, offset=(x_off, y_off),
+                native_block=native_block,
+        ):
+            tile = self._tile_buffer(h, w)
+            if self._blanked(outside, (x, y, w, h)):
+                tile.fill(np.nan)
+                yield (x, y, w, h), tile
+                continue
+            yield (x, y, w, h), self.extractor.extract(
+                variable, local_path, timestamp, (x_off + x, y_off + y, w, h),
+                out=tile,
+            )
+
+    @staticmethod
+    def _blanked(outside: Optional[np.ndarray], window: tuple) -> bool:
+        """Whether the boundary mask blanks every pixel of *window*."""
+        if outside is None:
+            return False
+        x, y, w, h = window
+        return bool(outside[y:y + h, x:x + w].all())
+
+    def _tile_buffer(self, height: int, width: int) -> np.ndarray:
+        """
+        A contiguous (height, width) float32 view of this thread's
+        streaming tile buffer — edge tiles take a prefix of it rather than
+        a strided corner. Sized for 2048×2048 tiles, and grown once for a
+        source whose native blocks round the tiles up.
+        """
+        tile = getattr(self._buffers, "tile", None)
+        if tile is None or tile.size < height * width:
+            tile = np.empty(max(2048 * 2048, height * width), dtype=np.float32)
+            self._buffers.tile = tile
+        return tile[:height * width].reshape(height, width)
+
+    def _chunk_buffer(self, height: int, width: int) -> np.ndarray:
+        """This thread's float32 buffer for a (height, width) grid."""
+        buffer = getattr(self._buffers, "data", None)
+        if buffer is None or buffer.shape != (height, width):
+            buffer = np.empty((height, width), dtype=np.float32)
+            self._buffers.data = buffer
+        return buffer
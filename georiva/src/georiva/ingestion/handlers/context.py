@@ -36,3 +36,6 @@ class IngestionContext:
     origin_bucket: str
     reference_time: Optional[datetime] = None
     ingestion_log: Optional["FileIngestion"] = None
+    # Version of the source file's content (its storage modified time);
+    # empty when unknown, which disables reusing unchanged assets.
+    source_version: str = ""
@@ -2,10 +2,15 @@
 CollectionExtentHandler — expand a Collection's temporal and spatial extent.
 """
 import logging
+import threading
 from datetime import datetime
+from typing import Optional
+
+from django.contrib.postgres.fields import ArrayField
+from django.db.models import F, FloatField, Func, Value
+from django.db.models.functions import Coalesce, Greatest, Least
 
 from georiva.core.models import Collection
-from georiva.ingestion.utils import normalize_bounds
 
 logger = logging.getLogger(__name__)
 
@@ -14,10 +19,38 @@ class CollectionExtentHandler:
     """
     Expands a Collection's temporal and spatial extent to include a new Item.
 
-    Uses field-level saves (update_fields) to avoid overwriting concurrent
-    updates from other ingestion workers processing the same collection.
+    The widening is one atomic UPDATE that takes LEAST / GREATEST against
+    the stored values, so a worker holding a stale Collection can never
+    narrow an extent another worker has already widened. Within a worker,
+    variables and timestamps may run in threads sharing one Collection
+    instance, so the in-memory compare is serialised by a lock.
+
+    Between ``defer()`` and ``flush()`` only the in-memory extent widens;
+    ``flush`` then writes one UPDATE per Collection for the whole batch —
+    a file's run, instead of one per timestamp.
     """
     
+    def __init__(self):
+        # Collections widened since defer(), by id(): (collection, fields)
+        self._pending: Optional[dict[int, tuple[Collection, set]]] = None
+        self._lock = threading.Lock()
+    
+    def defer(self) -> None:
+        """Hold extent writes back until ``flush``."""
+        with self._lock:
+            if self._pending is None:
+                self._pending = {}
+    
+    def flush(self, keep_deferring: bool = False) -> None:
+        """
+        Write the extents widened since ``defer`` and stop deferring —
+        unless *keep_deferring*, which starts a fresh batch instead.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {} if keep_deferring else None
+        for collection, fields in (pending or {}).values():
+            self._write(collection, fields)
+    
     def expand(
             self,
             collection: Collection,
@@ -29,7 +62,18 @@ class CollectionExtentHandler:
 
         A no-op if the collection's current extent already covers both.
         Only the fields that actually changed are written to the database.
+        *bounds* arrive normalised from the AssetMaterializer, so the
+        min/max union of them stays in range without normalising again.
         """
+        with self._lock:
+            self._expand(collection, timestamp, bounds)
+    
+    def _expand(
+            self,
+            collection: Collection,
+            timestamp: datetime,
+            bounds: tuple | list,
+    ) -> None:
         update_fields = []
         
         # ── Temporal extent ───────────────────────────────────────────────────
@@ -54,11 +98,53 @@ class CollectionExtentHandler:
                 max(current[3], bounds[3]),  # north
             ]
             if expanded != list(current):
-                collection.bounds = normalize_bounds(expanded)
+                collection.bounds = expanded
                 update_fields.append("bounds")
         
-        if update_fields:
-            collection.save(update_fields=update_fields)
-            logger.debug(
-                "Updated extent for %s: fields=%s", collection.slug, update_fields
+        if not update_fields:
+            return
+        if self._pending is not None:
+            _, fields = self._pending.setdefault(id(collection), (collection, set()))
+            fields.update(update_fields)
+            return
+        self._write(collection, update_fields)
+    
+    def _write(self, collection: Collection, fields) -> None:
+        """Widen the stored extent to *collection*'s in-memory one."""
+        # No save(): the Collection post_save receivers (dropzone .keep,
+        # feed schedule, catalog search index) don't depend on extent.
+        Collection.objects.filter(pk=collection.pk).update(
+            **self._widened(fields, collection)
+        )
+        logger.debug(
+            "Updated extent for %s: fields=%s", collection.slug, sorted(fields)
+        )
+    
+    @staticmethod
+    def _widened(fields, collection: Collection) -> dict:
+        """
+        UPDATE expressions widening each of *fields* against its stored
+        value, to *collection*'s in-memory extent.
+        """
+        def least(column, value):
+            return Least(Coalesce(F(column), Value(value)), Value(value))
+        
+        def greatest(column, value):
+            return Greatest(Coalesce(F(column), Value(value)), Value(value))
+        
+        updates = {}
+        if "time_start" in fields:
+            updates["time_start"] = least("time_start", collection.time_start)
+        if "time_end" in fields:
+            updates["time_end"] = greatest("time_end", collection.time_end)
+        if "bounds" in fields:
+            west, south, east, north = (float(v) for v in collection.bounds[:4])
+            updates["bounds"] = Func(
+                least("bounds__0", west),
+                least("bounds__1", south),
+                greatest("bounds__2", east),
+                greatest("bounds__3", north),
+                template="ARRAY[%(expressions)s]",
+                output_field=ArrayField(FloatField()),
             )
+        return updates
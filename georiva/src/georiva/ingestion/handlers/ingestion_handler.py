@@ -4,12 +4,19 @@ IngestionHandler — orchestrates one (collection × timestamp) ingestion unit.
 Can be called directly from management commands or tests to reprocess
 a single timestamp without running the full pipeline.
 """
+import hashlib
 import logging
+import os
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Optional
 
+from django.conf import settings
+from django.db import connections
+
 from georiva.core.models import Collection, Item, Asset
 from georiva.ingestion.handlers.asset_handler import AssetHandler
 from georiva.ingestion.handlers.context import IngestionContext
@@ -28,19 +35,66 @@ class IngestionHandler:
 
     Usage::
 
-        handler = IngestionHandler(ctx)
-        item, assets, clip_info, failed_vars = handler.process_timestamp(
-            collection=collection,
-            local_path=local_path,
-            timestamp=ts,
-            source_file="sources:ecmwf/2025/01/01/file.grib",
-        )
+        with IngestionHandler(ctx) as handler:
+            item, assets, clip_info, failed_vars = handler.process_timestamp(
+                collection=collection,
+                local_path=local_path,
+                timestamp=ts,
+                source_file="sources:ecmwf/2025/01/01/file.grib",
+            )
     """
     
     def __init__(self, ctx: IngestionContext):
         self.ctx = ctx
         self.item_handler = ItemHandler()
         self.asset_handler = AssetHandler(ctx.writer, ctx.extractor)
+        # Variable worker threads, started on first use and shared by every
+        # timestamp of the file instead of a fresh pool per timestamp.
+        self._variable_pool: Optional[ThreadPoolExecutor] = None
+        self._variable_pool_lock = threading.Lock()
+        # Timestamps done since the held-back extents and item counts were
+        # last written
+        self._unflushed = 0
+        self._unflushed_lock = threading.Lock()
+    
+    def close(self) -> None:
+        """
+        Stop the variable worker threads and write the collection extents
+        and item counts held back since ``__enter__``; call once the file
+        is done.
+        """
+        with self._variable_pool_lock:
+            pool, self._variable_pool = self._variable_pool, None
+        if pool is not None:
+            pool.shutdown()
+        self.asset_handler.materializer.extent_handler.flush()
+        self.item_handler.flush()
+    
+    def __enter__(self) -> "IngestionHandler":
+        # One extent UPDATE and one item_count UPDATE per collection for
+        # every GEORIVA_EXTENT_FLUSH_TIMESTAMPS timestamps of the file,
+        # instead of one of each per timestamp.
+        self.asset_handler.materializer.extent_handler.defer()
+        self.item_handler.defer()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+    
+    def _timestamp_done(self) -> None:
+        """
+        Write the held-back extents and item counts every
+        GEORIVA_EXTENT_FLUSH_TIMESTAMPS timestamps, so a worker killed
+        mid-file loses at most that batch rather than the whole file's.
+        """
+        every = settings.GEORIVA_EXTENT_FLUSH_TIMESTAMPS
+        with self._unflushed_lock:
+            self._unflushed += 1
+            if not every or self._unflushed < every:
+                return
+            self._unflushed = 0
+        self.asset_handler.materializer.extent_handler.flush(keep_deferring=True)
+        self.item_handler.flush(keep_deferring=True)
     
     # =========================================================================
     # Public entry point
@@ -54,19 +108,31 @@ class IngestionHandler:
             timestamp: datetime,
             source_file: str,
             progress=None,
+            force_recompute_stats: bool = False,
     ) -> tuple[Optional[Item], list[Asset], dict, list[str]]:
         """
         Process all Variables for *collection* at *timestamp*.
 
+        When the Item already exists for the same source file and grid (a
+        retry or re-ingest), a variable whose COG was written from the same
+        version of the source with the same settings (see
+        ``_source_signature``) is not re-encoded at all — its Asset, stats
+        included, is kept as it is, unless *force_recompute_stats*. Every
+        other variable is encoded and its stats computed afresh: whatever
+        changed its signature may have changed its values too.
+
         Returns:
             (item, assets, clip_info, failed_variable_slugs)
 
         item is None if every variable failed (orphan Item is deleted).
         clip_info holds original_size / clipped_size for the first variable.
+
+        Raises ValueError when the boundary's clip window cannot be computed
+        and the source grid exceeds GEORIVA_CLIP_FALLBACK_MAX_PIXELS.
         """
         logger.info("Processing %s @ %s", collection, timestamp)
         
-        variables = [v for v in collection.variables.all() if v.is_active]
+        variables = collection.active_variables
         if not variables:
             raise ValueError(
                 f"Collection '{collection.slug}' has no active variables"
@@ -96,14 +162,21 @@ class IngestionHandler:
                     height = clip_window["height"]
                     bounds = clip_window["bounds"]
                     clip_info["clipped_size"] = (width, height)
-                    reduction = 100 * (1 - (width * height) / (src_width * src_height))
-                    logger.info(
-                        "Clipping: %dx%d → %dx%d (%.1f%% reduction)",
-                        src_width, src_height, width, height, reduction,
-                    )
+                    if logger.isEnabledFor(logging.INFO):
+                        reduction = 100 * (1 - (width * height) / (src_width * src_height))
+                        logger.info(
+                            "Clipping: %dx%d → %dx%d (%.1f%% reduction)",
+                            src_width, src_height, width, height, reduction,
+                        )
                 else:
                     width, height, bounds = src_width, src_height, src_bounds
             except ValueError as e:
+                fallback_max = settings.GEORIVA_CLIP_FALLBACK_MAX_PIXELS
+                if fallback_max and src_width * src_height > fallback_max:
+                    raise ValueError(
+                        f"{e} — refusing full-extent read of "
+                        f"{src_width}x{src_height} source grid"
+                    ) from e
                 logger.warning(
                     "Clip window computation failed: %s — using full extent", e
                 )
@@ -129,45 +202,232 @@ class IngestionHandler:
         )
         
         # ── Per-variable asset processing ─────────────────────────────────────
+        variable_kwargs = dict(
+            item=item,
+            local_path=local_path,
+            timestamp=ts_utc,
+            bounds=bounds,
+            crs=crs,
+            width=width,
+            height=height,
+            clipper=clipper,
+            clip_window=clip_window,
+            native_block=meta.get("block_shape"),
+            # Asset rows are upserted together below, not per variable.
+            defer_save=True,
+        )
+        
+        # ── Unchanged variables ───────────────────────────────────────────────
+        reused = {}
+        if item.same_source_rerun and not force_recompute_stats:
+            reused = self._reuse_unchanged(item, variables, variable_kwargs, progress)
+        pending = [variable for variable in variables if variable.pk not in reused]
+        
+        concurrency = min(self._variable_workers(), len(pending))
+        if concurrency > 1:
+            outcomes = self._process_variables_concurrently(
+                pending, variable_kwargs, concurrency, progress,
+            )
+        else:
+            outcomes = [
+                self._process_variable(variable, variable_kwargs, progress)
+                for variable in pending
+            ]
+        outcomes = iter(outcomes)
+        
+        # Collected in collection order regardless of completion order
         assets: list[Asset] = []
         failed_variables: list[str] = []
-        
         for variable in variables:
-            try:
-                variable_assets = self.asset_handler.process_variable(
-                    item=item,
-                    variable=variable,
-                    local_path=local_path,
-                    timestamp=ts_utc,
-                    bounds=bounds,
-                    crs=crs,
-                    width=width,
-                    height=height,
-                    clipper=clipper,
-                    clip_window=clip_window,
-                )
-                assets.extend(variable_assets)
-                if progress is not None:
-                    progress.increment(state=f"{variable.slug}: succeeded")
-            except Exception as e:
-                logger.error(
-                    "Variable %s failed: %s\n%s",
-                    variable.slug, e, traceback.format_exc(),
-                )
+            if variable.pk in reused:
+                assets.append(reused[variable.pk])
+                continue
+            variable_assets = next(outcomes)
+            if variable_assets is not None:
+                variable_assets = self._complete_uploads(variable, variable_assets)
+            if variable_assets is None:
                 failed_variables.append(variable.slug)
-                if progress is not None:
-                    progress.increment(state=f"{variable.slug}: failed — {e}")
+            else:
+                assets.extend(variable_assets)
+        
+        # One upsert round-trip for the whole timestamp
+        if assets:
+            self.asset_handler.materializer.save_assets(assets)
         
-        # Extent expansion happens per successful variable inside the shared
+        # Extent expansion happens per stored COG inside the shared
         # AssetMaterializer, so an all-failed run no longer widens the extent.
 
         # ── Orphan guard ──────────────────────────────────────────────────────
         if not assets:
             self.item_handler.delete_orphan(item)
+            self._timestamp_done()
             return None, [], clip_info, failed_variables
         
         if created:
             self.item_handler.increment_collection_item_count(collection)
+        self._timestamp_done()
         
         logger.info("Created Item %s with %d asset(s)", item.pk, len(assets))
         return item, assets, clip_info, failed_variables
+    
+    # =========================================================================
+    # Variables
+    # =========================================================================
+    
+    def _process_variable(self, variable, variable_kwargs: dict, progress=None) -> Optional[list[Asset]]:
+        """
+        Process one variable. Returns its assets, or None if it failed —
+        a failing variable never aborts its siblings.
+        """
+        signature = self._source_signature(variable, variable_kwargs)
+        try:
+            variable_assets = self.asset_handler.process_variable(
+                variable=variable,
+                **variable_kwargs,
+                extra_fields={"source_sig": signature} if signature else None,
+            )
+        except Exception as e:
+            logger.error(
+                "Variable %s failed: %s\n%s",
+                variable.slug, e, traceback.format_exc(),
+            )
+            if progress is not None:
+                progress.increment(state=f"{variable.slug}: failed — {e}")
+            return None
+        
+        if progress is not None:
+            progress.increment(state=f"{variable.slug}: succeeded")
+        return variable_assets
+    
+    def _reuse_unchanged(self, item: Item, variables: list, variable_kwargs: dict, progress=None) -> dict:
+        """
+        Keep the existing COG Asset of every variable whose recorded source
+        signature matches this run's. Returns the kept Assets by variable pk.
+        """
+        existing = {
+            asset.variable_id: asset
+            for asset in item.assets.filter(format=Asset.Format.COG)
+        }
+        reused = {}
+        for variable in variables:
+            asset = existing.get(variable.pk)
+            signature = self._source_signature(variable, variable_kwargs)
+            if asset is None or not signature:
+                continue
+            if (asset.extra_fields or {}).get("source_sig") != signature:
+                continue
+            reused[variable.pk] = self.asset_handler.materializer.reuse_asset(
+                asset,
+                item=item,
+                variable=variable,
+                bounds=variable_kwargs["bounds"],
+                crs=variable_kwargs["crs"],
+                timestamp=variable_kwargs["timestamp"],
+            )
+            logger.debug("Variable %s unchanged — keeping its COG", variable.slug)
+            if progress is not None:
+                progress.increment(state=f"{variable.slug}: unchanged")
+        return reused
+    
+    def _source_signature(self, variable, variable_kwargs: dict) -> str:
+        """
+        Digest of everything a variable's COG is derived from: the source
+        file and its version, the variable's configuration and the symbols
+        of the units it converts between (a Unit edit does not touch the
+        variable's ``modified``), the timestamp, the output grid, the
+        boundary clipping, and how the COG is encoded — the collection's
+        visibility decides whether it has overviews, and
+        GEORIVA_COG_DEFLATE_LEVEL its compression. "" when the source
+        version is unknown — such assets are never reused.
+        """
+        ctx = self.ctx
+        if not ctx.source_version:
+            return ""
+        boundary = ctx.clipper.boundary if ctx.clipper.is_active else None
+        parts = (
+            variable_kwargs["item"].source_file,
+            ctx.source_version,
+            variable.pk,
+            variable.modified,
+            getattr(variable.source_unit, "symbol", None),
+            getattr(variable.unit, "symbol", None),
+            variable_kwargs["timestamp"],
+            variable_kwargs["bounds"],
+            variable_kwargs["width"],
+            variable_kwargs["height"],
+            variable_kwargs["crs"],
+            getattr(boundary, "pk", None),
+            getattr(boundary, "modified", None),
+            ctx.clipper.apply_mask,
+            variable_kwargs["item"].collection.visibility,
+            settings.GEORIVA_COG_DEFLATE_LEVEL,
+        )
+        return hashlib.md5("|".join(map(str, parts)).encode()).hexdigest()
+    
+    def _complete_uploads(self, variable, variable_assets: list[Asset]) -> Optional[list[Asset]]:
+        """
+        The variable's assets once their background COG uploads are done,
+        or None if one failed — the variable then counts as failed.
+        """
+        try:
+            return self.asset_handler.materializer.complete_uploads(variable_assets)
+        except Exception as e:
+            logger.error("Variable %s upload failed: %s", variable.slug, e)
+            return None
+    
+    @staticmethod
+    def _variable_workers() -> int:
+        """GEORIVA_VARIABLE_CONCURRENCY, where 0 means one worker per CPU."""
+        return settings.GEORIVA_VARIABLE_CONCURRENCY or os.cpu_count() or 1
+    
+    def _variable_executor(self) -> ThreadPoolExecutor:
+        """
+        The handler's variable pool. Sized for every concurrent timestamp to
+        hold its full share of variable workers at once, so none queues.
+        """
+        with self._variable_pool_lock:
+            if self._variable_pool is None:
+                timestamps = max(1, settings.GEORIVA_TIMESTAMP_CONCURRENCY or os.cpu_count() or 1)
+                self._variable_pool = ThreadPoolExecutor(
+                    max_workers=self._variable_workers() * timestamps,
+                    thread_name_prefix="georiva-variable",
+                )
+            return self._variable_pool
+    
+    def _process_variables_concurrently(
+            self,
+            variables: list,
+            variable_kwargs: dict,
+            concurrency: int,
+            progress=None,
+    ) -> list[Optional[list[Asset]]]:
+        """
+        Fan variables out over a thread pool. Outcomes are returned in the
+        order of *variables*.
+
+        Variables of one timestamp are independent, and the heavy parts —
+        GDAL reads, COG encoding, uploads — release the GIL. Django opens a
+        connection per thread, so each worker closes its own on the way out.
+        The threads belong to the handler's shared pool; a semaphore keeps
+        this timestamp to *concurrency* of them.
+        """
+        slots = threading.Semaphore(concurrency)
+        
+        def run(variable):
+            try:
+                return self._process_variable(variable, variable_kwargs, progress)
+            finally:
+                connections.close_all()
+                slots.release()
+        
+        pool = self._variable_executor()
+        futures = {}
+        for i, variable in enumerate(variables):
+            slots.acquire()
+            futures[pool.submit(run, variable)] = i
+        
+        outcomes = [None] * len(variables)
+        for future in as_completed(futures):
+            outcomes[futures[future]] = future.result()
+        
+        return outcomes
@@ -2,13 +2,16 @@
 ItemHandler — get-or-create an Item record and keep its spatial fields current.
 """
 import logging
+import threading
+from collections import Counter
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
+from django.db import transaction
 from django.db.models import F
 
 from georiva.core.models import Collection, Item
-from georiva.ingestion.utils import ensure_utc, normalize_bounds
+from georiva.ingestion.utils import ensure_utc
 
 if TYPE_CHECKING:
     from georiva.ingestion.models import FileIngestion
@@ -23,8 +26,33 @@ class ItemHandler:
     One Item represents one (collection, valid_time, reference_time) tuple.
     On re-ingest the Item is updated rather than duplicated so that Asset
     records always point to the most recent spatial metadata.
+
+    Between ``defer()`` and ``flush()`` new Items are only counted here;
+    ``flush`` adds them to each Collection.item_count in one UPDATE.
     """
     
+    def __init__(self):
+        # New Items per collection pk since defer(), or None when not deferring
+        self._pending_counts: Optional[Counter] = None
+        self._lock = threading.Lock()
+    
+    def defer(self) -> None:
+        """Hold item_count increments back until ``flush``."""
+        with self._lock:
+            if self._pending_counts is None:
+                self._pending_counts = Counter()
+    
+    def flush(self, keep_deferring: bool = False) -> None:
+        """
+        Apply the increments counted since ``defer`` and stop deferring —
+        unless *keep_deferring*, which starts a fresh count instead.
+        """
+        with self._lock:
+            counts = self._pending_counts
+            self._pending_counts = Counter() if keep_deferring else None
+        for pk, count in (counts or {}).items():
+            Collection.objects.filter(pk=pk).update(item_count=F("item_count") + count)
+    
     def get_or_create(
             self,
             *,
@@ -44,53 +72,72 @@ class ItemHandler:
         If the Item already exists its spatial fields are updated when they
         differ from the incoming values — useful when re-ingesting a corrected
         or higher-resolution file.
+
+        The returned item carries a transient ``same_source_rerun`` flag: True
+        when it already existed with this source file and grid, i.e. the run
+        is a retry or re-ingest of the same file.
+
+        *bounds* must already be normalised — IngestionHandler does that once
+        per timestamp and hands the same list to the assets.
+
+        The lookup locks an existing row until its update is written, so two
+        workers re-ingesting the same timestamp from different files apply
+        their compare-and-update one after the other instead of interleaving
+        — each sees the other's source file, and ``same_source_rerun`` stays
+        honest. A concurrent create is already resolved by get_or_create,
+        which re-reads the row the winner inserted.
         """
         ts_utc = ensure_utc(timestamp)
         ref_utc = ensure_utc(reference_time) if reference_time else None
-        bounds = normalize_bounds(bounds)
-        
-        item, created = Item.objects.get_or_create(
-            collection=collection,
-            time=ts_utc,
-            reference_time=ref_utc,
-            defaults={
-                "source_file": source_file,
-                "bounds": list(bounds),
-                "width": width,
-                "height": height,
-                "resolution_x": (
-                    abs((bounds[2] - bounds[0]) / width) if width else 0
-                ),
-                "resolution_y": (
-                    abs((bounds[3] - bounds[1]) / height) if height else 0
-                ),
-                "crs": crs,
-            },
-        )
+        spatial = {
+            "bounds": list(bounds),
+            "width": width,
+            "height": height,
+            "resolution_x": abs((bounds[2] - bounds[0]) / width) if width else 0,
+            "resolution_y": abs((bounds[3] - bounds[1]) / height) if height else 0,
+            "crs": crs,
+        }
 
-        if not created:
-            logger.info(
-                "Item already exists for %s @ %s — updating assets", collection, ts_utc
+        with transaction.atomic():
+            # Through the reverse manager, a fetched Item shares *collection*
+            # (already carrying catalog and organisation) instead of lazily
+            # re-querying that chain for every asset path it builds.
+            item, created = collection.items.select_for_update().get_or_create(
+                time=ts_utc,
+                reference_time=ref_utc,
+                defaults={"source_file": source_file, **spatial},
             )
-            update_fields = []
 
-            if item.source_file != source_file:
-                item.source_file = source_file
-                update_fields.append("source_file")
+            if not created:
+                logger.info(
+                    "Item already exists for %s @ %s — updating assets", collection, ts_utc
+                )
+                update_fields = []
+
+                if item.source_file != source_file:
+                    item.source_file = source_file
+                    update_fields.append("source_file")
+
+                if list(item.bounds) != list(bounds):
+                    for field, value in spatial.items():
+                        setattr(item, field, value)
+                    update_fields.extend(spatial)
 
-            if list(item.bounds) != list(bounds):
-                item.bounds = list(bounds)
-                item.width = width
-                item.height = height
-                update_fields.extend(["bounds", "width", "height"])
+                if update_fields:
+                    item.save(update_fields=update_fields)
 
-            if update_fields:
-                item.save(update_fields=update_fields)
+                item.same_source_rerun = not update_fields
+            else:
+                item.same_source_rerun = False
 
         return item, created
     
     def increment_collection_item_count(self, collection: Collection) -> None:
         """Atomically increment Collection.item_count after a new Item is created."""
+        with self._lock:
+            if self._pending_counts is not None:
+                self._pending_counts[collection.pk] += 1
+                return
         Collection.objects.filter(pk=collection.pk).update(
             item_count=F("item_count") + 1
         )
@@ -3,15 +3,21 @@ SourceFileManager — all raw-file I/O for a single ingestion run.
 
 Owns:
   - Streaming download from origin bucket to a local temp directory
-  - Archiving the raw file to georiva-archive
+  - Archiving the raw file to georiva-archive, in the background while the
+    file is processed
   - The archive-then-delete decision once processing is complete
 """
 import logging
+import os
+import shutil
 import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
 from pathlib import Path
 from typing import TYPE_CHECKING, Optional
 
+from django.conf import settings
+
 from georiva.core.storage import storage
 
 if TYPE_CHECKING:
@@ -36,20 +42,44 @@ class SourceFileManager:
         Stream a file from *origin* to a local temporary directory.
 
         Yields the local Path and cleans up automatically on exit.
-        Streams in 8 MB chunks to keep memory flat regardless of file
-        size — important for large files.
+        The file never sits in memory whole (see ``Bucket.download``) —
+        important for multi-GB GRIB/NetCDF files; on S3 the parts are
+        fetched concurrently.
+
+        Small files go to memory-backed storage instead (see
+        ``_temp_root``).
         """
         original_name = Path(file_path).name
         
-        with tempfile.TemporaryDirectory() as tmp_dir:
+        with tempfile.TemporaryDirectory(dir=self._temp_root(origin, file_path)) as tmp_dir:
             tmp_path = Path(tmp_dir) / original_name
-            
-            with origin.open(file_path, "rb") as src, open(tmp_path, "wb") as dst:
-                while chunk := src.read(8 * 1024 * 1024):  # 8 MB chunks
-                    dst.write(chunk)
+            origin.download(file_path, tmp_path)
             
             yield tmp_path
     
+    @staticmethod
+    def _temp_root(origin: "Bucket", file_path: str) -> Optional[str]:
+        """
+        GEORIVA_RAM_TEMP_DIR when the file is at most
+        GEORIVA_RAM_TEMP_MAX_BYTES and half its free space, else None
+        (the OS temp dir). The plugin reads the file straight back after the
+        download, so a tmpfs spares a disk write and a cold re-read.
+        """
+        max_bytes = settings.GEORIVA_RAM_TEMP_MAX_BYTES
+        ram_dir = settings.GEORIVA_RAM_TEMP_DIR
+        if not max_bytes or not ram_dir or not os.path.isdir(ram_dir):
+            return None
+        
+        try:
+            size = origin.size(file_path)
+            free = shutil.disk_usage(ram_dir).free
+        except Exception as e:
+            logger.debug("RAM temp dir skipped for %s: %s", file_path, e)
+            return None
+        
+        # Leave headroom — tmpfs pages are worker memory too
+        return ram_dir if size <= min(max_bytes, free // 2) else None
+    
     # =========================================================================
     # Archive
     # =========================================================================
@@ -75,6 +105,36 @@ class SourceFileManager:
             )
             return None
     
+    def start_archive(self, origin: "Bucket", file_path: str, catalog) -> Optional[Future]:
+        """
+        Start archiving the raw file on a background thread when
+        catalog.archive_source_files is set, else return None.
+
+        The copy is network-bound and otherwise runs after processing has
+        finished; started up front it overlaps the download and the
+        CPU-bound processing instead. Pass the returned future to
+        ``cleanup``, which waits for it.
+        """
+        if not catalog.archive_source_files:
+            return None
+        
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="georiva-archive")
+        try:
+            return pool.submit(self.archive, origin, file_path)
+        finally:
+            # The submitted copy still runs; the thread exits once it is done
+            pool.shutdown(wait=False)
+    
+    @staticmethod
+    def discard_archive(archive_path: Optional[str]) -> None:
+        """Remove an early archive copy of a file that stays in origin."""
+        if not archive_path:
+            return
+        try:
+            storage.archive.delete(archive_path)
+        except Exception as e:
+            logger.warning("Could not discard archive copy %s — %s", archive_path, e)
+    
     # =========================================================================
     # Cleanup
     # =========================================================================
@@ -85,10 +145,15 @@ class SourceFileManager:
             file_path: str,
             catalog,
             result: "IngestionResult",
+            archive: Optional[Future] = None,
     ) -> None:
         """
         Archive and/or delete the source file based on the ingestion outcome.
 
+        *archive* is the future from ``start_archive``, if the copy was
+        started early; a file that stays in origin has that copy discarded,
+        so the archive only ever holds ingested files.
+
         Rules:
           Full success (no partial failures)
             → archive if catalog.archive_source_files
@@ -105,12 +170,18 @@ class SourceFileManager:
         )
         
         if result.success and not has_partial_failures:
-            if catalog.archive_source_files:
+            if archive is not None:
+                result.archive_path = archive.result() or ""
+            elif catalog.archive_source_files:
                 archived = self.archive(origin, file_path)
                 result.archive_path = archived or ""
             origin.delete(file_path)
+            return
+        
+        if archive is not None:
+            self.discard_archive(archive.result())
         
-        elif result.success and has_partial_failures:
+        if result.success and has_partial_failures:
             logger.warning(
                 "Partial variable failures — keeping source file "
                 "for re-processing: %s",
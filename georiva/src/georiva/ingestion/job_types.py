@@ -35,7 +35,8 @@ class FileIngestionJobType(JobType):
 
         progress.increment(5, state="Acquiring processing lock…")
 
-        if not FileIngestion.acquire(job.bucket, job.file_path, worker_id):
+        file_ingestion_id = FileIngestion.claim(job.bucket, job.file_path, worker_id)
+        if file_ingestion_id is None:
             progress.increment(95, state="Skipped — already being processed")
             logger.info(
                 "FileIngestionJob %d: skipping %s/%s — lock not acquired",
@@ -43,13 +44,8 @@ class FileIngestionJobType(JobType):
             )
             return
 
-        fi = None
-        try:
-            fi = FileIngestion.objects.get(bucket=job.bucket, file_path=job.file_path)
-            job.file_ingestion = fi
-            job.save(update_fields=["file_ingestion"])
-        except FileIngestion.DoesNotExist:
-            pass
+        job.file_ingestion_id = file_ingestion_id
+        job.save(update_fields=["file_ingestion"])
 
         progress.increment(10, state="Lock acquired — starting ingestion")
 
@@ -103,7 +99,7 @@ class FileIngestionJobType(JobType):
             "FileIngestionJob %d failed for %s/%s: %s",
             job.id, job.bucket, job.file_path, exc,
         )
-        FileIngestion.objects.filter(
+        released = FileIngestion.objects.filter(
             bucket=job.bucket,
             file_path=job.file_path,
             status=FileIngestion.Status.PROCESSING,
@@ -114,6 +110,8 @@ class FileIngestionJobType(JobType):
             locked_by="",
             error=str(exc)[:2000],
         )
+        if released:
+            FileIngestion.schedule_retry(job.bucket, job.file_path)
 
     def on_cancelled(self, job: FileIngestionJob) -> None:
         if job.file_ingestion_id:
@@ -3,7 +3,7 @@ AssetMaterializer — the shared "array in, served assets out" step.
 
 Both pipelines that publish raster assets end at the same materialization
 sequence: normalize bounds → apply the catalog boundary mask → write COG +
-JSON sidecar → upsert Asset rows → expand the owning Collection's extent.
+JSON metadata → upsert Asset rows → expand the owning Collection's extent.
 Ingestion (``handlers/asset_handler.py``) and the derivation engine
 (``processing/engine.py``) both call this class, so derived items can no
 longer drift from ingested ones — the drift is what left derived collections
@@ -19,17 +19,30 @@ recipes compute arrays. This service only owns what happens after an array,
 its bounds, and its Variable exist.
 """
 import logging
+import threading
+from concurrent.futures import Future
 from datetime import datetime
-from typing import TYPE_CHECKING, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
 
 import numpy as np
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models.signals import post_save
 from wagtail import hooks
 
-from georiva.core.models import Asset, Item
+from georiva.core.models import Asset, Collection, Item
 from georiva.core.storage import storage
 from georiva.ingestion.asset_writer import AssetWriter
 from georiva.ingestion.constants import GEORIVA_AFTER_SAVE_ASSET
-from georiva.ingestion.utils import compute_stats, normalize_bounds
+from georiva.ingestion.utils import (
+    QUANTIZED_NODATA,
+    RunningStats,
+    compute_stats,
+    normalize_bounds,
+    quantization,
+    quantize,
+)
 
 if TYPE_CHECKING:
     from georiva.core.models import Variable
@@ -37,24 +50,60 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Columns an Asset upsert refreshes — everything the COG write determines.
+# ``checksum`` joins them only when the caller supplied one.
+ASSET_UPSERT_FIELDS = [
+    "href", "media_type", "roles", "file_size", "width", "height", "bands",
+    "stats_min", "stats_max", "stats_mean", "stats_std", "extra_fields",
+    "modified",
+]
+
+
+@lru_cache(maxsize=256)
+def _asset_name_suffix(timestamp: datetime, reference_time: Optional[datetime]) -> str:
+    """
+    The ``_HHMMSS[__refYYYYmmddTHHMMSS]`` tail of an asset file name.
+
+    It depends only on the timestamp, so it is formatted once and shared by
+    every variable of that timestamp.
+    """
+    suffix = f"_{timestamp.strftime('%H%M%S')}"
+    if reference_time:
+        suffix += f"__ref{reference_time.strftime('%Y%m%dT%H%M%S')}"
+    return suffix
+
 
 class AssetMaterializer:
     """
     Persist one variable's raster array as the served asset pair
     (COG + JSON sidecar) and keep the catalog metadata honest.
 
+    Rows saved in one batch (``defer_save`` + ``save_assets``) share one
+    per-item metadata file instead of a sidecar per variable — one upload
+    per timestamp rather than one per variable — unless the catalog sets
+    ``emit_per_variable_metadata``.
+
     COG failure raises (the item is unservable without it); JSON failure is
     non-fatal and logged, matching ingestion's long-standing partial-failure
     contract.
     """
 
-    def __init__(self, writer: AssetWriter):
+    def __init__(self, writer: AssetWriter, background_uploads: bool = False):
         # Late import: handlers/__init__ imports asset_handler, which imports
         # this module — importing the subpackage at module level would cycle.
         from georiva.ingestion.handlers.extent_handler import CollectionExtentHandler
 
         self.writer = writer
         self.extent_handler = CollectionExtentHandler()
+        self.background_uploads = background_uploads
+        # COG uploads still in flight behind deferred Asset rows, by
+        # (item pk, variable pk), each with what follows once it is stored
+        # (sidecar, extent) — resolved by complete_uploads.
+        self._pending_uploads: dict[tuple, tuple[Future, Callable[[], None]]] = {}
+        # Per-variable metadata of deferred rows, by item pk — written as
+        # one item file by save_assets. Variables may run concurrently.
+        self._pending_metadata: dict[int, dict] = {}
+        self._metadata_lock = threading.Lock()
 
     # =========================================================================
     # Public entry points
@@ -99,28 +148,215 @@ class AssetMaterializer:
             clipper: Optional["BoundaryClipper"] = None,
             stats: Optional[dict] = None,
             checksum: str = "",
+            owns_data: bool = False,
+            defer_save: bool = False,
+            extra_fields: Optional[dict] = None,
     ) -> list[Asset]:
         """
         Run the shared materialization sequence for one variable's array.
 
         ``clipper`` applies the precise boundary geometry mask — window
         cropping is the caller's job (``clip_array`` for full-grid arrays).
+        ``owns_data`` marks *data* as a buffer the caller allocated and will
+        not reuse, so the mask is written into it rather than into a copy;
+        leave it False for views (``clip_array`` returns one).
+        ``defer_save`` returns the Asset rows unsaved, for the caller to
+        upsert a whole timestamp's worth at once with ``save_assets``.
+        ``extra_fields`` are merged into the COG Asset's extra fields.
         """
         bounds = normalize_bounds(bounds)
 
         if clipper is not None and clipper.is_active:
-            data = clipper.apply_geometry_mask(data, bounds, nodata=np.nan)
+            data = clipper.apply_geometry_mask(
+                data, bounds, nodata=np.nan, copy=not owns_data,
+            )
 
         if stats is None:
-            stats = compute_stats(data)
+            stats = compute_stats(data, max_pixels=settings.GEORIVA_STATS_MAX_PIXELS)
 
-        assets = self._save_assets(
+        return self._save_assets(
             item=item, variable=variable, data=data,
             stats=stats, bounds=bounds, crs=crs, timestamp=timestamp,
-            checksum=checksum,
+            checksum=checksum, defer_save=defer_save, extra_fields=extra_fields,
         )
 
+    def reuse_asset(
+            self,
+            asset: Asset,
+            *,
+            item: Item,
+            variable: "Variable",
+            bounds: list | tuple,
+            crs: str,
+            timestamp: datetime,
+    ) -> Asset:
+        """
+        Keep *asset*, an existing COG Asset whose inputs are unchanged, in
+        place of a freshly materialized one.
+
+        Nothing is read or written: its metadata is rebuilt from the row
+        and deferred like a new variable's, and the row is marked ``reused``
+        so ``save_assets`` leaves it untouched apart from the item's
+        metadata file.
+        """
+        bounds = normalize_bounds(bounds)
+        asset.item = item
+        asset.variable = variable
+        asset.reused = True
+
+        stats = {
+            "min": asset.stats_min,
+            "max": asset.stats_max,
+            "mean": asset.stats_mean,
+            "std": asset.stats_std,
+        }
+        if not self._writes_sidecar(item, defer_save=True):
+            self._defer_metadata(item, variable, timestamp, self._sidecar_metadata(
+                item, variable, timestamp, bounds, asset.width, asset.height, crs, stats,
+            ))
+
         self.extent_handler.expand(item.collection, timestamp, bounds)
+        return asset
+
+    def materialize_blocks(
+            self,
+            *,
+            item: Item,
+            variable: "Variable",
+            blocks: Iterable[tuple[tuple[int, int, int, int], np.ndarray]],
+            width: int,
+            height: int,
+            bounds: list | tuple,
+            crs: str,
+            timestamp: datetime,
+            clipper: Optional["BoundaryClipper"] = None,
+            defer_save: bool = False,
+            extra_fields: Optional[dict] = None,
+    ) -> list[Asset]:
+        """
+        Streaming variant of ``materialize_variable`` for grids too large to
+        hold as one array.
+
+        *blocks* yields ``((x, y, w, h), array)`` tiles covering the
+        width × height grid. Each tile is masked, folded into the stats and
+        written into the COG as it arrives, so only one tile is ever resident.
+        The metadata is written (or, deferred, collected) after the COG,
+        once the stats are complete.
+        """
+        bounds = normalize_bounds(bounds)
+        running = RunningStats()
+        encoding = self._encoding(variable)
+
+        def prepared_blocks():
+            for window, block in blocks:
+                if clipper is not None and clipper.is_active:
+                    block = clipper.apply_geometry_mask_block(
+                        block, bounds, width, height, window, nodata=np.nan,
+                    )
+                running.update(block)
+                if encoding:
+                    block = quantize(block, encoding["scale"], encoding["offset"])
+                yield window, block
+
+        base_path = self._asset_base_path(item, variable, timestamp)
+        try:
+            stored_cog = self.writer.write_cog_blocks(
+                prepared_blocks(), f"{base_path}.tif", tuple(bounds),
+                width=width, height=height, crs=crs,
+                overviews=self._builds_overviews(item),
+                dtype=np.int16 if encoding else np.float32,
+                **(encoding or {}),
+            )
+            stats = running.result()
+            data_asset = self._record_cog(
+                item, variable, stored_cog, width, height, stats,
+                defer_save=defer_save, encoding=encoding,
+                extra_fields=extra_fields,
+            )
+        except Exception as e:
+            logger.error("COG save failed for %s: %s", variable.slug, e)
+            raise
+
+        metadata = self._sidecar_metadata(
+            item, variable, timestamp, bounds, width, height, crs, stats,
+        )
+        if self._writes_sidecar(item, defer_save):
+            self._write_metadata(variable.slug, metadata, f"{base_path}.json")
+        else:
+            self._defer_metadata(item, variable, timestamp, metadata)
+
+        self.extent_handler.expand(item.collection, timestamp, bounds)
+        return [data_asset]
+
+    def complete_uploads(self, assets: list[Asset]) -> list[Asset]:
+        """
+        Wait for the background COG uploads behind deferred Asset rows
+        (see ``_save_assets``), stamp each row with its stored path and
+        size, then write its sidecar and widen the collection extent.
+        Re-raises a failed upload's error.
+        """
+        for asset in assets:
+            pending = self._pending_uploads.pop((asset.item_id, asset.variable_id), None)
+            if pending is None:
+                continue
+            upload, stored = pending
+            asset.href = upload.result()
+            asset.file_size = self._get_file_size(asset.href)
+            stored()
+        return assets
+
+    def save_assets(self, assets: list[Asset]) -> list[Asset]:
+        """
+        Upsert Asset rows returned by ``materialize_variable(defer_save=True)``,
+        once their COG uploads are complete.
+
+        One INSERT … ON CONFLICT (item, variable, format) per batch instead of
+        an update_or_create round-trip pair per row; the instances get their
+        primary keys in place. bulk_create skips model signals, so post_save
+        is sent for each row afterwards to keep receivers (virtual-zarr
+        manifest staleness) firing — ``created`` is True for the rows that
+        were not stored before the batch. Falls back to per-row update_or_create
+        if the bulk statement fails. Then writes each item's metadata file,
+        covering the variables whose rows were saved.
+
+        Rows kept by ``reuse_asset`` are already stored as they are — they
+        only go into the metadata file.
+        """
+        fresh = [asset for asset in assets if not getattr(asset, "reused", False)]
+        self.complete_uploads(fresh)
+
+        # Rows with and without a checksum refresh different columns — never
+        # clobber a stored checksum with "".
+        batches = {}
+        for asset in fresh:
+            batches.setdefault(bool(asset.checksum), []).append(asset)
+
+        for has_checksum, batch in batches.items():
+            update_fields = ASSET_UPSERT_FIELDS + (["checksum"] if has_checksum else [])
+            try:
+                with transaction.atomic():
+                    stored = self._stored_keys(batch)
+                    Asset.objects.bulk_create(
+                        batch,
+                        update_conflicts=True,
+                        unique_fields=["item", "variable", "format"],
+                        update_fields=update_fields,
+                    )
+            except DatabaseError as e:
+                logger.warning("Bulk asset upsert failed (%s) — saving rows one by one", e)
+                for asset in batch:
+                    self._upsert_one(asset, update_fields)
+                continue
+            for asset in batch:
+                created = (asset.item_id, asset.variable_id, asset.format) not in stored
+                post_save.send(
+                    sender=Asset, instance=asset, created=created,
+                    update_fields=None, raw=False, using=asset._state.db,
+                )
+
+        for asset in fresh:
+            self._after_save_asset(asset)
+        self._write_item_metadata(assets)
         return assets
 
     # =========================================================================
@@ -138,18 +374,110 @@ class AssetMaterializer:
             crs: str,
             timestamp: datetime,
             checksum: str = "",
+            defer_save: bool = False,
+            extra_fields: Optional[dict] = None,
     ) -> list[Asset]:
         """
-        Write the COG / JSON pair to storage and upsert Asset rows.
+        Write the COG / JSON pair to storage and upsert Asset rows
+        (or, with *defer_save*, return them unsaved — the JSON then waits
+        for the item's metadata file, see ``save_assets``).
+
+        With *defer_save* and ``background_uploads`` the COG is only encoded
+        here: its upload runs on the writer's upload pool while the caller
+        extracts and encodes the next variable, and ``save_assets`` waits
+        for it. The sidecar and the collection extent follow the COG only
+        once it is stored.
         """
         height, width = data.shape[:2]
-        catalog = item.collection.catalog
+        base_path = self._asset_base_path(item, variable, timestamp)
+        metadata = self._sidecar_metadata(
+            item, variable, timestamp, bounds, width, height, crs, stats,
+        )
+        # Stats above were taken from the float values; only the stored COG
+        # is quantized.
+        encoding = self._encoding(variable)
+        if encoding:
+            data = quantize(data, encoding["scale"], encoding["offset"])
 
-        if item.reference_time:
-            ref_str = item.reference_time.strftime("%Y%m%dT%H%M%S")
-            base_name = f"{variable.slug}_{timestamp.strftime('%H%M%S')}__ref{ref_str}"
-        else:
-            base_name = f"{variable.slug}_{timestamp.strftime('%H%M%S')}"
+        writes_sidecar = self._writes_sidecar(item, defer_save)
+
+        def stored():
+            # Only once the COG is stored — a failed COG leaves no orphan
+            # .json and does not widen the extent.
+            if writes_sidecar:
+                self._write_metadata(variable.slug, metadata, f"{base_path}.json")
+            self.extent_handler.expand(item.collection, timestamp, bounds)
+
+        # ── COG ───────────────────────────────────────────────────────────────
+        upload = None
+        try:
+            if defer_save and self.background_uploads:
+                upload = self.writer.submit_cog(
+                    data, f"{base_path}.tif", tuple(bounds), crs,
+                    overviews=self._builds_overviews(item),
+                    **(encoding or {}),
+                )
+                self._pending_uploads[(item.pk, variable.pk)] = (upload, stored)
+                data_asset = self._record_cog(
+                    item, variable, f"{base_path}.tif", width, height, stats,
+                    checksum=checksum, defer_save=True, uploading=True,
+                    encoding=encoding, extra_fields=extra_fields,
+                )
+            else:
+                stored_cog = self.writer.write_cog(
+                    data, f"{base_path}.tif", tuple(bounds), crs,
+                    overviews=self._builds_overviews(item),
+                    **(encoding or {}),
+                )
+                data_asset = self._record_cog(
+                    item, variable, stored_cog, width, height, stats,
+                    checksum=checksum, defer_save=defer_save,
+                    encoding=encoding, extra_fields=extra_fields,
+                )
+        except Exception as e:
+            logger.error("COG save failed for %s: %s", variable.slug, e)
+            if upload is not None:
+                self._pending_uploads.pop((item.pk, variable.pk), None)
+                self._discard_upload(upload)
+            raise
+
+        # ── JSON metadata ─────────────────────────────────────────────────
+        if not writes_sidecar:
+            self._defer_metadata(item, variable, timestamp, metadata)
+        if upload is None:
+            stored()
+
+        return [data_asset]
+
+    @staticmethod
+    def _builds_overviews(item: Item) -> bool:
+        """
+        Overviews only serve zoomed-out tile reads. An internal collection is
+        a derivation intermediate that is never served — the engine reads its
+        COGs at full resolution — so building them is wasted encode time.
+        """
+        return item.collection.visibility != Collection.Visibility.INTERNAL
+
+    @staticmethod
+    def _encoding(variable: "Variable") -> Optional[dict]:
+        """
+        The int16 encoding of a ``quantize`` variable's COG — nodata, scale
+        and offset over its value range — or None to store float32.
+        """
+        if not getattr(variable, "quantize", False):
+            return None
+        scale, offset = quantization(variable.value_min, variable.value_max)
+        return {"nodata": QUANTIZED_NODATA, "scale": scale, "offset": offset}
+
+    @staticmethod
+    def _writes_sidecar(item: Item, defer_save: bool) -> bool:
+        """Whether this variable gets its own ``.json`` next to the COG."""
+        return not defer_save or item.collection.catalog.emit_per_variable_metadata
+
+    def _asset_base_path(self, item: Item, variable: "Variable", timestamp: datetime) -> str:
+        """Storage path of the asset pair, without the .tif / .json suffix."""
+        catalog = item.collection.catalog
+        base_name = variable.slug + _asset_name_suffix(timestamp, item.reference_time)
 
         base_dir = storage.build_asset_path(
             org=catalog.organisation.slug,
@@ -160,74 +488,208 @@ class AssetMaterializer:
             filename="",
         ).rstrip("/")
 
-        assets: list[Asset] = []
+        return f"{base_dir}/{base_name}"
 
-        # ── COG ───────────────────────────────────────────────────────────────
-        cog_path = f"{base_dir}/{base_name}.tif"
-        try:
-            stored_cog = self.writer.write_cog(data, cog_path, tuple(bounds), crs)
-            cog_defaults = {
-                "href": stored_cog,
-                "media_type": (
-                    "image/tiff; application=geotiff; profile=cloud-optimized"
-                ),
-                "roles": ["data"],
-                "file_size": self._get_file_size(stored_cog),
-                "width": width,
-                "height": height,
-                "bands": 1,
-                "stats_min": stats.get("min"),
-                "stats_max": stats.get("max"),
-                "stats_mean": stats.get("mean"),
-                "stats_std": stats.get("std"),
-                "extra_fields": {
-                    "compression": "deflate",
-                    "nodata": None,
-                },
-            }
-            # Only stamp a checksum the caller actually supplied (derived
-            # provenance) — never clobber an existing one with "".
-            if checksum:
-                cog_defaults["checksum"] = checksum
-            data_asset, _ = Asset.objects.update_or_create(
+    def _sidecar_metadata(
+            self,
+            item: Item,
+            variable: "Variable",
+            timestamp: datetime,
+            bounds: list,
+            width: int,
+            height: int,
+            crs: str,
+            stats: dict,
+    ) -> dict:
+        return {
+            "variable": variable.slug,
+            "name": variable.name,
+            "units": variable.unit.symbol if variable.unit else "",
+            "timestamp": timestamp.isoformat(),
+            "reference_time": (
+                item.reference_time.isoformat() if item.reference_time else None
+            ),
+            "bounds": list(bounds),
+            "width": width,
+            "height": height,
+            "crs": crs,
+            "transform": variable.transform_type,
+            "stats": stats,
+        }
+
+    def _record_cog(
+            self,
+            item: Item,
+            variable: "Variable",
+            stored_cog: str,
+            width: int,
+            height: int,
+            stats: dict,
+            *,
+            checksum: str = "",
+            defer_save: bool = False,
+            uploading: bool = False,
+            encoding: Optional[dict] = None,
+            extra_fields: Optional[dict] = None,
+    ) -> Asset:
+        """
+        Upsert (or, with *defer_save*, build) the COG Asset row.
+
+        *uploading* marks a COG still on its way to storage: the size is
+        left for ``complete_uploads`` to stamp. A quantized COG's
+        *encoding* (see ``_encoding``) is recorded in its extra fields,
+        alongside the caller's *extra_fields*.
+        """
+        cog_defaults = {
+            "href": stored_cog,
+            "media_type": (
+                "image/tiff; application=geotiff; profile=cloud-optimized"
+            ),
+            "roles": ["data"],
+            "file_size": None if uploading else self._get_file_size(stored_cog),
+            "width": width,
+            "height": height,
+            "bands": 1,
+            "stats_min": stats.get("min"),
+            "stats_max": stats.get("max"),
+            "stats_mean": stats.get("mean"),
+            "stats_std": stats.get("std"),
+            "extra_fields": {
+                "compression": "deflate",
+                "nodata": None,
+                **(encoding or {}),
+                **(extra_fields or {}),
+            },
+        }
+        # Only stamp a checksum the caller actually supplied (derived
+        # provenance) — never clobber an existing one with "".
+        if checksum:
+            cog_defaults["checksum"] = checksum
+        if defer_save:
+            return Asset(
                 item=item,
                 variable=variable,
                 format=Asset.Format.COG,
-                defaults=cog_defaults,
+                **cog_defaults,
             )
-            assets.append(data_asset)
-            self._after_save_asset(data_asset)
-        except Exception as e:
-            logger.error("COG save failed for %s: %s", variable.slug, e)
-            raise
+        data_asset, _ = Asset.objects.update_or_create(
+            item=item,
+            variable=variable,
+            format=Asset.Format.COG,
+            defaults=cog_defaults,
+        )
+        self._after_save_asset(data_asset)
+        return data_asset
 
-        # ── JSON sidecar ──────────────────────────────────────────────────────
-        meta_path = f"{base_dir}/{base_name}.json"
+    # =========================================================================
+    # Helpers
+    # =========================================================================
+
+    def _discard_upload(self, upload: Future) -> None:
+        """
+        Delete the object a background upload stores, once it lands — its
+        Asset row was never recorded.
+        """
+        def delete(future):
+            if future.cancelled() or future.exception() is not None:
+                return
+            try:
+                self.writer.bucket.delete(future.result())
+            except Exception as e:
+                logger.warning("Could not delete orphan COG %s: %s", future.result(), e)
+
+        upload.add_done_callback(delete)
+
+    def _write_metadata(self, name: str, metadata: dict, path: str) -> None:
+        """Write a JSON metadata file; failure is logged, never raised."""
         try:
-            metadata = {
-                "variable": variable.slug,
-                "name": variable.name,
-                "units": variable.unit.symbol if variable.unit else "",
-                "timestamp": timestamp.isoformat(),
-                "reference_time": (
-                    item.reference_time.isoformat() if item.reference_time else None
-                ),
-                "bounds": list(bounds),
-                "width": width,
-                "height": height,
-                "crs": crs,
-                "transform": variable.transform_type,
-                "stats": stats,
-            }
-            self.writer.write_metadata(metadata, meta_path)
+            self.writer.write_metadata(metadata, path)
         except Exception as e:
-            logger.warning("Metadata save failed for %s: %s", variable.slug, e)
+            logger.warning("Metadata save failed for %s: %s", name, e)
 
-        return assets
+    def _defer_metadata(
+            self,
+            item: Item,
+            variable: "Variable",
+            timestamp: datetime,
+            metadata: dict,
+    ) -> None:
+        """Hold a variable's metadata for its item's file."""
+        with self._metadata_lock:
+            pending = self._pending_metadata.setdefault(
+                item.pk, {"timestamp": timestamp, "variables": {}},
+            )
+            pending["variables"][variable.slug] = metadata
 
-    # =========================================================================
-    # Helpers
-    # =========================================================================
+    def _write_item_metadata(self, assets: list[Asset]) -> None:
+        """
+        Write one metadata file per item among *assets*, holding the
+        deferred metadata of the variables saved — a variable whose upload
+        failed has no row and is left out.
+        """
+        saved = {}
+        for asset in assets:
+            saved.setdefault(asset.item_id, (asset.item, set()))[1].add(asset.variable.slug)
+
+        for item_pk, (item, slugs) in saved.items():
+            with self._metadata_lock:
+                pending = self._pending_metadata.pop(item_pk, None)
+            if pending is None:
+                continue
+            variables = {
+                slug: metadata
+                for slug, metadata in pending["variables"].items() if slug in slugs
+            }
+            if not variables:
+                continue
+
+            timestamp = pending["timestamp"]
+            collection = item.collection
+            catalog = collection.catalog
+            path = storage.build_item_path(
+                org=catalog.organisation.slug,
+                catalog=catalog.slug,
+                collection=collection.slug,
+                timestamp=timestamp,
+                filename="item" + _asset_name_suffix(timestamp, item.reference_time) + ".json",
+            )
+            self._write_metadata(
+                f"item {item_pk}",
+                {
+                    "item": item_pk,
+                    "collection": collection.slug,
+                    "timestamp": timestamp.isoformat(),
+                    "reference_time": (
+                        item.reference_time.isoformat() if item.reference_time else None
+                    ),
+                    "variables": variables,
+                },
+                path,
+            )
+
+    @staticmethod
+    def _stored_keys(batch: list[Asset]) -> set[tuple]:
+        """(item, variable, format) of the rows in *batch* already stored."""
+        return set(Asset.objects.filter(
+            item_id__in={asset.item_id for asset in batch},
+            variable_id__in={asset.variable_id for asset in batch},
+            format__in={asset.format for asset in batch},
+        ).values_list("item_id", "variable_id", "format"))
+
+    def _upsert_one(self, asset: Asset, update_fields: list[str]) -> None:
+        """update_or_create fallback for one pending row; adopts its pk."""
+        saved, _ = Asset.objects.update_or_create(
+            item=asset.item,
+            variable=asset.variable,
+            format=asset.format,
+            defaults={
+                name: getattr(asset, name)
+                for name in update_fields if name != "modified"
+            },
+        )
+        asset.pk = saved.pk
+        asset._state.adding = False
+        asset._state.db = saved._state.db
 
     def _after_save_asset(self, asset: Asset) -> None:
         try:
@@ -237,7 +699,12 @@ class AssetMaterializer:
             logger.warning("Post-save hook failed for asset %s: %s", asset.pk, e)
 
     def _get_file_size(self, path: str) -> Optional[int]:
+        # The writer knows the size of what it just uploaded; only fall back
+        # to asking storage (a HEAD round-trip on S3) when it doesn't.
         try:
-            return int(self.writer.bucket.size(path))
+            size = self.writer.stored_size(path)
+            if size is None:
+                size = self.writer.bucket.size(path)
+            return int(size)
         except Exception:
             return None
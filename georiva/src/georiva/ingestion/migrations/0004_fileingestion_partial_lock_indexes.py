@@ -0,0 +1,21 @@
+# Generated by Django 6.0.6 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('georivaingestion', '0003_loaderjob_resume_of_run'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fileingestion',
+            index=models.Index(condition=models.Q(('retry_count__lt', 3), ('status__in', ['pending', 'failed'])), fields=['bucket', 'file_path'], name='idx_retryable_files'),
+        ),
+        migrations.AddIndex(
+            model_name='fileingestion',
+            index=models.Index(condition=models.Q(('status', 'processing')), fields=['locked_at'], name='idx_stale_locks'),
+        ),
+    ]
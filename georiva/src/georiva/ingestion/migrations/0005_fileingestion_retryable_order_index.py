@@ -0,0 +1,17 @@
+# Generated by Django 6.0.6 on 2026-10-16 14:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('georivaingestion', '0004_fileingestion_partial_lock_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fileingestion',
+            index=models.Index(condition=models.Q(('retry_count__lt', 3), ('status', 'failed')), fields=['created_at'], name='idx_retryable_by_created'),
+        ),
+    ]
@@ -19,7 +19,8 @@ Max retries exceeded:
 import os
 from datetime import timedelta
 
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models.functions import Substr
 
 from georiva.organisations.lookups import NOT_ORM_SCOPABLE
 from django.utils import timezone as dj_timezone
@@ -146,6 +147,26 @@ class FileIngestion(models.Model):
                 fields=['bucket', 'status'],
                 name='idx_ingestion_bucket_status',
             ),
+            # Partial indexes over the rows the lock paths actually touch —
+            # completed files, the bulk of the table, are left out. The
+            # literal 3 mirrors MAX_RETRIES (not reachable from Meta).
+            models.Index(
+                fields=['bucket', 'file_path'],
+                condition=models.Q(status__in=['pending', 'failed'], retry_count__lt=3),
+                name='idx_retryable_files',
+            ),
+            # get_retryable's ORDER BY created_at LIMIT, read in order off
+            # the failed-and-retryable rows alone.
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(status='failed', retry_count__lt=3),
+                name='idx_retryable_by_created',
+            ),
+            models.Index(
+                fields=['locked_at'],
+                condition=models.Q(status='processing'),
+                name='idx_stale_locks',
+            ),
         ]
         ordering = ['-created_at']
     
@@ -200,6 +221,49 @@ class FileIngestion(models.Model):
             defaults=defaults,
         )
     
+    @classmethod
+    def register_many(cls, files: list[dict]) -> dict[tuple[str, str], tuple['FileIngestion', bool]]:
+        """
+        ``register`` for a batch of files, in three queries whatever its size:
+        look up the registered ones, insert the rest (ON CONFLICT DO NOTHING),
+        read the inserted rows back.
+
+        *files* are dicts of ``bucket``, ``file_path`` and any further field
+        defaults. Returns (log, created) by (bucket, file_path). A row a
+        concurrent writer inserted first is reported as created — at worst
+        the file is dispatched twice, and the processing lock admits one.
+        """
+        by_key = {(f["bucket"], f["file_path"]): f for f in files}
+        if not by_key:
+            return {}
+        
+        def fetch(keys):
+            logs = cls.objects.filter(
+                bucket__in={bucket for bucket, _ in keys},
+                file_path__in={file_path for _, file_path in keys},
+            )
+            keys = set(keys)
+            return {
+                (log.bucket, log.file_path): log
+                for log in logs if (log.bucket, log.file_path) in keys
+            }
+        
+        existing = fetch(by_key)
+        missing = [key for key in by_key if key not in existing]
+        if missing:
+            cls.objects.bulk_create(
+                [cls(**{'status': cls.Status.PENDING, **by_key[key]}) for key in missing],
+                ignore_conflicts=True,
+                batch_size=500,
+            )
+            created = fetch(missing)
+        else:
+            created = {}
+        
+        registered = {key: (log, False) for key, log in existing.items()}
+        registered.update({key: (log, True) for key, log in created.items()})
+        return registered
+    
     @classmethod
     def acquire(cls, bucket: str, file_path: str, worker_id: str = None) -> bool:
         """
@@ -212,6 +276,10 @@ class FileIngestion(models.Model):
             1. Pending files → lock
             2. Failed files under retry limit → lock and retry
             3. Stale processing locks → reclaim
+
+        All three are one conditional UPDATE — no row is read or locked
+        beforehand, and whichever worker's UPDATE matches the row first
+        wins; the others see it already PROCESSING and match nothing.
         """
         if worker_id is None:
             worker_id = f"worker-{os.getpid()}"
@@ -219,37 +287,116 @@ class FileIngestion(models.Model):
         now = dj_timezone.now()
         stale_cutoff = now - cls.LOCK_TIMEOUT
         
-        # Case 1 & 2: pending or retryable failed
         updated = cls.objects.filter(
+            models.Q(status__in=[cls.Status.PENDING, cls.Status.FAILED])
+            # Stale lock — worker probably crashed
+            | models.Q(status=cls.Status.PROCESSING, locked_at__lt=stale_cutoff),
             bucket=bucket,
             file_path=file_path,
-            status__in=[cls.Status.PENDING, cls.Status.FAILED],
             retry_count__lt=cls.MAX_RETRIES,
         ).update(
             status=cls.Status.PROCESSING,
             locked_at=now,
             locked_by=worker_id,
+            updated_at=now,
             retry_count=models.F('retry_count') + 1,
         )
         
-        if updated:
-            return True
-        
-        # Case 3: stale lock — worker probably crashed
-        updated = cls.objects.filter(
+        return updated > 0
+
+    @classmethod
+    def claim(cls, bucket: str, file_path: str, worker_id: str = None, **kwargs) -> int | None:
+        """
+        Register and lock a file in a single statement.
+
+        Equivalent to register() followed by acquire(), but issued as one
+        INSERT ... ON CONFLICT DO UPDATE ... RETURNING, so the fast path
+        costs one round-trip instead of up to four. The conflict clause
+        carries acquire()'s conditions: pending/failed under the retry
+        limit, or a stale processing lock.
+
+        Returns the id of the locked record, or None if the file is already
+        being processed, has completed or has exhausted its retries.
+        Extra kwargs are stored only when the record is created.
+        """
+        if worker_id is None:
+            worker_id = f"worker-{os.getpid()}"
+
+        now = dj_timezone.now()
+
+        record = cls(
             bucket=bucket,
             file_path=file_path,
             status=cls.Status.PROCESSING,
-            locked_at__lt=stale_cutoff,
-            retry_count__lt=cls.MAX_RETRIES,
-        ).update(
             locked_at=now,
             locked_by=worker_id,
-            retry_count=models.F('retry_count') + 1,
+            retry_count=1,
+            **kwargs,
         )
-        
-        return updated > 0
-    
+        fields = [f for f in cls._meta.concrete_fields if not f.primary_key]
+        values = [f.get_db_prep_save(f.pre_save(record, add=True), connection) for f in fields]
+
+        table = cls._meta.db_table
+        qn = connection.ops.quote_name
+        sql = (
+            f"INSERT INTO {qn(table)} ({', '.join(qn(f.column) for f in fields)}) "
+            f"VALUES ({', '.join(['%s'] * len(fields))}) "
+            f"ON CONFLICT ({qn('bucket')}, {qn('file_path')}) DO UPDATE SET "
+            f"{qn('status')} = EXCLUDED.{qn('status')}, "
+            f"{qn('locked_at')} = EXCLUDED.{qn('locked_at')}, "
+            f"{qn('locked_by')} = EXCLUDED.{qn('locked_by')}, "
+            f"{qn('updated_at')} = EXCLUDED.{qn('updated_at')}, "
+            f"{qn('retry_count')} = {qn(table)}.{qn('retry_count')} + 1 "
+            f"WHERE {qn(table)}.{qn('retry_count')} < %s AND ("
+            f"{qn(table)}.{qn('status')} IN (%s, %s) OR "
+            f"({qn(table)}.{qn('status')} = %s AND {qn(table)}.{qn('locked_at')} < %s)"
+            f") RETURNING {qn('id')}"
+        )
+        params = values + [
+            cls.MAX_RETRIES,
+            cls.Status.PENDING, cls.Status.FAILED,
+            cls.Status.PROCESSING, now - cls.LOCK_TIMEOUT,
+        ]
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+
+        return row[0] if row else None
+
+    @classmethod
+    def acquire_batch(cls, bucket: str, limit: int, worker_id: str = None) -> list['FileIngestion']:
+        """
+        Lock up to *limit* pending or retryable files in one statement.
+
+        For workers that drain a bucket in bulk rather than one message per
+        file. The candidate rows are selected FOR UPDATE SKIP LOCKED inside
+        the UPDATE, so concurrent callers each take a disjoint batch instead
+        of queueing on the same rows. Oldest files are taken first.
+
+        Returns the locked records.
+        """
+        if worker_id is None:
+            worker_id = f"worker-{os.getpid()}"
+
+        table = connection.ops.quote_name(cls._meta.db_table)
+        sql = (
+            f"UPDATE {table} SET status = %s, locked_at = %s, locked_by = %s, "
+            f"updated_at = %s, retry_count = retry_count + 1 "
+            f"WHERE id IN ("
+            f"SELECT id FROM {table} "
+            f"WHERE bucket = %s AND status IN (%s, %s) AND retry_count < %s "
+            f"ORDER BY created_at LIMIT %s FOR UPDATE SKIP LOCKED"
+            f") RETURNING *"
+        )
+        now = dj_timezone.now()
+        params = [
+            cls.Status.PROCESSING, now, worker_id, now,
+            bucket, cls.Status.PENDING, cls.Status.FAILED, cls.MAX_RETRIES, limit,
+        ]
+
+        return list(cls.objects.raw(sql, params))
+
     # =========================================================================
     # State transitions
     # =========================================================================
@@ -286,8 +433,11 @@ class FileIngestion(models.Model):
     
     @classmethod
     def mark_failed(cls, bucket: str, file_path: str, error: str):
-        """Mark a file as failed. Releases the lock for future retry."""
-        cls.objects.filter(
+        """
+        Mark a file as failed. Releases the lock for future retry, and
+        schedules that retry (see ``retry_queue``) once this commits.
+        """
+        updated = cls.objects.filter(
             bucket=bucket,
             file_path=file_path,
         ).update(
@@ -296,6 +446,27 @@ class FileIngestion(models.Model):
             locked_by='',
             error=error[:2000],
         )
+        if updated:
+            cls.schedule_retry(bucket, file_path)
+
+    @classmethod
+    def schedule_retry(cls, bucket: str, file_path: str) -> None:
+        """
+        Put a failed file on the retry schedule once the current transaction
+        commits — a retry drained before then would still find it PROCESSING.
+        The delay backs off with the attempts made so far; a file with no
+        retries left is not scheduled.
+        """
+        from georiva.ingestion.retry_queue import schedule_retry
+
+        def schedule():
+            attempts = cls.objects.filter(
+                bucket=bucket, file_path=file_path,
+            ).values_list('retry_count', flat=True).first()
+            if attempts is not None and attempts < cls.MAX_RETRIES:
+                schedule_retry(bucket, file_path, attempt=attempts)
+
+        transaction.on_commit(schedule)
     
     # =========================================================================
     # Queries
@@ -335,10 +506,21 @@ class FileIngestion(models.Model):
     
     @classmethod
     def get_retryable(cls, limit: int = 50):
-        """Get failed files that can be retried."""
+        """
+        Get failed files that can be retried.
+
+        Only the fields a retry needs are loaded, plus ``error_snippet`` —
+        the first 100 characters of ``error``, cut by the database — so the
+        rows do not carry whole tracebacks across the wire. ``error`` itself
+        is deferred, and still loads on access.
+        """
         return cls.objects.filter(
             status=cls.Status.FAILED,
             retry_count__lt=cls.MAX_RETRIES,
+        ).only(
+            'bucket', 'file_path', 'retry_count', 'reference_time',
+        ).annotate(
+            error_snippet=Substr('error', 1, 100),
         ).order_by('created_at')[:limit]
     
     @classmethod
@@ -0,0 +1,111 @@
+"""
+Retry schedule for failed file ingestions.
+
+A failed FileIngestion is put on a Redis sorted set scored by the epoch
+second it may be retried at; ``drain_retry_queue`` (a short-interval beat
+task) takes the members that are due and queues them again. Retries fire
+within seconds of falling due, without the sweep filtering the ingestion
+table every five minutes to find them.
+
+Redis is best-effort here, as for the palette cache: a failed write only
+means the record waits for the sweep, which still retries anything left
+FAILED that is not on the schedule.
+"""
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+RETRY_QUEUE_KEY = "georiva:ingestion:retry"
+
+# A retry still on the schedule this many seconds after it fell due was
+# never drained — drain_retry_queue is not running — so the sweep takes it.
+OVERDUE_AFTER = 5 * 60
+
+# Members are "<bucket>|<file_path>"; bucket names never contain "|".
+_SEPARATOR = "|"
+
+
+def _member(bucket: str, file_path: str) -> str:
+    return f"{bucket}{_SEPARATOR}{file_path}"
+
+
+def _as_text(member) -> str:
+    return member.decode() if isinstance(member, bytes) else member
+
+
+def schedule_retry(bucket: str, file_path: str, delay: float = None, attempt: int = 1) -> bool:
+    """
+    Schedule *file_path* in *bucket* for retry *delay* seconds from now.
+
+    By default the delay backs off exponentially: GEORIVA_INGESTION_RETRY_DELAY
+    after the first failed *attempt*, doubling with each one after, so an
+    outage of a few minutes does not use up every retry. Rescheduling a file
+    moves it rather than adding it twice. Returns False if Redis refused the
+    write.
+    """
+    from django.conf import settings
+    from django_redis import get_redis_connection
+
+    if delay is None:
+        delay = settings.GEORIVA_INGESTION_RETRY_DELAY * 2 ** (max(attempt, 1) - 1)
+    try:
+        get_redis_connection("default").zadd(
+            RETRY_QUEUE_KEY, {_member(bucket, file_path): time.time() + delay},
+        )
+        return True
+    except Exception as e:
+        logger.warning("Failed to schedule retry of %s/%s: %s", bucket, file_path, e)
+        return False
+
+
+def pop_due(limit: int = 100) -> list[tuple[str, str]]:
+    """
+    Remove and return up to *limit* (bucket, file_path) pairs that are due.
+
+    A member is only returned by the call whose ZREM removed it, so
+    concurrent drains never hand out the same file twice.
+    """
+    from django_redis import get_redis_connection
+
+    try:
+        redis_conn = get_redis_connection("default")
+        due = redis_conn.zrangebyscore(RETRY_QUEUE_KEY, "-inf", time.time(), start=0, num=limit)
+        if not due:
+            return []
+        pipe = redis_conn.pipeline(transaction=False)
+        for member in due:
+            pipe.zrem(RETRY_QUEUE_KEY, member)
+        removed = pipe.execute()
+    except Exception as e:
+        logger.warning("Failed to read the ingestion retry schedule: %s", e)
+        return []
+
+    return [
+        tuple(_as_text(member).split(_SEPARATOR, 1))
+        for member, taken in zip(due, removed) if taken
+    ]
+
+
+def scheduled(keys: list[tuple[str, str]]) -> set[tuple[str, str]]:
+    """
+    The subset of (bucket, file_path) *keys* that are on the schedule and
+    not OVERDUE_AFTER seconds past due. On a Redis failure, none are — the
+    caller then retries them itself.
+    """
+    from django_redis import get_redis_connection
+
+    if not keys:
+        return set()
+    try:
+        scores = get_redis_connection("default").zmscore(
+            RETRY_QUEUE_KEY, [_member(*key) for key in keys],
+        )
+    except Exception as e:
+        logger.warning("Failed to read the ingestion retry schedule: %s", e)
+        return set()
+    cutoff = time.time() - OVERDUE_AFTER
+    return {
+        key for key, score in zip(keys, scores)
+        if score is not None and score >= cutoff
+    }
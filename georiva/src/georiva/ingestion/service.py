@@ -1,8 +1,14 @@
+import ctypes
 import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
 
 import pytz
+from django.conf import settings
+from django.db import connections
 from django.db.models import Prefetch
 
 from georiva.core.storage.filename import parse_path
@@ -24,6 +30,23 @@ from georiva.ingestion.result import IngestionResult
 logger = logging.getLogger(__name__)
 
 
+def _trim_heap() -> None:
+    """
+    Hand freed heap pages back to the OS (glibc only).
+
+    A file run frees hundreds of MB of arrays and GDAL buffers, but glibc
+    keeps the pages mapped for reuse, so a long-lived worker's RSS ratchets
+    up to its largest file. One malloc_trim per file returns them, without
+    the GC walk gc.collect() would spend finding nothing to free.
+    """
+    if not sys.platform.startswith("linux"):
+        return
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass  # musl, or another libc without malloc_trim
+
+
 # =============================================================================
 # Ingestion Service
 # =============================================================================
@@ -61,7 +84,9 @@ class IngestionService:
           b. Gets or creates one Item for the collection + timestamp
           c. Runs each Variable through AssetHandler (extract → encode → write)
           d. Expands the Collection's temporal + spatial extent
-    9.  Archive raw file to georiva-archive (if configured)
+    9.  Archive raw file to georiva-archive (if configured) — the copy is
+        started before step 7 and runs in the background; a file that is kept
+        in origin has it discarded
     10. Delete from origin bucket (only if fully successful)
 
     Partial Failure Behaviour:
@@ -131,6 +156,8 @@ class IngestionService:
             success=False,
             timestamp=datetime.now(pytz.utc),
         )
+        # The early archive copy, until cleanup has kept or discarded it
+        archive = None
         
         try:
             # ── Organisation + catalog resolution ─────────────────────────────
@@ -196,15 +223,28 @@ class IngestionService:
                 origin_bucket=origin_bucket,
                 reference_time=reference_time,
                 ingestion_log=ingestion_log,
+                source_version=self._source_version(origin, file_path),
             )
             handler = IngestionHandler(ctx)
 
             progress.increment(by=10, state="file opened")
 
+            # The raw-file archive copy runs alongside download + processing
+            archive = self._source_file_manager.start_archive(origin, file_path, catalog)
+
             # ── Process ───────────────────────────────────────────────────────
-            try:
+            # Leaving the block closes every dataset handle the plugin opened
+            # and stops the handler's variable and the writer's upload threads
+            with plugin, ctx.writer, handler:
                 sfm = self._source_file_manager
                 with sfm.download_to_temp(origin, file_path) as local_path:
+                    # Resolve every collection's timestamps first, then run
+                    # all (collection, timestamp) pairs through one pool —
+                    # collections no longer wait on each other.
+                    # Collections fed the same source variable share one
+                    # timestamp scan — each is a full header read.
+                    tasks = []
+                    timestamps_by_variable = {}
                     for collection in collections:
                         first_variable_name = self._get_first_variable_name(collection)
                         if not first_variable_name:
@@ -213,9 +253,11 @@ class IngestionService:
                             )
                             continue
 
-                        timestamps = plugin.get_timestamps(
-                            local_path, first_variable_name
-                        )
+                        if first_variable_name not in timestamps_by_variable:
+                            timestamps_by_variable[first_variable_name] = plugin.get_timestamps(
+                                local_path, first_variable_name
+                            )
+                        timestamps = timestamps_by_variable[first_variable_name]
                         if not timestamps:
                             result.add_error(
                                 f"No timestamps found in: {file_path}"
@@ -232,51 +274,49 @@ class IngestionService:
                             by=5,
                             state=f"{collection.slug}: {len(timestamps)} timestamps found",
                         )
-                        n_vars = len(
-                            [v for v in collection.variables.all() if v.is_active]
-                        )
+                        n_vars = len(collection.active_variables)
                         loop = progress.create_child(
                             represents=70, total=max(1, len(timestamps))
                         )
+                        tasks.extend(
+                            (collection, ts, loop.create_child(represents=1, total=max(1, n_vars)))
+                            for ts in timestamps
+                        )
 
-                        for ts in timestamps:
-                            ts_slot = loop.create_child(
-                                represents=1, total=max(1, n_vars)
+                    outcomes = self._process_timestamps(
+                        handler,
+                        tasks=tasks,
+                        local_path=local_path,
+                        source_file=f"{origin_bucket}:{file_path}",
+                    )
+
+                    for (collection, ts, _), outcome in zip(tasks, outcomes):
+                        if isinstance(outcome, Exception):
+                            result.add_error(
+                                f"Failed {collection.slug} @ {ts}: {outcome}"
+                            )
+                            continue
+                        
+                        item, assets, clip_info, failed_vars = outcome
+                        
+                        if failed_vars:
+                            result.add_error(
+                                f"Partial failure for {collection.slug} "
+                                f"@ {ts}: variables failed: "
+                                f"{', '.join(failed_vars)}"
                             )
-                            try:
-                                item, assets, clip_info, failed_vars = (
-                                    handler.process_timestamp(
-                                        collection=collection,
-                                        local_path=local_path,
-                                        timestamp=ts,
-                                        source_file=f"{origin_bucket}:{file_path}",
-                                        progress=ts_slot,
-                                    )
-                                )
-                                
-                                if failed_vars:
-                                    result.add_error(
-                                        f"Partial failure for {collection.slug} "
-                                        f"@ {ts}: variables failed: "
-                                        f"{', '.join(failed_vars)}"
-                                    )
-                                
-                                if item is None:
-                                    continue
-                                
-                                result.items_created.append(str(item.pk))
-                                result.assets_created.extend(
-                                    [str(a.pk) for a in assets]
-                                )
-                                
-                                if clip_info and result.original_size is None:
-                                    result.original_size = clip_info.get("original_size")
-                                    result.clipped_size = clip_info.get("clipped_size")
-                            
-                            except Exception as e:
-                                result.add_error(
-                                    f"Failed {collection.slug} @ {ts}: {e}"
-                                )
+                        
+                        if item is None:
+                            continue
+                        
+                        result.items_created.append(str(item.pk))
+                        result.assets_created.extend(
+                            [str(a.pk) for a in assets]
+                        )
+                        
+                        if clip_info and result.original_size is None:
+                            result.original_size = clip_info.get("original_size")
+                            result.clipped_size = clip_info.get("clipped_size")
                 
                 result.success = len(result.items_created) > 0
 
@@ -288,13 +328,12 @@ class IngestionService:
                     result.valid_time_start = sorted_ts[0]
                     result.valid_time_end = sorted_ts[-1]
             
-            finally:
-                if hasattr(plugin, "clear_cache"):
-                    plugin.clear_cache()
-            
             # ── Archive + cleanup ─────────────────────────────────────────────
             progress.increment(by=10, state="archiving")
-            self._source_file_manager.cleanup(origin, file_path, catalog, result)
+            self._source_file_manager.cleanup(
+                origin, file_path, catalog, result, archive=archive,
+            )
+            archive = None
 
             progress.increment(by=5, state="done")
 
@@ -307,9 +346,85 @@ class IngestionService:
         except Exception as e:
             self.logger.exception("Ingestion failed: %s", file_path)
             result.add_error(str(e))
+        finally:
+            # A run that failed before cleanup leaves the file in origin —
+            # its copy goes, or every retry would archive another one.
+            if archive is not None:
+                self._source_file_manager.discard_archive(archive.result())
         
+        _trim_heap()
         return result
     
+    # =========================================================================
+    # Timestamps
+    # =========================================================================
+    
+    def _process_timestamps(
+            self,
+            handler: IngestionHandler,
+            *,
+            tasks: list,
+            local_path,
+            source_file: str,
+    ) -> list:
+        """
+        Run handler.process_timestamp for each (collection, timestamp,
+        progress slot) in *tasks*.
+
+        Returns one outcome per task, in order: the process_timestamp
+        tuple, or the exception it raised — one failing timestamp never
+        aborts the others.
+
+        Timestamps are independent (one Item each), even across collections,
+        so with GEORIVA_TIMESTAMP_CONCURRENCY > 1 (or 0, one per CPU) they
+        share one thread pool.
+        Threads rather than processes: Celery's prefork workers are daemonic
+        and cannot fork, and the heavy parts — GDAL reads, COG encoding,
+        uploads — release the GIL. Each worker closes its own DB connection.
+        """
+        def run(collection, ts, slot):
+            try:
+                return handler.process_timestamp(
+                    collection=collection,
+                    local_path=local_path,
+                    timestamp=ts,
+                    source_file=source_file,
+                    progress=slot,
+                )
+            except Exception as e:
+                return e
+        
+        concurrency = min(self._timestamp_workers(), len(tasks))
+        if concurrency <= 1:
+            return [run(*task) for task in tasks]
+        
+        def run_in_worker(task):
+            try:
+                return run(*task)
+            finally:
+                connections.close_all()
+        
+        with ThreadPoolExecutor(
+                max_workers=concurrency, thread_name_prefix="georiva-timestamp"
+        ) as pool:
+            return list(pool.map(run_in_worker, tasks))
+    
+    def _source_version(self, origin, file_path: str) -> str:
+        """
+        The source file's storage modified time, as the version its assets
+        are signed with — "" if storage cannot tell.
+        """
+        try:
+            return origin.modified_time(file_path).isoformat()
+        except Exception as e:
+            self.logger.warning("No modified time for %s: %s", file_path, e)
+            return ""
+
+    @staticmethod
+    def _timestamp_workers() -> int:
+        """GEORIVA_TIMESTAMP_CONCURRENCY, where 0 means one worker per CPU."""
+        return settings.GEORIVA_TIMESTAMP_CONCURRENCY or os.cpu_count() or 1
+    
     # =========================================================================
     # Collection Resolution
     # =========================================================================
@@ -357,9 +472,7 @@ class IngestionService:
         return list(base_qs.filter(catalog=catalog, is_active=True))
     
     def _get_first_variable_name(self, collection: Collection) -> Optional[str]:
-        for variable in collection.variables.all():
-            if not variable.is_active:
-                continue
+        for variable in collection.active_variables:
             if variable.sources:
                 return variable.sources[0].value['source_name']
         return None
@@ -12,8 +12,11 @@ leading segment of the key is the organisation slug by the storage grammar.
 An event whose organisation cannot be determined is published with ``org: None``
 and reaches nobody's stream. That is deliberate: an unattributable event is not
 one to broadcast to everybody.
+
+Catalog and organisation changes also reset the event consumer's catalog
+cache, so a catalog created here is ingestible straight away.
 """
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from georiva.core.storage.path_resolution import org_slug_from_key
@@ -57,3 +60,13 @@ def _file_ingestion_job_state_changed(sender, instance, created, update_fields,
         "id": instance.pk,
         "state": instance.state,
     })
+
+
+@receiver(post_save, sender="georivacore.Catalog")
+@receiver(post_delete, sender="georivacore.Catalog")
+@receiver(post_save, sender="organisations.Organisation")
+@receiver(post_delete, sender="organisations.Organisation")
+def _clear_catalog_cache(sender, **kwargs):
+    """The event consumer's catalog resolutions may now be wrong."""
+    from georiva.ingestion.consumer import clear_catalog_cache
+    clear_catalog_cache()
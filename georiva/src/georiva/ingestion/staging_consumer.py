@@ -114,7 +114,8 @@ def register_staging_file(bucket: str, key: str):
     origin = storage.bucket(bucket)
     sfm = SourceFileManager()
 
-    with sfm.download_to_temp(origin, key) as local_path:
+    # The plugin's cached file handles close before the temp file goes
+    with sfm.download_to_temp(origin, key) as local_path, plugin:
         checksum, file_size = _checksum_and_size(local_path)
 
         variables = plugin.list_variables(local_path) or []
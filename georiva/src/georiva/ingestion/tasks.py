@@ -3,9 +3,11 @@ GeoRiva Ingestion Celery Tasks
 """
 
 import logging
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from pathlib import Path
 
+from celery import group
+from django.conf import settings
 from django.utils import timezone as dj_timezone
 from django_celery_beat.models import PeriodicTask, IntervalSchedule
 
@@ -16,12 +18,26 @@ from georiva.ingestion.models import FileIngestion
 
 logger = logging.getLogger(__name__)
 
+# process_incoming_file messages the sweep publishes together, over one
+# broker connection, instead of one .delay() round-trip each.
+SWEEP_DISPATCH_BATCH = 100
+
+# Due retries taken off the schedule per round of drain_retry_queue.
+RETRY_DRAIN_BATCH = 100
+
+# The sweep's lock expires after this many seconds, so a sweep whose worker
+# died frees it on its own. Well above any sweep's run time.
+SWEEP_LOCK_TIMEOUT = 30 * 60
+
 
 @app.task(
     name="georiva.ingestion.tasks.process_incoming_file",
     bind=True,
     max_retries=0,
     acks_late=True,
+    # Pinned, like acks_late, rather than left to CELERY_TASK_REJECT_ON_WORKER_LOST:
+    # a message whose worker was OOM-killed goes back to the queue at once.
+    reject_on_worker_lost=True,
     queue="georiva-ingestion",
 )
 def process_incoming_file(
@@ -78,6 +94,7 @@ def process_incoming_file(
     bind=True,
     max_retries=0,
     acks_late=True,
+    reject_on_worker_lost=True,
     queue="georiva-ingestion",
 )
 def process_staging_file(self, bucket: str, key: str):
@@ -108,9 +125,65 @@ def sweep_unprocessed(sync: bool = False):
     Three phases:
     1. Reset stale locks (workers that crashed mid-processing)
     2. Scan incoming/sources buckets for untracked files
-    3. Retry failed files that haven't exceeded max retries
+    3. Retry failed files that haven't exceeded max retries and are not
+       already on the retry schedule (see drain_retry_queue)
+
+    Dispatches are published SWEEP_DISPATCH_BATCH at a time as a Celery
+    group, and whatever is left once the sweep ends (or fails) — a
+    registered file must never be left without its task.
+
+    A sweep that outlasts its beat interval is not joined by a second one:
+    the run holds a Redis lock, and a sweep that cannot take it returns at
+    once instead of resetting, registering and queueing the same files again.
     """
     
+    with _redis_lock(
+            "georiva:ingestion:sweep_unprocessed", timeout=SWEEP_LOCK_TIMEOUT,
+    ) as acquired:
+        if not acquired:
+            logger.info("Sweep already running elsewhere — skipping")
+            return
+        _sweep(sync)
+
+
+@contextmanager
+def _redis_lock(name: str, timeout: int):
+    """
+    Hold the Redis lock *name* for the block, yielding whether it was
+    taken — never waits for it.
+
+    Not a Postgres advisory lock: those belong to a database session, and
+    behind PgBouncer's transaction pooling the lock and its unlock can land
+    on different server sessions. The Redis lock carries its own token, so
+    only its holder releases it, and expires after *timeout* seconds if the
+    holder dies.
+
+    Redis is best-effort, as elsewhere: if it is unreachable the block runs
+    unlocked — it is the broker too, so nothing else is queueing meanwhile.
+    """
+    from django_redis import get_redis_connection
+    from redis.exceptions import LockError
+
+    try:
+        lock = get_redis_connection("default").lock(name, timeout=timeout, blocking=False)
+        acquired = lock.acquire()
+    except Exception as e:
+        logger.warning("Failed to take lock %s, running without it: %s", name, e)
+        yield True
+        return
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            try:
+                lock.release()
+            except LockError:
+                logger.warning("Lock %s expired before it was released", name)
+            except Exception as e:
+                logger.warning("Failed to release lock %s: %s", name, e)
+
+
+def _sweep(sync: bool) -> None:
     logger.info("Starting sweep...")
     
     # -----------------------------------------------------------------
@@ -121,17 +194,60 @@ def sweep_unprocessed(sync: bool = False):
     if stale_count:
         logger.warning("Reset %d stale locks", stale_count)
     
+    # -----------------------------------------------------------------
+    # Phases 2 + 3: queue untracked and failed files
+    # -----------------------------------------------------------------
+    
+    batch = []
+
+    def dispatch(**kwargs):
+        if sync:
+            process_incoming_file.run(**kwargs)
+            return
+        batch.append(process_incoming_file.s(**kwargs))
+        if len(batch) >= SWEEP_DISPATCH_BATCH:
+            _publish(batch)
+
+    try:
+        stats = _sweep_dispatch(dispatch)
+    finally:
+        _publish(batch)
+
+    new_files, retry_count, permanently_failed = stats
+    logger.info(
+        "Sweep complete: %d stale reset, %d new files, %d retries, %d permanently failed",
+        stale_count, new_files, retry_count, permanently_failed,
+    )
+
+
+def _publish(batch: list) -> None:
+    """Send a batch of task signatures as one group, and empty it."""
+    if batch:
+        group(list(batch)).apply_async()
+        batch.clear()
+
+
+def _sweep_dispatch(dispatch) -> tuple[int, int, int]:
+    """
+    Phases 2 and 3 of the sweep, queueing through *dispatch*. Returns
+    (new files, retries, permanently failed).
+
+    Each file is queued at most once per sweep: a file Phase 2 queued is
+    not retried in Phase 3, even if — run synchronously — it has already
+    failed again.
+    """
+    
+    queued = set()
+
     # -----------------------------------------------------------------
     # Phase 2: Scan buckets for untracked files
     # -----------------------------------------------------------------
     
     new_files = 0
 
-    dispatch = process_incoming_file.delay if not sync else process_incoming_file.run
-
-    from georiva.ingestion.unprocessed import find_unprocessed
+    from georiva.ingestion.unprocessed import iter_unprocessed
 
-    for unprocessed in find_unprocessed():
+    for unprocessed in iter_unprocessed():
         reference_time_iso = (
             unprocessed.reference_time.isoformat()
             if unprocessed.reference_time else None
@@ -142,6 +258,7 @@ def sweep_unprocessed(sync: bool = False):
                 "Re-ingesting %s/%s", unprocessed.bucket, unprocessed.file_path,
             )
             FileIngestion.reset_for_reingest(unprocessed.bucket, unprocessed.file_path)
+            queued.add((unprocessed.bucket, unprocessed.file_path))
             dispatch(
                 file_path=unprocessed.file_path,
                 origin_bucket=unprocessed.bucket,
@@ -157,6 +274,7 @@ def sweep_unprocessed(sync: bool = False):
                 file_path=unprocessed.file_path,
                 reference_time=unprocessed.reference_time,
             )
+            queued.add((unprocessed.bucket, unprocessed.file_path))
             dispatch(
                 file_path=unprocessed.file_path,
                 origin_bucket=unprocessed.bucket,
@@ -173,15 +291,25 @@ def sweep_unprocessed(sync: bool = False):
     # Phase 3: Retry failed files
     # -----------------------------------------------------------------
     
-    retryable = FileIngestion.get_retryable(limit=50)
+    from georiva.ingestion.retry_queue import scheduled
+
+    retryable = list(FileIngestion.get_retryable(limit=50))
+    # drain_retry_queue already has these — they failed recently, or Redis
+    # would not have taken them. Ones long past due are retried here: the
+    # drain is evidently not running.
+    pending = scheduled([(log.bucket, log.file_path) for log in retryable])
     retry_count = 0
     
     for log in retryable:
+        key = (log.bucket, log.file_path)
+        if key in pending or key in queued:
+            continue
+        queued.add(key)
         logger.info(
             "Retrying (%d/%d): %s/%s — last error: %s",
             log.retry_count, FileIngestion.MAX_RETRIES,
             log.bucket, log.file_path,
-            log.error[:100] if log.error else 'unknown',
+            log.error_snippet or 'unknown',
         )
         
         dispatch(
@@ -206,10 +334,54 @@ def sweep_unprocessed(sync: bool = False):
             permanently_failed,
         )
     
-    logger.info(
-        "Sweep complete: %d stale reset, %d new files, %d retries, %d permanently failed",
-        stale_count, new_files, retry_count, permanently_failed,
-    )
+    return new_files, retry_count, permanently_failed
+
+
+@app.task(
+    name="georiva.ingestion.tasks.drain_retry_queue",
+    queue="georiva-default",
+    ignore_result=True,
+)
+def drain_retry_queue():
+    """
+    Queue the failed files whose retry has fallen due.
+
+    Takes them off the Redis retry schedule RETRY_DRAIN_BATCH at a time and
+    publishes each round as one Celery group. A file is only queued if it
+    is still FAILED under the retry limit — one lookup by path per round,
+    not a scan of the ingestion table. Returns the number queued.
+    """
+    from georiva.ingestion.retry_queue import pop_due
+
+    queued = 0
+    while True:
+        due = pop_due(limit=RETRY_DRAIN_BATCH)
+        if not due:
+            break
+        keys = set(due)
+        retryable = FileIngestion.objects.filter(
+            status=FileIngestion.Status.FAILED,
+            retry_count__lt=FileIngestion.MAX_RETRIES,
+            file_path__in={file_path for _, file_path in due},
+        ).values_list("bucket", "file_path", "reference_time")
+
+        batch = [
+            process_incoming_file.s(
+                file_path=file_path,
+                origin_bucket=bucket,
+                reference_time=reference_time.isoformat() if reference_time else None,
+            )
+            for bucket, file_path, reference_time in retryable
+            if (bucket, file_path) in keys
+        ]
+        queued += len(batch)
+        _publish(batch)
+        if len(due) < RETRY_DRAIN_BATCH:
+            break
+
+    if queued:
+        logger.info("Queued %d due ingestion retries", queued)
+    return queued
 
 
 @app.task(name="georiva.ingestion.tasks.sweep_staging", queue="georiva-default")
@@ -234,9 +406,11 @@ def sweep_staging(sync: bool = False):
     known = set(StagingAsset.objects.values_list("href", flat=True))
 
     dispatched = 0
-    for f in bucket.list_files(recursive=True):
+    for f in bucket.iter_files(
+            recursive=True, concurrency=settings.GEORIVA_LISTING_CONCURRENCY,
+    ):
         key = f["path"]
-        name = Path(key).name
+        name = key.rpartition("/")[2]
         if name.startswith(".") or name == ".keep":
             continue
         if key in known:
@@ -296,6 +470,9 @@ def setup_periodic_tasks(sender, **kwargs):
         schedule_5min, _ = IntervalSchedule.objects.get_or_create(
             every=5, period=IntervalSchedule.MINUTES
         )
+        schedule_5sec, _ = IntervalSchedule.objects.get_or_create(
+            every=5, period=IntervalSchedule.SECONDS
+        )
         schedule_1day, _ = IntervalSchedule.objects.get_or_create(
             every=1, period=IntervalSchedule.DAYS
         )
@@ -311,6 +488,14 @@ def setup_periodic_tasks(sender, **kwargs):
                 "enabled": True,
             }
         )
+        PeriodicTask.objects.update_or_create(
+            name="georiva.ingestion.drain_retry_queue",
+            defaults={
+                "task": "georiva.ingestion.tasks.drain_retry_queue",
+                "interval": schedule_5sec,
+                "enabled": True,
+            }
+        )
         PeriodicTask.objects.update_or_create(
             name="georiva.ingestion.cleanup_archives",
             defaults={
@@ -0,0 +1,227 @@
+"""
+AssetHandler chunked-extraction tests — the output buffer is reused across
+variables instead of being reallocated for each one, and clip windows take
+the same chunked / streamed paths as whole grids, cut along the source's
+native blocks; streamed tiles share one buffer; blocks wholly outside the
+boundary are never read.
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from georiva.ingestion.handlers.asset_handler import AssetHandler
+
+
+class _OffsetExtractor:
+    """Fills every requested window with its source-grid (x, y) offset."""
+
+    def __init__(self):
+        self.windows = []
+
+    def extract(self, variable, local_path, timestamp, window, out=None):
+        self.windows.append(window)
+        x, y, w, h = window
+        if out is None:
+            out = np.empty((h, w), dtype=np.float32)
+        out.fill(x * 10_000 + y)
+        return out
+
+
+class _ConstantExtractor:
+    """Fills every requested window with a fixed value."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def extract(self, variable, local_path, timestamp, window, out=None):
+        x, y, w, h = window
+        if out is None:
+            return np.full((h, w), self.value, dtype=np.float32)
+        out.fill(self.value)
+        return out
+
+
+@override_settings(GEORIVA_CHUNK_THRESHOLD_PIXELS=10)
+class ChunkBufferReuseTests(SimpleTestCase):
+    def setUp(self):
+        self.handler = AssetHandler(writer=MagicMock(), extractor=_ConstantExtractor(1.0))
+
+    def _extract(self, width=3000, height=2100):
+        return self.handler._extract(
+            variable=MagicMock(slug="precip"),
+            local_path=Path("/tmp/file.tif"),
+            timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            width=width,
+            height=height,
+        )
+
+    def test_chunked_extraction_fills_whole_grid(self):
+        data = self._extract()
+
+        self.assertEqual(data.shape, (2100, 3000))
+        self.assertEqual(data.dtype, np.float32)
+        self.assertTrue((data == 1.0).all())
+
+    def test_buffer_reused_for_same_grid(self):
+        first = self._extract()
+        self.handler.extractor = _ConstantExtractor(2.0)
+        second = self._extract()
+
+        self.assertIs(first, second)
+        self.assertTrue((second == 2.0).all())
+
+    def test_new_buffer_for_different_grid(self):
+        first = self._extract()
+        second = self._extract(width=2500)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.shape, (2100, 2500))
+
+
+@override_settings(GEORIVA_CHUNK_THRESHOLD_PIXELS=10, GEORIVA_STREAM_THRESHOLD_PIXELS=0)
+class ClipWindowChunkingTests(SimpleTestCase):
+    def setUp(self):
+        self.extractor = _OffsetExtractor()
+        self.handler = AssetHandler(writer=MagicMock(), extractor=self.extractor)
+        self.clip_window = {"x_off": 100, "y_off": 50, "width": 2500, "height": 2100}
+
+    def test_large_clip_window_read_in_offset_chunks(self):
+        data = self.handler._extract(
+            variable=MagicMock(slug="precip"),
+            local_path=Path("/tmp/file.tif"),
+            timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            width=2500,
+            height=2100,
+            clip_window=self.clip_window,
+        )
+
+        self.assertEqual(data.shape, (2100, 2500))
+        # Cut on the source grid's 2048 multiples, not the clip window's
+        self.assertEqual(self.extractor.windows[0], (100, 50, 1948, 1998))
+        self.assertEqual(data[0, 0], 100 * 10_000 + 50)
+        self.assertEqual(data[2099, 2499], 2048 * 10_000 + 2048)
+
+    def test_streamed_blocks_relative_to_clip_window(self):
+        blocks = list(self.handler._iter_blocks(
+            MagicMock(slug="precip"), Path("/tmp/file.tif"),
+            datetime(2024, 1, 1, tzinfo=timezone.utc), 2500, 2100, self.clip_window,
+        ))
+
+        self.assertEqual([window for window, _ in blocks][:2], [(0, 0, 1948, 1998), (1948, 0, 552, 1998)])
+        self.assertEqual(self.extractor.windows[1], (2048, 50, 552, 1998))
+
+    def test_source_blocks_never_straddle_windows(self):
+        self.handler._extract(
+            variable=MagicMock(slug="precip"),
+            local_path=Path("/tmp/file.tif"),
+            timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            width=2500,
+            height=2100,
+            clip_window=self.clip_window,
+        )
+
+        for x, y, w, h in self.extractor.windows:
+            self.assertEqual(x // 2048, (x + w - 1) // 2048)
+            self.assertEqual(y // 2048, (y + h - 1) // 2048)
+
+    def test_native_blocks_never_straddle_windows(self):
+        self.handler._extract(
+            variable=MagicMock(slug="precip"),
+            local_path=Path("/tmp/file.tif"),
+            timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            width=2500,
+            height=2100,
+            clip_window=self.clip_window,
+            native_block=(300, 700),
+        )
+
+        # 2048 rounded up to 2100 rows and 2100 columns
+        self.assertEqual(self.extractor.windows[0], (100, 50, 2000, 2050))
+        for x, y, w, h in self.extractor.windows:
+            self.assertEqual(x // 700, (x + w - 1) // 700)
+            self.assertEqual(y // 300, (y + h - 1) // 300)
+
+    def test_streamed_tiles_larger_than_buffer_grow_it(self):
+        blocks = self.handler._iter_blocks(
+            MagicMock(slug="precip"), Path("/tmp/file.tif"),
+            datetime(2024, 1, 1, tzinfo=timezone.utc), 2500, 2100, self.clip_window,
+            native_block=(300, 700),
+        )
+
+        (x, y, w, h), block = next(blocks)
+        self.assertEqual(block.shape, (2050, 2000))
+        self.assertTrue((block == 100 * 10_000 + 50).all())
+
+    def test_streamed_blocks_extracted_into_one_tile_buffer(self):
+        blocks = self.handler._iter_blocks(
+            MagicMock(slug="precip"), Path("/tmp/file.tif"),
+            datetime(2024, 1, 1, tzinfo=timezone.utc), 2500, 2100, self.clip_window,
+        )
+        bases = set()
+        for (x, y, w, h), block in blocks:
+            self.assertEqual(block.shape, (h, w))
+            self.assertTrue(block.flags.c_contiguous)
+            self.assertTrue((block == (100 + x) * 10_000 + 50 + y).all())
+            bases.add(id(block.base))
+
+        self.assertEqual(len(bases), 1)
+
+
+@override_settings(GEORIVA_CHUNK_THRESHOLD_PIXELS=10, GEORIVA_CHUNK_READ_CONCURRENCY=4)
+class ConcurrentChunkReadTests(SimpleTestCase):
+    def test_blocks_read_concurrently_fill_whole_grid(self):
+        extractor = _OffsetExtractor()
+        handler = AssetHandler(writer=MagicMock(), extractor=extractor)
+
+        data = handler._extract(
+            variable=MagicMock(slug="precip"),
+            local_path=Path("/tmp/file.tif"),
+            timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            width=5000,
+            height=2100,
+        )
+
+        self.assertEqual(len(extractor.windows), 6)
+        for x, y, w, h in extractor.windows:
+            self.assertTrue((data[y:y + h, x:x + w] == x * 10_000 + y).all())
+
+
+@override_settings(GEORIVA_CHUNK_THRESHOLD_PIXELS=10)
+class OutsideBoundarySkipTests(SimpleTestCase):
+    def setUp(self):
+        self.extractor = _OffsetExtractor()
+        self.handler = AssetHandler(writer=MagicMock(), extractor=self.extractor)
+        # Everything right of the first 2048 columns lies outside the boundary
+        self.outside = np.zeros((2100, 5000), dtype=bool)
+        self.outside[:, 2048:] = True
+
+    def test_chunks_outside_boundary_not_read(self):
+        data = self.handler._extract(
+            variable=MagicMock(slug="precip"),
+            local_path=Path("/tmp/file.tif"),
+            timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            width=5000,
+            height=2100,
+            outside=self.outside,
+        )
+
+        self.assertEqual([x for x, _, _, _ in self.extractor.windows], [0, 0])
+        self.assertTrue(np.isnan(data[:, 2048:]).all())
+        self.assertFalse(np.isnan(data[:, :2048]).any())
+
+    def test_streamed_tiles_outside_boundary_not_read(self):
+        blocks = [
+            (window, block.copy()) for window, block in self.handler._iter_blocks(
+                MagicMock(slug="precip"), Path("/tmp/file.tif"),
+                datetime(2024, 1, 1, tzinfo=timezone.utc), 5000, 2100,
+                outside=self.outside,
+            )
+        ]
+
+        self.assertEqual(len(blocks), 6)
+        self.assertEqual(len(self.extractor.windows), 2)
+        for (x, _, _, _), block in blocks:
+            self.assertEqual(bool(np.isnan(block).all()), x >= 2048)
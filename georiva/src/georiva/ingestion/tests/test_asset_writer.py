@@ -0,0 +1,202 @@
+"""
+AssetWriter tests — a COG streamed tile by tile matches one written from the
+whole array, quantized COGs carry the scale/offset that decodes them, and
+submitted COGs upload off the encoding thread, with retries.
+"""
+import os
+import tempfile
+import threading
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import rasterio
+from django.test import SimpleTestCase, override_settings
+
+from georiva.ingestion.asset_writer import AssetWriter
+from georiva.ingestion.utils import QUANTIZED_NODATA, iter_windows, quantization, quantize
+
+
+class WriteCogBlocksTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        overrides = override_settings(
+            GEORIVA_TEMP_DIR=tmp.name,
+            GEORIVA_COG_NUM_THREADS="2",
+            GEORIVA_COG_DEFLATE_LEVEL=6,
+            GEORIVA_UPLOAD_ATTEMPTS=3,
+            GEORIVA_COG_RAW_IN_MEMORY_MAX_BYTES=1024 * 1024,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        self.stored = {}
+
+        self.upload_threads = []
+
+        def upload(local_path, path):
+            self.upload_threads.append(threading.current_thread())
+            with open(local_path, "rb") as f:
+                self.stored[path] = f.read()
+            return path
+
+        bucket = MagicMock()
+        bucket.upload.side_effect = upload
+        self.writer = AssetWriter(bucket)
+        self.tmp = tmp.name
+        self.data = np.arange(300 * 200, dtype=np.float32).reshape(200, 300)
+        self.bounds = (10.0, -5.0, 40.0, 15.0)
+
+    def _read(self, path):
+        local = f"{self.tmp}/{path}"
+        with open(local, "wb") as f:
+            f.write(self.stored[path])
+        with rasterio.open(local) as src:
+            return src.read(1), src.bounds
+
+    def test_streamed_cog_matches_whole_array_cog(self):
+        self.writer.write_cog(self.data, "whole.tif", self.bounds)
+        blocks = (
+            ((x, y, w, h), self.data[y:y + h, x:x + w])
+            for x, y, w, h in iter_windows(300, 200, block_size=64)
+        )
+        self.writer.write_cog_blocks(
+            blocks, "streamed.tif", self.bounds, width=300, height=200,
+        )
+
+        whole, whole_bounds = self._read("whole.tif")
+        streamed, streamed_bounds = self._read("streamed.tif")
+        np.testing.assert_array_equal(streamed, whole)
+        np.testing.assert_array_equal(streamed, self.data)
+        self.assertEqual(streamed_bounds, whole_bounds)
+
+    def test_cog_is_tiled_with_overviews(self):
+        self.writer.write_cog(self.data, "whole.tif", self.bounds)
+        local = f"{self.tmp}/whole.tif"
+        with open(local, "wb") as f:
+            f.write(self.stored["whole.tif"])
+
+        with rasterio.open(local) as src:
+            self.assertEqual(src.block_shapes, [(128, 128)])
+            self.assertEqual(src.overviews(1), [2])
+            self.assertEqual(src.profile["compress"], "deflate")
+
+    def test_cog_without_overviews(self):
+        self.writer.write_cog(self.data, "whole.tif", self.bounds, overviews=False)
+        local = f"{self.tmp}/whole.tif"
+        with open(local, "wb") as f:
+            f.write(self.stored["whole.tif"])
+
+        with rasterio.open(local) as src:
+            self.assertEqual(src.overviews(1), [])
+            np.testing.assert_array_equal(src.read(1), self.data)
+
+    def test_raw_pass_staged_on_disk_above_memory_limit(self):
+        self.writer.write_cog(self.data, "memory.tif", self.bounds)
+        with (
+            override_settings(GEORIVA_COG_RAW_IN_MEMORY_MAX_BYTES=0),
+            patch(
+                "georiva.ingestion.asset_writer.MemoryFile",
+                side_effect=AssertionError("staged in memory"),
+            ),
+        ):
+            self.writer.write_cog(self.data, "disk.tif", self.bounds)
+
+        memory, _ = self._read("memory.tif")
+        disk, _ = self._read("disk.tif")
+        np.testing.assert_array_equal(memory, disk)
+        np.testing.assert_array_equal(memory, self.data)
+
+    def test_quantized_cog_decodes_back_to_values(self):
+        self.data[0, :10] = np.nan
+        scale, offset = quantization(0.0, 60_000.0)
+        blocks = (
+            ((x, y, w, h), quantize(self.data[y:y + h, x:x + w], scale, offset))
+            for x, y, w, h in iter_windows(300, 200, block_size=64)
+        )
+        self.writer.write_cog_blocks(
+            blocks, "quantized.tif", self.bounds, width=300, height=200,
+            dtype=np.int16, nodata=QUANTIZED_NODATA, scale=scale, offset=offset,
+        )
+
+        local = f"{self.tmp}/quantized.tif"
+        with open(local, "wb") as f:
+            f.write(self.stored["quantized.tif"])
+        with rasterio.open(local) as src:
+            self.assertEqual(src.dtypes[0], "int16")
+            self.assertEqual(src.nodata, QUANTIZED_NODATA)
+            stored = src.read(1, masked=True)
+            decoded = stored * src.scales[0] + src.offsets[0]
+
+        self.assertTrue(stored.mask[0, :10].all())
+        np.testing.assert_allclose(
+            decoded.filled(np.nan), self.data, atol=scale / 2 + 1e-3,
+        )
+
+    def test_deflate_level_trades_size_for_speed(self):
+        self.data = np.random.default_rng(0).random((200, 300), dtype=np.float32)
+        sizes = {}
+        for level in (1, 9):
+            with override_settings(GEORIVA_COG_DEFLATE_LEVEL=level):
+                self.writer.write_cog(self.data, f"level{level}.tif", self.bounds)
+            sizes[level] = len(self.stored[f"level{level}.tif"])
+
+        self.assertLess(sizes[9], sizes[1])
+
+    def test_stored_size_reported_once_without_asking_storage(self):
+        self.writer.write_cog(self.data, "whole.tif", self.bounds)
+
+        self.assertEqual(self.writer.stored_size("whole.tif"), len(self.stored["whole.tif"]))
+        self.assertIsNone(self.writer.stored_size("whole.tif"))
+        self.writer.bucket.size.assert_not_called()
+
+    def test_submitted_cog_uploaded_in_background(self):
+        with override_settings(GEORIVA_UPLOAD_CONCURRENCY=2):
+            with self.writer:
+                future = self.writer.submit_cog(self.data, "whole.tif", self.bounds)
+                self.assertEqual(future.result(), "whole.tif")
+
+        self.assertIsNot(self.upload_threads[0], threading.current_thread())
+        self.assertEqual(self.writer.stored_size("whole.tif"), len(self.stored["whole.tif"]))
+        self.assertEqual(os.listdir(self.tmp), [])
+        whole, _ = self._read("whole.tif")
+        np.testing.assert_array_equal(whole, self.data)
+
+    def test_submit_uploads_inline_when_disabled(self):
+        with override_settings(GEORIVA_UPLOAD_CONCURRENCY=0):
+            future = self.writer.submit_cog(self.data, "whole.tif", self.bounds)
+
+        self.assertTrue(future.done())
+        self.assertIs(self.upload_threads[0], threading.current_thread())
+        self.assertIsNone(self.writer._upload_pool)
+
+    @patch("georiva.ingestion.asset_writer.time.sleep")
+    def test_failed_upload_surfaces_on_future_and_cleans_up(self, sleep):
+        self.writer.bucket.upload.side_effect = OSError("bucket unreachable")
+        with override_settings(GEORIVA_UPLOAD_CONCURRENCY=2):
+            with self.writer:
+                future = self.writer.submit_cog(self.data, "whole.tif", self.bounds)
+                with self.assertRaises(OSError):
+                    future.result()
+
+        self.assertEqual(self.writer.bucket.upload.call_count, 3)
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [1, 2])
+        self.assertEqual(os.listdir(self.tmp), [])
+
+    @patch("georiva.ingestion.asset_writer.time.sleep")
+    def test_transient_upload_failure_retried(self, sleep):
+        upload = self.writer.bucket.upload.side_effect
+        failures = [OSError("throttled")]
+
+        def flaky_upload(local_path, path):
+            if failures:
+                raise failures.pop()
+            return upload(local_path, path)
+
+        self.writer.bucket.upload.side_effect = flaky_upload
+        self.writer.write_cog(self.data, "whole.tif", self.bounds)
+
+        self.assertEqual(self.writer.bucket.upload.call_count, 2)
+        sleep.assert_called_once_with(1)
+        whole, _ = self._read("whole.tif")
+        np.testing.assert_array_equal(whole, self.data)
@@ -0,0 +1,130 @@
+"""
+BoundaryClipper tests — the per-file clipper is reused across every
+timestamp, so windows and masks are computed once per source grid, and
+masks are shared across clippers of the same boundary.
+"""
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+from shapely.geometry import box
+
+from georiva.ingestion import clipper as clipper_module
+from georiva.ingestion.clipper import BoundaryClipper
+
+
+class ComputeWindowTests(SimpleTestCase):
+    def setUp(self):
+        self.clipper = BoundaryClipper(boundary=MagicMock(bbox=(2, 2, 6, 6)))
+
+    def test_window_snapped_to_source_grid(self):
+        window = self.clipper.compute_window((0, 0, 10, 10), 10, 10)
+
+        self.assertEqual(
+            (window["x_off"], window["y_off"], window["width"], window["height"]),
+            (2, 4, 4, 4),
+        )
+        self.assertEqual(window["bounds"], (2, 2, 6, 6))
+
+    def test_window_computed_once_per_grid(self):
+        with patch.object(
+                self.clipper, "_compute_window", wraps=self.clipper._compute_window,
+        ) as compute:
+            first = self.clipper.compute_window((0, 0, 10, 10), 10, 10)
+            second = self.clipper.compute_window([0, 0, 10, 10], 10, 10)
+            self.clipper.compute_window((0, 0, 10, 10), 20, 20)
+
+        self.assertEqual(first, second)
+        self.assertEqual(compute.call_count, 2)
+
+    def test_cached_window_not_shared_with_callers(self):
+        first = self.clipper.compute_window((0, 0, 10, 10), 10, 10)
+        first["width"] = 0
+
+        second = self.clipper.compute_window((0, 0, 10, 10), 10, 10)
+        self.assertEqual(second["width"], 4)
+
+    def test_no_intersection_still_raises(self):
+        with self.assertRaises(ValueError):
+            self.clipper.compute_window((20, 20, 30, 30), 10, 10)
+
+
+class CreateMaskTests(SimpleTestCase):
+    def setUp(self):
+        self.clipper = BoundaryClipper(boundary=MagicMock(bbox=(2, 2, 6, 6)))
+        self.clipper._shapely_geom = box(2, 2, 6, 6)
+
+    def test_true_inside_boundary(self):
+        mask = self.clipper.create_mask((0, 0, 10, 10), 10, 10)
+
+        self.assertEqual(mask.dtype, bool)
+        self.assertEqual(int(mask.sum()), 16)
+        self.assertTrue(mask[4:8, 2:6].all())
+
+    def test_mask_cached_per_grid(self):
+        first = self.clipper.create_mask((0, 0, 10, 10), 10, 10)
+
+        self.assertIs(self.clipper.create_mask((0, 0, 10, 10), 10, 10), first)
+
+    def test_outside_mask_is_the_inverse(self):
+        outside = self.clipper.outside_mask((0, 0, 10, 10), 10, 10)
+
+        np.testing.assert_array_equal(outside, ~self.clipper.create_mask((0, 0, 10, 10), 10, 10))
+
+
+@override_settings(GEORIVA_CLIP_MASK_CACHE_SIZE=2)
+class SharedMaskTests(SimpleTestCase):
+    def setUp(self):
+        clipper_module._shared_masks.clear()
+        self.addCleanup(clipper_module._shared_masks.clear)
+
+    def _clipper(self, geom):
+        clipper = BoundaryClipper(boundary=MagicMock(bbox=geom.bounds))
+        clipper._shapely_geom = geom
+        return clipper
+
+    def test_clippers_of_one_boundary_rasterize_once(self):
+        with patch.object(
+                clipper_module, "geometry_mask", wraps=clipper_module.geometry_mask,
+        ) as rasterize:
+            first = self._clipper(box(2, 2, 6, 6)).outside_mask((0, 0, 10, 10), 10, 10)
+            second = self._clipper(box(2, 2, 6, 6)).outside_mask((0, 0, 10, 10), 10, 10)
+            self._clipper(box(1, 1, 6, 6)).outside_mask((0, 0, 10, 10), 10, 10)
+
+        self.assertIs(first, second)
+        self.assertFalse(first.flags.writeable)
+        self.assertEqual(rasterize.call_count, 2)
+
+    def test_least_recently_used_mask_evicted(self):
+        for size in (10, 20, 30):
+            self._clipper(box(2, 2, 6, 6)).outside_mask((0, 0, 10, 10), size, size)
+
+        self.assertEqual(
+            [key[2] for key in clipper_module._shared_masks], [20, 30],
+        )
+
+
+class ApplyGeometryMaskTests(CreateMaskTests):
+    def setUp(self):
+        super().setUp()
+        self.data = np.ones((10, 10), dtype=np.float32)
+
+    def test_copy_leaves_input_untouched(self):
+        masked = self.clipper.apply_geometry_mask(self.data, (0, 0, 10, 10))
+
+        self.assertEqual(masked.dtype, np.float32)
+        self.assertEqual(int(np.isnan(masked).sum()), 84)
+        self.assertFalse(np.isnan(self.data).any())
+
+    def test_in_place_masks_input(self):
+        masked = self.clipper.apply_geometry_mask(self.data, (0, 0, 10, 10), copy=False)
+
+        self.assertIs(masked, self.data)
+        self.assertEqual(int(np.isnan(self.data).sum()), 84)
+
+    def test_blocks_match_whole_grid(self):
+        whole = self.clipper.apply_geometry_mask(self.data, (0, 0, 10, 10))
+        for x, y, w, h in ((0, 0, 10, 5), (0, 5, 10, 5)):
+            block = self.data[y:y + h, x:x + w].copy()
+            self.clipper.apply_geometry_mask_block(block, (0, 0, 10, 10), 10, 10, (x, y, w, h))
+            np.testing.assert_array_equal(block, whole[y:y + h, x:x + w])
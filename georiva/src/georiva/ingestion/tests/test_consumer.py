@@ -1,10 +1,12 @@
+import time
 from unittest.mock import MagicMock, patch
 
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase, override_settings
 
 from georiva.core.models import Catalog
 from georiva.core.storage import BucketType
-from georiva.ingestion.consumer import _handle_event
+from georiva.ingestion import consumer
+from georiva.ingestion.consumer import _handle_event, _handle_events
 from georiva.ingestion.models import FileIngestion
 from georiva.organisations.testing import make_organisation
 
@@ -61,6 +63,196 @@ class ConsumerDirectFileIngestionTests(TestCase):
         self.assertIn("valid time", log.error)
 
 
+class ConsumerBatchRegistrationTests(TestCase):
+    def setUp(self):
+        Catalog.objects.create(organisation=make_organisation(), name="Test", slug="test-catalog", file_format="grib2")
+        self.paths = [f"test-org/test-catalog/test-collection/file{i}.grib2" for i in range(3)]
+
+    def test_records_of_one_notification_registered_together(self):
+        FileIngestion.objects.create(
+            bucket=BucketType.SOURCES, file_path=self.paths[0],
+            status=FileIngestion.Status.PROCESSING,
+        )
+        events = [_make_event("georiva-sources", path) for path in self.paths]
+        events.append(_make_event("georiva-sources", "test-org/test-catalog/.keep"))
+
+        with (
+            patch("georiva.ingestion.consumer.validate_path") as mock_vp,
+            patch("georiva.ingestion.consumer._resolve_origin", return_value=BucketType.SOURCES),
+            patch("georiva.ingestion.consumer.process_incoming_file") as mock_task,
+            patch.object(FileIngestion.objects, "get_or_create") as get_or_create,
+        ):
+            mock_vp.return_value = {
+                "org": "test-org", "catalog": "test-catalog",
+                "collection": "test-collection", "reference_time": None,
+            }
+            _handle_events(events)
+
+        get_or_create.assert_not_called()
+        self.assertEqual(FileIngestion.objects.filter(file_path__in=self.paths).count(), 3)
+        self.assertEqual(
+            [c.kwargs["file_path"] for c in mock_task.delay.call_args_list], self.paths[1:],
+        )
+
+    def test_repeated_records_queued_once(self):
+        events = [_make_event("georiva-sources", path) for path in self.paths + self.paths[:2]]
+
+        with (
+            patch("georiva.ingestion.consumer.validate_path") as mock_vp,
+            patch("georiva.ingestion.consumer._resolve_origin", return_value=BucketType.SOURCES),
+            patch("georiva.ingestion.consumer.process_incoming_file") as mock_task,
+        ):
+            mock_vp.return_value = {
+                "org": "test-org", "catalog": "test-catalog",
+                "collection": "test-collection", "reference_time": None,
+            }
+            _handle_events(events)
+
+        self.assertEqual(
+            [c.kwargs["file_path"] for c in mock_task.delay.call_args_list], self.paths,
+        )
+
+    def test_register_many_reports_created_rows(self):
+        FileIngestion.register(bucket=BucketType.SOURCES, file_path=self.paths[0])
+
+        with self.assertNumQueries(3):
+            registered = FileIngestion.register_many([
+                {"bucket": BucketType.SOURCES, "file_path": path} for path in self.paths
+            ])
+
+        self.assertEqual(
+            [registered[(BucketType.SOURCES, path)][1] for path in self.paths],
+            [False, True, True],
+        )
+        self.assertTrue(all(log.pk for log, _ in registered.values()))
+
+    def test_registration_commits_without_waiting_for_wal_flush(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        events = [_make_event("georiva-sources", path) for path in self.paths]
+
+        with (
+            patch("georiva.ingestion.consumer.validate_path") as mock_vp,
+            patch("georiva.ingestion.consumer._resolve_origin", return_value=BucketType.SOURCES),
+            patch("georiva.ingestion.consumer.process_incoming_file"),
+            CaptureQueriesContext(connection) as queries,
+        ):
+            mock_vp.return_value = {
+                "org": "test-org", "catalog": "test-catalog",
+                "collection": "test-collection", "reference_time": None,
+            }
+            _handle_events(events)
+
+        sql = [query["sql"] for query in queries.captured_queries]
+        relaxed = sql.index("SET LOCAL synchronous_commit = off")
+        inserted = next(i for i, q in enumerate(sql) if q.startswith("INSERT"))
+        self.assertLess(relaxed, inserted)
+
+
+class ConsumeLoopTests(SimpleTestCase):
+    def test_stale_connections_dropped_before_each_notification(self):
+        stop = MagicMock()
+        stop.is_set.side_effect = [False, True]
+        client = MagicMock()
+        client.blpop.return_value = (b"key", b'{"Records": []}')
+        calls = []
+
+        with (
+            patch("georiva.ingestion.consumer.redis.from_url", return_value=client),
+            patch("georiva.ingestion.consumer.close_old_connections",
+                  side_effect=lambda: calls.append("close")),
+            patch("georiva.ingestion.consumer._handle_events",
+                  side_effect=lambda records: calls.append("handle")),
+        ):
+            consumer._consume_loop(stop)
+
+        self.assertEqual(calls, ["close", "handle"])
+
+    def test_notification_bytes_parsed_and_bad_json_skipped(self):
+        stop = MagicMock()
+        stop.is_set.side_effect = [False, False, True]
+        client = MagicMock()
+        client.blpop.side_effect = [
+            (b"key", b"not json"),
+            (b"key", '[{"Event": [{"s3": {}}]}]'.encode()),
+        ]
+
+        with (
+            patch("georiva.ingestion.consumer.redis.from_url", return_value=client),
+            patch("georiva.ingestion.consumer.close_old_connections"),
+            patch("georiva.ingestion.consumer._handle_events") as handle,
+        ):
+            consumer._consume_loop(stop)
+
+        handle.assert_called_once_with([{"s3": {}}])
+
+
+class ResolveOriginTests(SimpleTestCase):
+    def test_bucket_names_mapped_once_and_refreshed_on_override(self):
+        consumer._get_ingest_buckets.cache_clear()
+        with patch("georiva.ingestion.consumer.get_bucket_config", wraps=consumer.get_bucket_config) as config:
+            consumer._resolve_origin("georiva-sources")
+            consumer._resolve_origin("georiva-incoming")
+        self.assertEqual(config.call_count, 1)
+
+        buckets = {
+            BucketType.INCOMING: {"name": "other-incoming"},
+            BucketType.SOURCES: {"name": "other-sources"},
+        }
+        with override_settings(GEORIVA_BUCKETS=buckets):
+            self.assertEqual(consumer._resolve_origin("other-sources"), BucketType.SOURCES)
+        self.assertIsNone(consumer._resolve_origin("other-sources"))
+
+
+class CatalogCacheTests(TestCase):
+    def setUp(self):
+        consumer.clear_catalog_cache()
+        self.addCleanup(consumer.clear_catalog_cache)
+        self.org = make_organisation()
+
+    def _resolve_twice(self):
+        with patch(
+                "georiva.ingestion.consumer.resolve_org_catalog",
+                wraps=consumer.resolve_org_catalog,
+        ) as resolve:
+            first = consumer._resolve_catalog(self.org.slug, "cached")
+            second = consumer._resolve_catalog(self.org.slug, "cached")
+        return first, second, resolve.call_count
+
+    def test_misses_cached_until_a_catalog_is_saved(self):
+        first, second, lookups = self._resolve_twice()
+        self.assertIsNone(first[0])
+        self.assertEqual(first, second)
+        self.assertEqual(lookups, 1)
+
+        Catalog.objects.create(organisation=self.org, name="Cached", slug="cached", file_format="grib2")
+
+        catalog, error = consumer._resolve_catalog(self.org.slug, "cached")
+        self.assertEqual(catalog.slug, "cached")
+        self.assertIsNone(error)
+
+    def test_catalogs_of_one_notification_resolved_together(self):
+        for slug in ("rain", "wind"):
+            Catalog.objects.create(organisation=self.org, name=slug, slug=slug, file_format="grib2")
+
+        with self.assertNumQueries(1):
+            consumer._prefetch_catalogs({(self.org.slug, "rain"), (self.org.slug, "wind")})
+        with patch("georiva.ingestion.consumer.resolve_org_catalog") as resolve:
+            catalog, error = consumer._resolve_catalog(self.org.slug, "wind")
+
+        resolve.assert_not_called()
+        self.assertEqual((catalog.slug, error), ("wind", None))
+
+    def test_entries_expire(self):
+        self._resolve_twice()
+
+        with patch("georiva.ingestion.consumer.time.monotonic", return_value=time.monotonic() + 61):
+            _, _, lookups = self._resolve_twice()
+
+        self.assertEqual(lookups, 1)
+
+
 class SweepDirectFileIngestionTests(TestCase):
     def setUp(self):
         Catalog.objects.create(organisation=make_organisation(), name="Sweep", slug="sweep-cat", file_format="grib2")
@@ -71,9 +263,9 @@ class SweepDirectFileIngestionTests(TestCase):
 
         file_path = "test-org/sweep-cat/col/rain.grib"
         incoming_bucket = MagicMock()
-        incoming_bucket.list_files.return_value = []
+        incoming_bucket.iter_files.return_value = []
         sources_bucket = MagicMock()
-        sources_bucket.list_files.return_value = [{"path": file_path}]
+        sources_bucket.iter_files.return_value = [{"path": file_path}]
 
         def _bucket_side_effect(bucket_type):
             return sources_bucket if bucket_type == BT.SOURCES else incoming_bucket
@@ -94,3 +286,100 @@ class SweepDirectFileIngestionTests(TestCase):
         self.assertTrue(
             FileIngestion.objects.filter(file_path=file_path, bucket=BT.SOURCES).exists()
         )
+
+    def test_sweep_publishes_dispatches_in_batches(self):
+        from georiva.core.storage import BucketType as BT
+        from georiva.ingestion.tasks import sweep_unprocessed
+
+        paths = [f"test-org/sweep-cat/col/rain{i}.grib" for i in range(3)]
+        sources_bucket = MagicMock()
+        sources_bucket.iter_files.return_value = [{"path": p} for p in paths]
+        empty_bucket = MagicMock()
+        empty_bucket.iter_files.return_value = []
+
+        with (
+            patch("georiva.ingestion.unprocessed.storage") as mock_storage,
+            patch("georiva.ingestion.unprocessed.validate_path") as mock_vp,
+            patch("georiva.ingestion.tasks.process_incoming_file") as mock_task,
+            patch("georiva.ingestion.tasks.group") as mock_group,
+            patch("georiva.ingestion.tasks.SWEEP_DISPATCH_BATCH", 2),
+        ):
+            mock_storage.bucket.side_effect = (
+                lambda bucket_type: sources_bucket if bucket_type == BT.SOURCES else empty_bucket
+            )
+            mock_vp.return_value = {"org": "test-org", "catalog": "sweep-cat", "reference_time": None}
+
+            sweep_unprocessed()
+
+        mock_task.delay.assert_not_called()
+        self.assertEqual([len(c.args[0]) for c in mock_group.call_args_list], [2, 1])
+        self.assertEqual(mock_group.return_value.apply_async.call_count, 2)
+        self.assertEqual(
+            [c.kwargs["file_path"] for c in mock_task.s.call_args_list], paths,
+        )
+
+    def test_sweep_holds_redis_lock_while_running(self):
+        from django_redis import get_redis_connection
+
+        from georiva.ingestion.tasks import sweep_unprocessed
+
+        redis_conn = get_redis_connection("default")
+        key = "georiva:ingestion:sweep_unprocessed"
+        redis_conn.delete(key)
+
+        held = []
+        with (
+            patch("georiva.ingestion.tasks.FileIngestion.reset_stale_locks") as reset,
+            patch("georiva.ingestion.tasks._sweep_dispatch", return_value=(0, 0, 0)),
+        ):
+            reset.side_effect = lambda: held.append(redis_conn.ttl(key)) or 0
+            sweep_unprocessed()
+
+        self.assertEqual(len(held), 1)
+        self.assertGreater(held[0], 0)
+        self.assertFalse(redis_conn.exists(key))
+
+    def test_sweep_skipped_while_lock_held_elsewhere(self):
+        from django_redis import get_redis_connection
+
+        from georiva.ingestion.tasks import sweep_unprocessed
+
+        other = get_redis_connection("default").lock(
+            "georiva:ingestion:sweep_unprocessed", timeout=60,
+        )
+        self.assertTrue(other.acquire(blocking=False))
+        self.addCleanup(other.release)
+
+        with patch("georiva.ingestion.tasks.FileIngestion.reset_stale_locks") as reset:
+            sweep_unprocessed()
+
+        reset.assert_not_called()
+
+    def test_file_queued_once_per_sweep(self):
+        from georiva.core.storage import BucketType as BT
+        from georiva.ingestion.tasks import sweep_unprocessed
+
+        file_path = "test-org/sweep-cat/col/rain.grib"
+        sources_bucket = MagicMock()
+        sources_bucket.iter_files.return_value = [{"path": file_path}]
+        empty_bucket = MagicMock()
+        empty_bucket.iter_files.return_value = []
+
+        def fail(**kwargs):
+            FileIngestion.mark_failed(kwargs["origin_bucket"], kwargs["file_path"], "boom")
+
+        with (
+            patch("georiva.ingestion.unprocessed.storage") as mock_storage,
+            patch("georiva.ingestion.unprocessed.validate_path") as mock_vp,
+            patch("georiva.ingestion.tasks.process_incoming_file") as mock_task,
+            patch("georiva.ingestion.retry_queue.scheduled", return_value=set()),
+        ):
+            mock_storage.bucket.side_effect = (
+                lambda bucket_type: sources_bucket if bucket_type == BT.SOURCES else empty_bucket
+            )
+            mock_vp.return_value = {"org": "test-org", "catalog": "sweep-cat", "reference_time": None}
+            mock_task.run.side_effect = fail
+
+            sweep_unprocessed(sync=True)
+
+        mock_task.run.assert_called_once()
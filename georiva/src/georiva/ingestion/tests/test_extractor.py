@@ -0,0 +1,427 @@
+"""
+VariableExtractor tests — transforms evaluated against a stub format plugin,
+so no source file or database is needed.
+"""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from georiva.core.models import Variable
+from georiva.core.unit_utils import ureg
+from georiva.ingestion import utils as utils_module
+from georiva.ingestion.extractor import VariableExtractor, _vector_direction
+from georiva.ingestion.utils import (
+    RunningStats,
+    _affine_conversion,
+    apply_unit_conversion,
+    apply_unit_conversion_chain,
+    compute_stats,
+    ensure_utc,
+)
+
+TS = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+
+class _StubPlugin:
+    """Serves fixed full-grid arrays by source name and records every window read."""
+
+    def __init__(self, grids: dict):
+        self.grids = grids
+        self.windows = []
+
+    def get_metadata_for_variable(self, *, file_path, variable_name, timestamp=None, **kwargs):
+        height, width = self.grids[variable_name].shape
+        return {"width": width, "height": height, "bounds": (0, 0, 1, 1), "crs": "EPSG:4326"}
+
+    def extract_variable(self, *, file_path, variable_name, timestamp=None, window=None, **kwargs):
+        self.windows.append(window)
+        data = self.grids[variable_name]
+        if window is not None:
+            x, y, w, h = window
+            data = data[y:y + h, x:x + w]
+        return SimpleNamespace(data=data.copy())
+
+
+def _block(block_type, source_name):
+    return SimpleNamespace(block_type=block_type, value={"source_name": source_name})
+
+
+def _vector_variable(transform_type):
+    return SimpleNamespace(
+        pk=1,
+        slug="wind",
+        sources=[_block("u_component", "u10"), _block("v_component", "v10")],
+        transform_type=transform_type,
+        TransformType=Variable.TransformType,
+        source_unit=None,
+        unit=None,
+    )
+
+
+class TiledVectorTransformTests(SimpleTestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.u = rng.normal(size=(10, 13)).astype(np.float32)
+        self.v = rng.normal(size=(10, 13)).astype(np.float32)
+        self.plugin = _StubPlugin({"u10": self.u, "v10": self.v})
+        self.extractor = VariableExtractor(self.plugin)
+        self.extractor.tile_size = 4
+
+    def test_tiled_magnitude_matches_whole_grid(self):
+        variable = _vector_variable(Variable.TransformType.VECTOR_MAGNITUDE)
+
+        out = self.extractor.extract(variable, "file.grib", TS)
+
+        np.testing.assert_allclose(out, np.hypot(self.u, self.v), rtol=1e-6)
+        self.assertEqual(out.dtype, np.float32)
+        # 4 × 3 tiles, one read per component per tile
+        self.assertEqual(len(self.plugin.windows), 24)
+
+    def test_tiled_direction_offsets_tiles_into_the_window(self):
+        variable = _vector_variable(Variable.TransformType.VECTOR_DIRECTION)
+
+        out = self.extractor.extract(variable, "file.grib", TS, window=(2, 1, 9, 8))
+
+        u, v = self.u[1:9, 2:11], self.v[1:9, 2:11]
+        expected = np.mod(np.degrees(np.arctan2(u, v)) + 180.0, 360.0)
+        np.testing.assert_allclose(out, expected, rtol=1e-5, atol=1e-4)
+        # Tiles are cut on the source grid's tile_size multiples
+        self.assertEqual(self.plugin.windows[0], (2, 1, 2, 3))
+        self.assertEqual(self.plugin.windows[2], (4, 1, 4, 3))
+
+    @override_settings(GEORIVA_CHUNK_READ_CONCURRENCY=4)
+    def test_concurrent_tiles_fill_the_whole_grid(self):
+        variable = _vector_variable(Variable.TransformType.VECTOR_MAGNITUDE)
+
+        out = self.extractor.extract(variable, "file.grib", TS)
+
+        np.testing.assert_allclose(out, np.hypot(self.u, self.v), rtol=1e-6)
+        self.assertEqual(len(self.plugin.windows), 24)
+
+    def test_single_tile_extent_reads_each_source_once(self):
+        self.extractor.tile_size = 64
+        variable = _vector_variable(Variable.TransformType.VECTOR_MAGNITUDE)
+
+        self.extractor.extract(variable, "file.grib", TS)
+
+        self.assertEqual(self.plugin.windows, [None, None])
+
+
+class ExtractIntoBufferTests(SimpleTestCase):
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        self.u = rng.normal(size=(10, 13)).astype(np.float32)
+        self.v = rng.normal(size=(10, 13)).astype(np.float32)
+        self.extractor = VariableExtractor(_StubPlugin({"u10": self.u, "v10": self.v}))
+        self.extractor.tile_size = 4
+        self.grid = np.zeros((12, 15), dtype=np.float32)
+
+    def test_tiled_transform_writes_into_buffer_view(self):
+        variable = _vector_variable(Variable.TransformType.VECTOR_MAGNITUDE)
+        view = self.grid[1:11, 2:15]
+
+        out = self.extractor.extract(variable, "file.grib", TS, out=view)
+
+        self.assertIs(out, view)
+        np.testing.assert_allclose(self.grid[1:11, 2:15], np.hypot(self.u, self.v), rtol=1e-6)
+        self.assertEqual(self.grid[0].sum(), 0)
+
+    def test_passthrough_copied_into_buffer_view(self):
+        variable = _vector_variable(Variable.TransformType.PASSTHROUGH)
+        variable.sources = [_block("primary", "u10")]
+
+        self.extractor.extract(variable, "file.grib", TS, window=(0, 0, 4, 3), out=self.grid[:3, :4])
+
+        np.testing.assert_array_equal(self.grid[:3, :4], self.u[:3, :4])
+
+    def test_native_dtype_cast_straight_into_buffer(self):
+        counts = np.arange(12, dtype=np.int16).reshape(3, 4)
+        self.extractor.plugin.grids["t2m"] = counts
+        variable = _vector_variable(Variable.TransformType.PASSTHROUGH)
+        variable.sources = [_block("primary", "t2m")]
+        view = self.grid[:3, :4]
+
+        out = self.extractor.extract(variable, "file.grib", TS, out=view)
+
+        self.assertIs(out, view)
+        np.testing.assert_array_equal(self.grid[:3, :4], counts.astype(np.float32))
+
+
+class SourceMetadataCacheTests(SimpleTestCase):
+    def test_metadata_read_once_per_source_and_file(self):
+        plugin = _StubPlugin({"t2m": np.zeros((3, 4), dtype=np.float32)})
+        extractor = VariableExtractor(plugin)
+        variable = _vector_variable(Variable.TransformType.PASSTHROUGH)
+        variable.sources = [_block("primary", "t2m")]
+
+        with patch.object(
+                plugin, "get_metadata_for_variable", wraps=plugin.get_metadata_for_variable,
+        ) as get_metadata:
+            first = extractor.get_metadata(variable, "a.grib", TS)
+            extractor.get_metadata(variable, "a.grib", datetime(2024, 5, 2, tzinfo=timezone.utc))
+            extractor.get_metadata(variable, "b.grib", TS)
+
+        self.assertEqual((first["width"], first["height"]), (4, 3))
+        self.assertEqual(get_metadata.call_count, 2)
+
+
+class TransformPlanTests(SimpleTestCase):
+    def test_plan_is_resolved_once_per_variable(self):
+        extractor = VariableExtractor(_StubPlugin({}))
+        variable = _vector_variable(Variable.TransformType.VECTOR_MAGNITUDE)
+
+        plan = extractor.plan(variable)
+        variable.sources = []  # a second resolution would now raise
+
+        self.assertIs(extractor.plan(variable), plan)
+        self.assertEqual([read.variable_name for read in plan.inputs], ["u10", "v10"])
+
+    def test_unsaved_variable_is_not_cached(self):
+        extractor = VariableExtractor(_StubPlugin({}))
+        variable = _vector_variable(Variable.TransformType.VECTOR_DIRECTION)
+        variable.pk = None
+
+        extractor.plan(variable)
+
+        self.assertEqual(extractor._plans, {})
+
+
+class VectorDirectionKernelTests(SimpleTestCase):
+    def test_cardinal_directions_are_where_the_wind_blows_from(self):
+        # southerly, northerly, westerly, easterly, calm
+        u = np.array([0.0, 0.0, 1.0, -1.0, 0.0], dtype=np.float32)
+        v = np.array([1.0, -1.0, 0.0, 0.0, 0.0], dtype=np.float32)
+
+        out = _vector_direction(u, v)
+
+        np.testing.assert_allclose(out, [180.0, 0.0, 270.0, 90.0, 180.0])
+        self.assertEqual(out.dtype, np.float32)
+        self.assertTrue(((out >= 0.0) & (out < 360.0)).all())
+
+    def test_writes_into_a_strided_output_view(self):
+        u = np.array([[0.0, 1.0]], dtype=np.float32)
+        v = np.array([[1.0, 0.0]], dtype=np.float32)
+        grid = np.zeros((2, 4), dtype=np.float32)
+
+        out = _vector_direction(u, v, out=grid[1:, 1:3])
+
+        self.assertTrue(np.shares_memory(out, grid))
+        np.testing.assert_allclose(grid, [[0, 0, 0, 0], [0, 180, 270, 0]])
+
+
+class StreamedStatsTests(SimpleTestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.u = rng.normal(loc=5.0, size=(10, 13)).astype(np.float32)
+        self.v = rng.normal(loc=-3.0, size=(10, 13)).astype(np.float32)
+        self.u[2, 3] = np.nan
+        self.plugin = _StubPlugin({"u10": self.u, "v10": self.v})
+        self.extractor = VariableExtractor(self.plugin)
+        self.extractor.tile_size = 4
+
+    def test_vector_stats_match_whole_grid_reductions(self):
+        variable = _vector_variable(Variable.TransformType.VECTOR_MAGNITUDE)
+
+        stats = self.extractor.compute_stats(variable, "file.grib", TS)
+
+        speed = np.hypot(self.u, self.v)
+        self.assertAlmostEqual(stats["min"], float(np.nanmin(speed)), places=5)
+        self.assertAlmostEqual(stats["max"], float(np.nanmax(speed)), places=5)
+        self.assertAlmostEqual(stats["mean"], float(np.nanmean(speed)), places=5)
+        self.assertAlmostEqual(stats["std"], float(np.nanstd(speed)), places=5)
+        # every read is a single tile — the full grid is never requested
+        self.assertNotIn(None, self.plugin.windows)
+
+    def test_concurrent_tiles_give_the_same_stats(self):
+        variable = _vector_variable(Variable.TransformType.VECTOR_MAGNITUDE)
+        serial = self.extractor.compute_stats(variable, "file.grib", TS)
+
+        with override_settings(GEORIVA_CHUNK_READ_CONCURRENCY=4):
+            concurrent = self.extractor.compute_stats(variable, "file.grib", TS)
+
+        for key, value in serial.items():
+            self.assertAlmostEqual(concurrent[key], value, places=5)
+
+
+class RunningStatsTests(SimpleTestCase):
+    def test_blocks_with_distant_means_merge_exactly(self):
+        a = np.full((3, 3), 1e6, dtype=np.float32)
+        b = np.arange(6, dtype=np.float32).reshape(2, 3)
+        stats = RunningStats()
+
+        stats.update(a)
+        stats.update(b)
+
+        both = np.concatenate([a.ravel(), b.ravel()]).astype(np.float64)
+        result = stats.result()
+        self.assertAlmostEqual(result["mean"], both.mean(), places=6)
+        self.assertAlmostEqual(result["std"], both.std(), places=4)
+        self.assertEqual(result["min"], 0.0)
+        self.assertEqual(result["max"], 1e6)
+
+    def test_tiny_spread_around_large_mean_keeps_its_std(self):
+        data = np.random.default_rng(4).normal(1e6, 1e-3, size=(100, 100))
+        stats = RunningStats()
+
+        stats.update(data)
+
+        expected = float(data.std())
+        self.assertAlmostEqual(stats.result()["std"], expected, delta=expected * 1e-6)
+
+    def test_merged_accumulators_match_one_fed_every_block(self):
+        blocks = [
+            np.random.default_rng(seed).normal(seed * 50.0, 3.0, size=(5, 7)).astype(np.float32)
+            for seed in range(3)
+        ]
+        fed = RunningStats()
+        merged = RunningStats()
+        for block in blocks:
+            fed.update(block)
+            tile = RunningStats()
+            tile.update(block)
+            merged.merge(tile)
+        merged.merge(RunningStats())
+
+        for key, value in fed.result().items():
+            self.assertAlmostEqual(merged.result()[key], value, places=6)
+
+    def test_compute_stats_matches_nan_reductions(self):
+        data = np.random.default_rng(2).normal(280.0, 12.0, size=(64, 48)).astype(np.float32)
+        data[:10, :5] = np.nan
+
+        stats = compute_stats(data)
+
+        self.assertAlmostEqual(stats["min"], float(np.nanmin(data)), places=4)
+        self.assertAlmostEqual(stats["max"], float(np.nanmax(data)), places=4)
+        self.assertAlmostEqual(stats["mean"], float(np.nanmean(data, dtype=np.float64)), places=6)
+        self.assertAlmostEqual(stats["std"], float(np.nanstd(data, dtype=np.float64)), places=6)
+
+    def test_sampled_stats_keep_exact_extremes(self):
+        data = np.random.default_rng(3).normal(10.0, 2.0, size=(400, 300)).astype(np.float32)
+        data[123, 45] = 99.0
+
+        exact = compute_stats(data)
+        sampled = compute_stats(data, max_pixels=10_000)
+
+        self.assertEqual(sampled["max"], 99.0)
+        self.assertEqual(sampled["min"], exact["min"])
+        self.assertAlmostEqual(sampled["mean"], exact["mean"], delta=0.1)
+        self.assertAlmostEqual(sampled["std"], exact["std"], delta=0.1)
+
+    def test_all_nan_yields_empty_stats(self):
+        stats = RunningStats()
+        stats.update(np.full((2, 2), np.nan, dtype=np.float32))
+
+        self.assertEqual(stats.result(), {"min": None, "max": None, "mean": None, "std": None})
+
+
+def _unit(symbol):
+    return SimpleNamespace(symbol=symbol, pint_unit=ureg(symbol))
+
+
+class AffineUnitConversionTests(SimpleTestCase):
+    def setUp(self):
+        self.data = np.random.default_rng(4).uniform(200, 320, size=(30, 40)).astype(np.float32)
+
+    def _pint(self, source, output):
+        return ureg.Quantity(self.data, ureg(source)).to(ureg(output)).magnitude
+
+    def test_affine_pairs_match_pint(self):
+        for source, output in (("K", "degC"), ("Pa", "hPa"), ("m**2/s**2", "gpdam")):
+            with self.subTest(source=source, output=output):
+                converted = apply_unit_conversion(self.data, _unit(source), _unit(output))
+
+                self.assertEqual(converted.dtype, np.float32)
+                np.testing.assert_allclose(converted, self._pint(source, output), rtol=1e-6)
+
+    def test_converted_straight_into_out(self):
+        out = np.empty_like(self.data)
+
+        result = apply_unit_conversion(self.data, _unit("K"), _unit("degC"), out=out)
+
+        self.assertIs(result, out)
+        np.testing.assert_allclose(out, self.data - 273.15, rtol=1e-6)
+
+    def test_inplace_converts_float32_data_where_it_is(self):
+        expected = self.data - np.float32(273.15)
+
+        result = apply_unit_conversion(self.data, _unit("K"), _unit("degC"), inplace=True)
+
+        self.assertIs(result, self.data)
+        np.testing.assert_allclose(result, expected, rtol=1e-6)
+
+    def test_inplace_allocates_for_integer_data(self):
+        data = np.arange(12, dtype=np.int16).reshape(3, 4)
+
+        result = apply_unit_conversion(data, _unit("Pa"), _unit("hPa"), inplace=True)
+
+        self.assertIsNot(result, data)
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_allclose(result, data / 100, rtol=1e-6)
+        self.assertEqual(data.dtype, np.int16)
+
+    def test_affine_chain_applied_in_one_conversion(self):
+        expected = (self.data.astype(np.float64) - 273.15) * 1.8 + 32
+
+        with patch(
+                "georiva.ingestion.utils._apply_affine",
+                wraps=utils_module._apply_affine,
+        ) as apply_affine:
+            converted = apply_unit_conversion_chain(
+                self.data, [_unit("K"), _unit("degC"), _unit("degF")],
+            )
+
+        apply_affine.assert_called_once()
+        self.assertEqual(converted.dtype, np.float32)
+        np.testing.assert_allclose(converted, expected, rtol=1e-6)
+
+    def test_chain_through_non_affine_step_matches_pint(self):
+        data = np.array([[10.0, 20.0], [30.0, 40.0]], dtype=np.float32)
+        expected = ureg.Quantity(data, ureg("dBZ")).to(ureg("m**6/m**3")).magnitude
+
+        converted = apply_unit_conversion_chain(
+            data, [_unit("dBZ"), _unit("mm**6/m**3"), _unit("m**6/m**3")],
+        )
+
+        np.testing.assert_allclose(converted, expected, rtol=1e-5)
+
+    def test_scale_and_offset_fused_by_numexpr_when_available(self):
+        numexpr = SimpleNamespace(evaluate=lambda expr, local_dict, out: np.copyto(
+            out, local_dict["x"] * local_dict["scale"] + local_dict["offset"],
+        ))
+
+        with (
+            patch.object(utils_module, "numexpr", numexpr),
+            patch.object(utils_module, "NUMEXPR_MIN_BYTES", 0),
+        ):
+            converted = apply_unit_conversion(self.data, _unit("degF"), _unit("degC"))
+
+        np.testing.assert_allclose(converted, (self.data - 32) / 1.8, rtol=1e-5)
+
+    def test_non_affine_conversion_left_to_pint(self):
+        self.assertEqual(_affine_conversion("K", "degC"), (1.0, -273.15))
+        self.assertIsNone(_affine_conversion("dBZ", "mm**6/m**3"))
+
+
+class EnsureUtcTests(SimpleTestCase):
+    def test_every_input_type_lands_on_one_utc_datetime(self):
+        import pandas as pd
+        from datetime import timedelta
+
+        for value in (
+                datetime(2024, 5, 1),
+                datetime(2024, 5, 1, 3, tzinfo=timezone(timedelta(hours=3))),
+                "2024-05-01T00:00",
+                pd.Timestamp("2024-05-01"),
+                np.datetime64("2024-05-01T00:00"),
+        ):
+            result = ensure_utc(value)
+            self.assertIs(type(result), datetime)
+            self.assertIs(result.tzinfo, timezone.utc)
+            self.assertEqual(result, TS)
+
+    def test_none_passes_through(self):
+        self.assertIsNone(ensure_utc(None))
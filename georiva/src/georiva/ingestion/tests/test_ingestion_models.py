@@ -62,6 +62,119 @@ class FileIngestionItemLinkTests(TestCase):
         self.assertEqual(log.status, FileIngestion.Status.PENDING)
 
 
+class ItemHandlerCollectionReuseTests(TestCase):
+    """An existing Item comes back attached to the caller's Collection."""
+
+    def test_existing_item_shares_collection_instance(self):
+        collection, log = _setup()
+        collection = Collection.objects.select_related(
+            "catalog__organisation"
+        ).get(pk=collection.pk)
+        kwargs = dict(
+            collection=collection,
+            timestamp=pytz.utc.localize(datetime(2023, 7, 1, 6)),
+            reference_time=None,
+            source_file="incoming:wrf/file.nc",
+            ingestion_log=log,
+            bounds=[0.0, 0.0, 10.0, 10.0],
+            width=10,
+            height=10,
+            crs="EPSG:4326",
+        )
+        handler = ItemHandler()
+        handler.get_or_create(**kwargs)
+
+        item, created = handler.get_or_create(**kwargs)
+
+        self.assertFalse(created)
+        with self.assertNumQueries(0):
+            self.assertIs(item.collection, collection)
+            self.assertTrue(item.collection.catalog.organisation.slug)
+
+
+class ItemHandlerUpdateTests(TestCase):
+    """Re-ingesting onto an existing Item refreshes its whole grid."""
+
+    def test_new_grid_updates_resolution_and_crs(self):
+        collection, log = _setup()
+        kwargs = dict(
+            collection=collection,
+            timestamp=pytz.utc.localize(datetime(2023, 7, 1, 6)),
+            reference_time=None,
+            source_file="incoming:wrf/file.nc",
+            ingestion_log=log,
+            width=10,
+            height=10,
+            crs="EPSG:4326",
+        )
+        handler = ItemHandler()
+        handler.get_or_create(bounds=[0.0, 0.0, 10.0, 10.0], **kwargs)
+
+        item, created = handler.get_or_create(bounds=[0.0, 0.0, 5.0, 5.0], **kwargs)
+
+        self.assertFalse(created)
+        self.assertFalse(item.same_source_rerun)
+        item.refresh_from_db()
+        self.assertEqual(item.bounds, [0.0, 0.0, 5.0, 5.0])
+        self.assertEqual((item.resolution_x, item.resolution_y), (0.5, 0.5))
+
+    def test_same_source_and_grid_is_a_rerun(self):
+        collection, log = _setup()
+        kwargs = dict(
+            collection=collection,
+            timestamp=pytz.utc.localize(datetime(2023, 7, 1, 6)),
+            reference_time=None,
+            source_file="incoming:wrf/file.nc",
+            ingestion_log=log,
+            bounds=[0.0, 0.0, 10.0, 10.0],
+            width=10,
+            height=10,
+            crs="EPSG:4326",
+        )
+        handler = ItemHandler()
+        handler.get_or_create(**kwargs)
+
+        item, _ = handler.get_or_create(**kwargs)
+
+        self.assertTrue(item.same_source_rerun)
+
+
+class ItemHandlerDeferredCountTests(TestCase):
+    """Deferred item_count increments land in one UPDATE on flush."""
+
+    def test_increments_batched_until_flush(self):
+        collection, _ = _setup()
+        handler = ItemHandler()
+        handler.defer()
+
+        with self.assertNumQueries(0):
+            for _ in range(3):
+                handler.increment_collection_item_count(collection)
+
+        with self.assertNumQueries(1):
+            handler.flush()
+
+        collection.refresh_from_db()
+        self.assertEqual(collection.item_count, 3)
+
+        # Not deferring any more — back to one UPDATE per new Item
+        with self.assertNumQueries(1):
+            handler.increment_collection_item_count(collection)
+
+    def test_flush_can_keep_deferring(self):
+        collection, _ = _setup()
+        handler = ItemHandler()
+        handler.defer()
+        handler.increment_collection_item_count(collection)
+
+        handler.flush(keep_deferring=True)
+        with self.assertNumQueries(0):
+            handler.increment_collection_item_count(collection)
+
+        collection.refresh_from_db()
+        self.assertEqual(collection.item_count, 1)
+
+
 class FileIngestionJobLinkTests(TestCase):
     """
     Retries create a new FileIngestionJob per process_incoming_file
@@ -189,3 +302,130 @@ class FileIngestionSummaryFieldTests(TestCase):
         self.assertEqual(log.valid_time_start, t_start)
         self.assertEqual(log.valid_time_end, t_end)
         self.assertEqual(log.timestep_count, 31)
+
+
+class FileIngestionClaimTests(TestCase):
+    """claim() must lock exactly where register() + acquire() would."""
+
+    def test_claim_creates_and_locks_unknown_file(self):
+        pk = FileIngestion.claim("incoming", "claim/new.nc", "worker-a", file_size=42)
+
+        log = FileIngestion.objects.get(pk=pk)
+        self.assertEqual(log.status, FileIngestion.Status.PROCESSING)
+        self.assertEqual(log.locked_by, "worker-a")
+        self.assertEqual(log.retry_count, 1)
+        self.assertEqual(log.file_size, 42)
+
+    def test_claim_locks_pending_file(self):
+        log, _ = FileIngestion.register(bucket="incoming", file_path="claim/pending.nc")
+
+        self.assertEqual(FileIngestion.claim("incoming", "claim/pending.nc", "worker-a"), log.pk)
+
+        log.refresh_from_db()
+        self.assertEqual(log.status, FileIngestion.Status.PROCESSING)
+        self.assertEqual(log.retry_count, 1)
+
+    def test_claim_refuses_held_completed_and_exhausted_files(self):
+        FileIngestion.claim("incoming", "claim/held.nc", "worker-a")
+        FileIngestion.register(
+            bucket="incoming", file_path="claim/done.nc", status=FileIngestion.Status.COMPLETED,
+        )
+        FileIngestion.register(
+            bucket="incoming", file_path="claim/exhausted.nc",
+            status=FileIngestion.Status.FAILED, retry_count=FileIngestion.MAX_RETRIES,
+        )
+
+        self.assertIsNone(FileIngestion.claim("incoming", "claim/held.nc", "worker-b"))
+        self.assertIsNone(FileIngestion.claim("incoming", "claim/done.nc", "worker-b"))
+        self.assertIsNone(FileIngestion.claim("incoming", "claim/exhausted.nc", "worker-b"))
+        self.assertEqual(
+            FileIngestion.objects.get(file_path="claim/held.nc").locked_by, "worker-a",
+        )
+
+    def test_claim_reclaims_stale_lock(self):
+        from django.utils import timezone as dj_timezone
+
+        log, _ = FileIngestion.register(
+            bucket="incoming", file_path="claim/stale.nc",
+            status=FileIngestion.Status.PROCESSING, retry_count=1,
+            locked_at=dj_timezone.now() - FileIngestion.LOCK_TIMEOUT * 2, locked_by="dead",
+        )
+
+        self.assertEqual(FileIngestion.claim("incoming", "claim/stale.nc", "worker-b"), log.pk)
+
+        log.refresh_from_db()
+        self.assertEqual(log.locked_by, "worker-b")
+        self.assertEqual(log.retry_count, 2)
+
+
+class FileIngestionAcquireTests(TestCase):
+    """acquire() locks pending, failed and stale records in one UPDATE."""
+
+    def test_locks_pending_file_in_one_query(self):
+        log, _ = FileIngestion.register(bucket="incoming", file_path="acquire/pending.nc")
+
+        with self.assertNumQueries(1):
+            self.assertTrue(FileIngestion.acquire("incoming", "acquire/pending.nc", "worker-a"))
+
+        log.refresh_from_db()
+        self.assertEqual(log.status, FileIngestion.Status.PROCESSING)
+        self.assertEqual(log.locked_by, "worker-a")
+        self.assertEqual(log.retry_count, 1)
+
+    def test_second_worker_loses(self):
+        FileIngestion.register(bucket="incoming", file_path="acquire/held.nc")
+
+        self.assertTrue(FileIngestion.acquire("incoming", "acquire/held.nc", "worker-a"))
+        self.assertFalse(FileIngestion.acquire("incoming", "acquire/held.nc", "worker-b"))
+        self.assertEqual(
+            FileIngestion.objects.get(file_path="acquire/held.nc").locked_by, "worker-a",
+        )
+
+    def test_reclaims_stale_lock_in_one_query(self):
+        from django.utils import timezone as dj_timezone
+
+        log, _ = FileIngestion.register(
+            bucket="incoming", file_path="acquire/stale.nc",
+            status=FileIngestion.Status.PROCESSING, retry_count=1,
+            locked_at=dj_timezone.now() - FileIngestion.LOCK_TIMEOUT * 2, locked_by="dead",
+        )
+
+        with self.assertNumQueries(1):
+            self.assertTrue(FileIngestion.acquire("incoming", "acquire/stale.nc", "worker-b"))
+
+        log.refresh_from_db()
+        self.assertEqual(log.locked_by, "worker-b")
+        self.assertEqual(log.retry_count, 2)
+
+    def test_refuses_completed_and_exhausted_files(self):
+        FileIngestion.register(
+            bucket="incoming", file_path="acquire/done.nc", status=FileIngestion.Status.COMPLETED,
+        )
+        FileIngestion.register(
+            bucket="incoming", file_path="acquire/exhausted.nc",
+            status=FileIngestion.Status.FAILED, retry_count=FileIngestion.MAX_RETRIES,
+        )
+
+        self.assertFalse(FileIngestion.acquire("incoming", "acquire/done.nc", "worker-b"))
+        self.assertFalse(FileIngestion.acquire("incoming", "acquire/exhausted.nc", "worker-b"))
+
+
+class FileIngestionAcquireBatchTests(TestCase):
+    def test_locks_oldest_retryable_files_in_bucket(self):
+        for name in ("a", "b", "c"):
+            FileIngestion.register(bucket="incoming", file_path=f"batch/{name}.nc")
+        FileIngestion.register(bucket="sources", file_path="batch/other.nc")
+        FileIngestion.register(
+            bucket="incoming", file_path="batch/done.nc", status=FileIngestion.Status.COMPLETED,
+        )
+
+        batch = FileIngestion.acquire_batch("incoming", limit=2, worker_id="pool-1")
+
+        self.assertEqual(sorted(log.file_path for log in batch), ["batch/a.nc", "batch/b.nc"])
+        for log in batch:
+            self.assertEqual(log.status, FileIngestion.Status.PROCESSING)
+            self.assertEqual(log.locked_by, "pool-1")
+            self.assertEqual(log.retry_count, 1)
+
+        rest = FileIngestion.acquire_batch("incoming", limit=10, worker_id="pool-2")
+        self.assertEqual([log.file_path for log in rest], ["batch/c.nc"])
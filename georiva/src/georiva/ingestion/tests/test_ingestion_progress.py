@@ -1,15 +1,17 @@
+import threading
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytz
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase, override_settings
 from task_ferry.progress import Progress
 
 from georiva.core.models import Catalog, Collection
 from georiva.ingestion.handlers.ingestion_handler import IngestionHandler
 from georiva.ingestion.progress import PublishingProgress
-from georiva.ingestion.service import IngestionService
+from georiva.ingestion.service import IngestionService, _trim_heap
 from georiva.organisations.testing import make_organisation
 
 
@@ -44,7 +46,7 @@ class ProcessFileProgressTests(TestCase):
             catalog=catalog, name="Rainfall", slug="rainfall", is_active=True,
         )
 
-    def _run(self):
+    def _run(self, collections=None, timestamps_error=None):
         mock_progress = MagicMock(spec=Progress)
         loop_progress = MagicMock(spec=Progress)
         ts_slot = MagicMock(spec=Progress)
@@ -53,6 +55,8 @@ class ProcessFileProgressTests(TestCase):
 
         mock_plugin = MagicMock()
         mock_plugin.get_timestamps.return_value = [datetime(2024, 1, 15, tzinfo=pytz.utc)]
+        mock_plugin.get_timestamps.side_effect = timestamps_error
+        self.plugin = mock_plugin
 
         mock_item = MagicMock()
         mock_item.pk = "item-1"
@@ -62,6 +66,10 @@ class ProcessFileProgressTests(TestCase):
             patch("georiva.ingestion.service.storage") as mock_storage,
             patch("georiva.ingestion.service.IngestionHandler") as mock_handler_cls,
             patch.object(IngestionService, "_get_first_variable_name", return_value="temperature"),
+            (
+                patch.object(IngestionService, "_resolve_collections", return_value=collections)
+                if collections is not None else nullcontext()
+            ),
         ):
             mock_registry.get.return_value = mock_plugin
             mock_storage.assets = MagicMock()
@@ -78,6 +86,7 @@ class ProcessFileProgressTests(TestCase):
             ctx_mgr.__exit__ = MagicMock(return_value=False)
             mock_sfm.download_to_temp.return_value = ctx_mgr
             service._source_file_manager = mock_sfm
+            self.sfm = mock_sfm
 
             service.process_file(
                 "test-org/chirps/rainfall/2024/01/15/file.tif",
@@ -106,6 +115,28 @@ class ProcessFileProgressTests(TestCase):
             f"Expected timestamps checkpoint in: {states}",
         )
 
+    def test_timestamps_scanned_once_per_source_variable(self):
+        self._run(collections=[
+            MagicMock(slug="rainfall", active_variables=[MagicMock()]),
+            MagicMock(slug="rainfall-anomaly", active_variables=[MagicMock()]),
+        ])
+
+        self.plugin.get_timestamps.assert_called_once()
+
+    def test_failed_run_discards_early_archive_copy(self):
+        self._run(timestamps_error=OSError("truncated file"))
+
+        self.sfm.cleanup.assert_not_called()
+        self.sfm.discard_archive.assert_called_once_with(
+            self.sfm.start_archive.return_value.result.return_value,
+        )
+
+    def test_settled_archive_copy_not_discarded_again(self):
+        self._run()
+
+        self.sfm.cleanup.assert_called_once()
+        self.sfm.discard_archive.assert_not_called()
+
     def test_creates_child_for_timestamp_loop(self):
         mock_progress = self._run()
         mock_progress.create_child.assert_called()
@@ -122,6 +153,36 @@ class ProcessFileProgressTests(TestCase):
         )
 
 
+class PeriodicFlushTests(SimpleTestCase):
+    """Held-back extents and item counts are written every N timestamps."""
+
+    def _handler(self):
+        handler = IngestionHandler(MagicMock())
+        handler.item_handler = MagicMock()
+        handler.asset_handler = MagicMock()
+        return handler
+
+    @override_settings(GEORIVA_EXTENT_FLUSH_TIMESTAMPS=2)
+    def test_flushed_every_n_timestamps(self):
+        handler = self._handler()
+        extent = handler.asset_handler.materializer.extent_handler
+
+        handler._timestamp_done()
+        extent.flush.assert_not_called()
+        handler.item_handler.flush.assert_not_called()
+
+        handler._timestamp_done()
+        extent.flush.assert_called_once_with(keep_deferring=True)
+        handler.item_handler.flush.assert_called_once_with(keep_deferring=True)
+
+    @override_settings(GEORIVA_EXTENT_FLUSH_TIMESTAMPS=0)
+    def test_zero_flushes_only_on_close(self):
+        handler = self._handler()
+        for _ in range(50):
+            handler._timestamp_done()
+        handler.item_handler.flush.assert_not_called()
+
+
 # =============================================================================
 # IngestionHandler.process_timestamp() progress checkpoints
 # =============================================================================
@@ -145,6 +206,7 @@ class ProcessTimestampProgressTests(TestCase):
         handler.item_handler.get_or_create.return_value = (mock_item, True)
         handler.asset_handler = MagicMock()
         handler.asset_handler.process_variable.return_value = [MagicMock()]
+        handler.asset_handler.materializer.complete_uploads.side_effect = lambda assets: assets
         return handler
 
     def _make_collection(self, *var_slugs):
@@ -158,6 +220,7 @@ class ProcessTimestampProgressTests(TestCase):
             v.slug = slug
             vars_.append(v)
         mock_col.variables.all.return_value = vars_
+        mock_col.active_variables = vars_
         return mock_col, vars_
 
     def test_one_increment_per_variable_at_outcome(self):
@@ -208,3 +271,268 @@ class ProcessTimestampProgressTests(TestCase):
         state = mock_progress.increment.call_args.kwargs.get("state", "")
         self.assertIn("temperature", state)
         self.assertIn("band missing", state)
+
+
+@override_settings(GEORIVA_VARIABLE_CONCURRENCY=3)
+class ConcurrentVariableProcessingTests(ProcessTimestampProgressTests):
+    """The progress contract above must hold with variables run in threads too."""
+
+    def test_assets_and_failures_keep_collection_order(self):
+        handler = self._make_handler()
+        collection, variables = self._make_collection("a", "b", "c", "d")
+
+        def process_variable(*, variable, **kwargs):
+            if variable.slug == "b":
+                raise RuntimeError("boom")
+            return [variable.slug]
+
+        handler.asset_handler.process_variable.side_effect = process_variable
+
+        item, assets, _, failed = handler.process_timestamp(
+            collection=collection,
+            local_path=Path("/tmp/file.tif"),
+            timestamp=datetime(2024, 1, 15, tzinfo=pytz.utc),
+            source_file="sources:chirps/file.tif",
+        )
+
+        self.assertEqual(assets, ["a", "c", "d"])
+        self.assertEqual(failed, ["b"])
+
+    def test_worker_threads_shared_across_timestamps_until_closed(self):
+        handler = self._make_handler()
+        collection, _ = self._make_collection("a", "b", "c", "d")
+        handler.asset_handler.process_variable.side_effect = (
+            lambda *, variable, **kwargs: [threading.current_thread()]
+        )
+
+        with handler:
+            runs = [
+                handler.process_timestamp(
+                    collection=collection,
+                    local_path=Path("/tmp/file.tif"),
+                    timestamp=datetime(2024, 1, day, tzinfo=pytz.utc),
+                    source_file="sources:chirps/file.tif",
+                )[1]
+                for day in (15, 16)
+            ]
+            pool = handler._variable_pool
+
+        self.assertIsNotNone(pool)
+        self.assertIsNone(handler._variable_pool)
+        self.assertLessEqual(len(set(runs[0]) | set(runs[1])), pool._max_workers)
+
+    @override_settings(GEORIVA_VARIABLE_CONCURRENCY=0)
+    def test_zero_concurrency_uses_one_worker_per_cpu(self):
+        handler = self._make_handler()
+        collection, _ = self._make_collection("a", "b", "c", "d")
+
+        with (
+            patch("georiva.ingestion.handlers.ingestion_handler.os.cpu_count", return_value=2),
+            patch.object(handler, "_process_variables_concurrently", return_value=[[]] * 4) as fan_out,
+        ):
+            handler.process_timestamp(
+                collection=collection,
+                local_path=Path("/tmp/file.tif"),
+                timestamp=datetime(2024, 1, 15, tzinfo=pytz.utc),
+                source_file="sources:chirps/file.tif",
+            )
+
+        self.assertEqual(fan_out.call_args.args[2], 2)
+
+
+class UnchangedVariableReuseTests(TestCase):
+    """A same-source re-run keeps the COGs of variables whose signature matches."""
+
+    _make_handler = ProcessTimestampProgressTests._make_handler
+    _make_collection = ProcessTimestampProgressTests._make_collection
+
+    def _process(self, handler, collection, **kwargs):
+        return handler.process_timestamp(
+            collection=collection,
+            local_path=Path("/tmp/file.tif"),
+            timestamp=datetime(2024, 1, 15, tzinfo=pytz.utc),
+            source_file="sources:chirps/file.tif",
+            **kwargs,
+        )
+
+    def _rerun(
+            self, *, source_version="2024-01-16T00:00:00+00:00", visibility="public",
+            unit_symbol="mm", **kwargs,
+    ):
+        """Run once to record signatures, then re-run against the recorded assets."""
+        handler = self._make_handler()
+        handler.ctx.source_version = "2024-01-16T00:00:00+00:00"
+        collection, variables = self._make_collection("temperature", "rainfall")
+        for pk, variable in enumerate(variables):
+            variable.pk = pk
+            variable.unit.symbol = "mm"
+        item = handler.item_handler.get_or_create.return_value[0]
+        item.same_source_rerun = False
+        item.collection.visibility = "public"
+        self._process(handler, collection)
+
+        recorded = []
+        for call in handler.asset_handler.process_variable.call_args_list:
+            recorded.append(MagicMock(
+                variable_id=call.kwargs["variable"].pk,
+                extra_fields=call.kwargs["extra_fields"],
+            ))
+        item.assets.filter.return_value = recorded
+        item.same_source_rerun = True
+        item.collection.visibility = visibility
+        for variable in variables:
+            variable.unit.symbol = unit_symbol
+        handler.ctx.source_version = source_version
+        handler.asset_handler.process_variable.reset_mock()
+        handler.asset_handler.materializer.reuse_asset.side_effect = (
+            lambda asset, **kw: asset
+        )
+        return handler, self._process(handler, collection, **kwargs), recorded
+
+    def test_unchanged_variables_not_reprocessed(self):
+        handler, (_, assets, _, failed), recorded = self._rerun()
+
+        handler.asset_handler.process_variable.assert_not_called()
+        self.assertEqual(assets, recorded)
+        self.assertEqual(failed, [])
+
+    def test_new_source_version_reprocessed(self):
+        handler, _, _ = self._rerun(source_version="2024-01-17T00:00:00+00:00")
+
+        self.assertEqual(handler.asset_handler.process_variable.call_count, 2)
+        handler.asset_handler.materializer.reuse_asset.assert_not_called()
+
+    def test_visibility_change_reprocessed(self):
+        handler, _, _ = self._rerun(visibility="internal")
+
+        self.assertEqual(handler.asset_handler.process_variable.call_count, 2)
+        handler.asset_handler.materializer.reuse_asset.assert_not_called()
+
+    def test_unit_change_reprocessed(self):
+        handler, _, _ = self._rerun(unit_symbol="cm")
+
+        self.assertEqual(handler.asset_handler.process_variable.call_count, 2)
+        handler.asset_handler.materializer.reuse_asset.assert_not_called()
+
+    def test_forced_recompute_reprocessed(self):
+        handler, _, _ = self._rerun(force_recompute_stats=True)
+
+        self.assertEqual(handler.asset_handler.process_variable.call_count, 2)
+
+    def test_unknown_source_version_never_reused(self):
+        handler, _, _ = self._rerun(source_version="")
+
+        self.assertEqual(handler.asset_handler.process_variable.call_count, 2)
+        kwargs = handler.asset_handler.process_variable.call_args.kwargs
+        self.assertIsNone(kwargs["extra_fields"])
+
+
+class ClipFallbackTests(TestCase):
+    """A clip window that cannot be computed only falls back to small grids."""
+
+    _make_handler = ProcessTimestampProgressTests._make_handler
+    _make_collection = ProcessTimestampProgressTests._make_collection
+
+    def _process(self):
+        handler = self._make_handler()
+        handler.ctx.clipper.is_active = True
+        handler.ctx.clipper.compute_window.side_effect = ValueError("no intersection")
+        collection, _ = self._make_collection("temperature")
+
+        handler.process_timestamp(
+            collection=collection,
+            local_path=Path("/tmp/file.tif"),
+            timestamp=datetime(2024, 1, 15, tzinfo=pytz.utc),
+            source_file="sources:chirps/file.tif",
+        )
+        return handler
+
+    @override_settings(GEORIVA_CLIP_FALLBACK_MAX_PIXELS=1000 * 1000)
+    def test_small_grid_read_at_full_extent(self):
+        handler = self._process()
+
+        kwargs = handler.asset_handler.process_variable.call_args.kwargs
+        self.assertIsNone(kwargs["clip_window"])
+        self.assertEqual((kwargs["width"], kwargs["height"]), (720, 360))
+
+    @override_settings(GEORIVA_CLIP_FALLBACK_MAX_PIXELS=720 * 360 - 1)
+    def test_large_grid_refused(self):
+        with self.assertRaisesMessage(ValueError, "refusing full-extent read of 720x360"):
+            self._process()
+
+
+# =============================================================================
+# IngestionService._process_timestamps() fan-out
+# =============================================================================
+
+@override_settings(GEORIVA_TIMESTAMP_CONCURRENCY=3)
+class ConcurrentTimestampProcessingTests(TestCase):
+
+    def test_outcomes_keep_task_order_and_isolate_failures(self):
+        temperature, rainfall = MagicMock(slug="temperature"), MagicMock(slug="rainfall")
+        tasks = [
+            (collection, datetime(2024, 1, day, tzinfo=pytz.utc), f"{collection.slug}-{day}")
+            for collection in (temperature, rainfall)
+            for day in (1, 2)
+        ]
+        handler = MagicMock()
+
+        def process_timestamp(*, collection, timestamp, progress, **kwargs):
+            if collection is temperature and timestamp.day == 2:
+                raise RuntimeError("corrupt message")
+            return (collection.slug, [], {}, [progress])
+
+        handler.process_timestamp.side_effect = process_timestamp
+
+        outcomes = IngestionService()._process_timestamps(
+            handler,
+            tasks=tasks,
+            local_path=Path("/tmp/file.grib"),
+            source_file="sources:ecmwf/file.grib",
+        )
+
+        self.assertEqual(
+            [o[0] for o in outcomes if not isinstance(o, Exception)],
+            ["temperature", "rainfall", "rainfall"],
+        )
+        self.assertIsInstance(outcomes[1], RuntimeError)
+        # Each timestamp reports into its own progress slot.
+        self.assertEqual(outcomes[3][3], ["rainfall-2"])
+
+    @override_settings(GEORIVA_TIMESTAMP_CONCURRENCY=0)
+    def test_zero_concurrency_means_one_worker_per_cpu(self):
+        with patch("georiva.ingestion.service.os.cpu_count", return_value=6):
+            self.assertEqual(IngestionService._timestamp_workers(), 6)
+
+
+# =============================================================================
+# Heap trim after each file
+# =============================================================================
+
+class TrimHeapTests(SimpleTestCase):
+
+    def test_malloc_trim_called_on_linux(self):
+        with (
+            patch("georiva.ingestion.service.sys.platform", "linux"),
+            patch("georiva.ingestion.service.ctypes.CDLL") as cdll,
+        ):
+            _trim_heap()
+
+        cdll.assert_called_once_with("libc.so.6")
+        cdll.return_value.malloc_trim.assert_called_once_with(0)
+
+    def test_skipped_elsewhere(self):
+        with (
+            patch("georiva.ingestion.service.sys.platform", "darwin"),
+            patch("georiva.ingestion.service.ctypes.CDLL") as cdll,
+        ):
+            _trim_heap()
+
+        cdll.assert_not_called()
+
+    def test_missing_libc_ignored(self):
+        with (
+            patch("georiva.ingestion.service.sys.platform", "linux"),
+            patch("georiva.ingestion.service.ctypes.CDLL", side_effect=OSError),
+        ):
+            _trim_heap()
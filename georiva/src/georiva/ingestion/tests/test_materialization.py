@@ -5,10 +5,12 @@ demand by Titiler (ADR 0021), so no PNG is written or recorded here.
 
 Mirrors processing/tests/test_engine.py: mock the writer, assert on records.
 """
+from concurrent.futures import Future
 from datetime import datetime, timezone
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import numpy as np
+from django.db.models.signals import post_save
 from django.test import TestCase
 
 from georiva.core.models import Asset, Catalog, Collection, Item, Unit, Variable
@@ -29,8 +31,8 @@ class _StubClipper:
     is_active = True
     apply_mask = True
 
-    def apply_geometry_mask(self, data, bounds, nodata=np.nan):
-        out = data.copy()
+    def apply_geometry_mask(self, data, bounds, nodata=np.nan, copy=True):
+        out = data.copy() if copy else data
         out[:, : out.shape[1] // 2] = nodata
         return out
 
@@ -111,6 +113,17 @@ class MaterializeVariableTests(MaterializerFixture):
         self.assertEqual(sidecar["timestamp"], self.ts.isoformat())
         self.assertIn("stats", sidecar)
 
+    def test_asset_paths_partitioned_by_date_and_named_by_time(self):
+        self.item.reference_time = datetime(2024, 4, 30, 12, tzinfo=timezone.utc)
+        self._materialize(timestamp=self.ts.replace(hour=6))
+
+        cog_path = self.writer.write_cog.call_args[0][1]
+        sidecar_path = self.writer.write_metadata.call_args[0][1]
+        self.assertTrue(cog_path.endswith(
+            "/cat/col/precip/2024/05/01/precip_060000__ref20240430T120000.tif"
+        ))
+        self.assertEqual(sidecar_path, cog_path[:-len(".tif")] + ".json")
+
     def test_expands_collection_extent(self):
         self.assertIsNone(self.collection.bounds)
         self._materialize()
@@ -119,6 +132,44 @@ class MaterializeVariableTests(MaterializerFixture):
         self.assertEqual(self.collection.time_start, self.ts)
         self.assertEqual(self.collection.time_end, self.ts)
 
+    def test_stale_instance_never_narrows_stored_extent(self):
+        earlier = datetime(2024, 4, 1, tzinfo=timezone.utc)
+        self._materialize()
+        # Another worker widens the extent behind this instance's back
+        Collection.objects.filter(pk=self.collection.pk).update(
+            time_start=earlier, bounds=[0, -5, 20, 5],
+        )
+
+        self._materialize(bounds=[10, -10, 20, 5])
+
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.time_start, earlier)
+        self.assertEqual(self.collection.bounds, [0, -10, 20, 5])
+
+    def test_deferred_extent_written_once_on_flush(self):
+        extent = self.materializer.extent_handler
+        later = datetime(2024, 5, 2, tzinfo=timezone.utc)
+        extent.defer()
+
+        with self.assertNumQueries(0):
+            extent.expand(self.collection, self.ts, [10, -5, 20, 5])
+            extent.expand(self.collection, later, [5, -5, 20, 5])
+        with self.assertNumQueries(1):
+            extent.flush()
+
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.time_start, self.ts)
+        self.assertEqual(self.collection.time_end, later)
+        self.assertEqual(self.collection.bounds, [5, -5, 20, 5])
+
+    def test_internal_collection_cog_skips_overviews(self):
+        self._materialize()
+        self.assertTrue(self.writer.write_cog.call_args.kwargs["overviews"])
+
+        self.collection.visibility = Collection.Visibility.INTERNAL
+        self._materialize()
+        self.assertFalse(self.writer.write_cog.call_args.kwargs["overviews"])
+
     def test_normalizes_0_360_bounds(self):
         self._materialize(bounds=[190, -5, 200, 5])
         self.collection.refresh_from_db()
@@ -137,12 +188,42 @@ class MaterializeVariableTests(MaterializerFixture):
         written = self.writer.write_cog.call_args[0][0]
         self.assertTrue(np.isnan(written[:, :5]).all())
         self.assertTrue((written[:, 5:] == 42.0).all())
+        # The caller's array is left untouched by default.
+        self.assertFalse(np.isnan(self.data).any())
+
+    def test_quantized_variable_written_as_int16_with_scale(self):
+        self.variable.quantize = True
+        self._materialize(clipper=_StubClipper())
+
+        written = self.writer.write_cog.call_args[0][0]
+        encoding = self.writer.write_cog.call_args.kwargs
+        self.assertEqual(written.dtype, np.int16)
+        self.assertTrue((written[:, :5] == encoding["nodata"]).all())
+        decoded = written[:, 5:] * encoding["scale"] + encoding["offset"]
+        np.testing.assert_allclose(decoded, 42.0, atol=encoding["scale"])
+        cog = self.item.assets.get(format=Asset.Format.COG)
+        # Stats come from the float values, not the stored integers
+        self.assertEqual(cog.stats_min, 42.0)
+        self.assertEqual(cog.extra_fields["scale"], encoding["scale"])
+
+    def test_geometry_mask_written_in_place_for_owned_data(self):
+        self._materialize(clipper=_StubClipper(), owns_data=True)
+
+        written = self.writer.write_cog.call_args[0][0]
+        self.assertIs(written, self.data)
+        self.assertTrue(np.isnan(self.data[:, :5]).all())
 
     def test_sidecar_failure_is_nonfatal_and_cog_survives(self):
         self.writer.write_metadata.side_effect = RuntimeError("bucket down")
         assets = self._materialize()
         self.assertEqual([a.format for a in assets], [Asset.Format.COG])
 
+    def test_failed_cog_leaves_no_sidecar(self):
+        self.writer.write_cog.side_effect = RuntimeError("bucket down")
+        with self.assertRaises(RuntimeError):
+            self._materialize()
+        self.writer.write_metadata.assert_not_called()
+
 
 class ClipArrayTests(MaterializerFixture):
     def test_clip_array_crops_to_window(self):
@@ -167,3 +248,260 @@ class ClipArrayTests(MaterializerFixture):
         )
         self.assertEqual(data.shape, (10, 10))
         self.assertEqual(list(bounds), [10, -5, 20, 5])
+
+
+class DeferredSaveTests(MaterializerFixture):
+    def setUp(self):
+        super().setUp()
+        self.wind = Variable.objects.create(
+            collection=self.collection, slug="wind", name="Wind",
+            unit=self.unit, value_min=0, value_max=50,
+        )
+
+    def test_deferred_rows_saved_in_one_batch(self):
+        pending = (
+                self._materialize(defer_save=True)
+                + self._materialize(variable=self.wind, defer_save=True)
+        )
+        self.assertTrue(all(a.pk is None for a in pending))
+        self.assertFalse(self.item.assets.exists())
+
+        with patch.object(
+                Asset.objects, "bulk_create", wraps=Asset.objects.bulk_create,
+        ) as bulk_create:
+            self.materializer.save_assets(pending)
+
+        bulk_create.assert_called_once()
+
+        self.assertTrue(all(a.pk is not None for a in pending))
+        self.assertEqual(self.item.assets.count(), 2)
+
+    def test_deferred_metadata_written_once_per_item(self):
+        pending = (
+                self._materialize(defer_save=True)
+                + self._materialize(variable=self.wind, defer_save=True)
+        )
+        self.writer.write_metadata.assert_not_called()
+
+        self.materializer.save_assets(pending)
+
+        self.writer.write_metadata.assert_called_once()
+        metadata, path = self.writer.write_metadata.call_args[0]
+        self.assertEqual(
+            path, f"{self.catalog.organisation.slug}/cat/col/2024/05/01/item_000000.json",
+        )
+        self.assertEqual(metadata["item"], self.item.pk)
+        self.assertEqual(set(metadata["variables"]), {"precip", "wind"})
+        self.assertEqual(metadata["variables"]["wind"]["stats"]["max"], 42.0)
+
+    def test_item_metadata_leaves_out_unsaved_variables(self):
+        self._materialize(variable=self.wind, defer_save=True)
+
+        self.materializer.save_assets(self._materialize(defer_save=True))
+
+        metadata = self.writer.write_metadata.call_args[0][0]
+        self.assertEqual(set(metadata["variables"]), {"precip"})
+
+    def test_per_variable_sidecars_when_catalog_opts_in(self):
+        self.catalog.emit_per_variable_metadata = True
+        self.catalog.save()
+
+        self.materializer.save_assets(
+            self._materialize(defer_save=True)
+            + self._materialize(variable=self.wind, defer_save=True)
+        )
+
+        paths = [c.args[1] for c in self.writer.write_metadata.call_args_list]
+        self.assertEqual(len(paths), 2)
+        self.assertTrue(all(path.endswith("_000000.json") for path in paths))
+        self.assertFalse(any(path.endswith("item_000000.json") for path in paths))
+
+    def test_upsert_refreshes_existing_row_and_keeps_checksum(self):
+        self._materialize(checksum="abc123")
+        self.data[:] = 7.0
+
+        self.materializer.save_assets(self._materialize(defer_save=True))
+
+        cog = self.item.assets.get(format=Asset.Format.COG)
+        self.assertEqual(cog.stats_max, 7.0)
+        self.assertEqual(cog.checksum, "abc123")
+        self.assertEqual(self.item.assets.count(), 1)
+
+    def test_background_upload_completed_before_rows_saved(self):
+        self.materializer = AssetMaterializer(self.writer, background_uploads=True)
+        upload = Future()
+        self.writer.submit_cog.return_value = upload
+
+        pending = self._materialize(defer_save=True)
+        self.writer.write_cog.assert_not_called()
+        self.assertIsNone(pending[0].file_size)
+
+        upload.set_result("stored/precip.tif")
+        self.writer.stored_size.side_effect = {"stored/precip.tif": 2048}.get
+        self.materializer.save_assets(pending)
+
+        cog = self.item.assets.get(format=Asset.Format.COG)
+        self.assertEqual(cog.href, "stored/precip.tif")
+        self.assertEqual(cog.file_size, 2048)
+        self.writer.bucket.size.assert_not_called()
+
+    def test_background_upload_sidecar_written_once_stored(self):
+        self.catalog.emit_per_variable_metadata = True
+        self.catalog.save()
+        self.materializer = AssetMaterializer(self.writer, background_uploads=True)
+        upload = Future()
+        self.writer.submit_cog.return_value = upload
+
+        pending = self._materialize(defer_save=True)
+        self.writer.write_metadata.assert_not_called()
+
+        upload.set_result("stored/precip.tif")
+        self.materializer.save_assets(pending)
+        self.writer.write_metadata.assert_called_once()
+
+    def test_extent_widened_only_once_background_upload_stored(self):
+        self.materializer = AssetMaterializer(self.writer, background_uploads=True)
+        upload = Future()
+        self.writer.submit_cog.return_value = upload
+
+        pending = self._materialize(defer_save=True)
+        self.collection.refresh_from_db()
+        self.assertIsNone(self.collection.bounds)
+
+        upload.set_result("stored/precip.tif")
+        self.materializer.save_assets(pending)
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.bounds, [10, -5, 20, 5])
+
+    def test_background_upload_discarded_when_recording_fails(self):
+        self.materializer = AssetMaterializer(self.writer, background_uploads=True)
+        upload = Future()
+        self.writer.submit_cog.return_value = upload
+
+        with patch.object(self.materializer, "_record_cog", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                self._materialize(defer_save=True)
+        self.assertEqual(self.materializer._pending_uploads, {})
+
+        upload.set_result("stored/precip.tif")
+        self.writer.bucket.delete.assert_called_once_with("stored/precip.tif")
+        self.collection.refresh_from_db()
+        self.assertIsNone(self.collection.bounds)
+
+    def test_file_size_taken_from_writer_without_asking_storage(self):
+        self.writer.stored_size.side_effect = lambda path: 1024
+
+        self._materialize()
+
+        cog = self.item.assets.get(format=Asset.Format.COG)
+        self.assertEqual(cog.file_size, 1024)
+        self.writer.bucket.size.assert_not_called()
+
+    def test_file_size_asked_of_storage_when_writer_does_not_know(self):
+        self.writer.stored_size.return_value = None
+        self.writer.bucket.size.return_value = 4096
+
+        self._materialize()
+
+        cog = self.item.assets.get(format=Asset.Format.COG)
+        self.assertEqual(cog.file_size, 4096)
+
+    def test_failed_background_upload_raises_on_completion(self):
+        self.materializer = AssetMaterializer(self.writer, background_uploads=True)
+        upload = Future()
+        upload.set_exception(OSError("bucket unreachable"))
+        self.writer.submit_cog.return_value = upload
+
+        pending = self._materialize(defer_save=True)
+
+        with self.assertRaises(OSError):
+            self.materializer.complete_uploads(pending)
+
+    def test_post_save_tells_inserted_rows_from_updated_ones(self):
+        receiver = MagicMock()
+        post_save.connect(receiver, sender=Asset, weak=False)
+        self.addCleanup(post_save.disconnect, receiver, sender=Asset)
+
+        self.materializer.save_assets(self._materialize(defer_save=True))
+        self.assertTrue(receiver.call_args.kwargs["created"])
+
+        self.materializer.save_assets(self._materialize(defer_save=True))
+        self.assertFalse(receiver.call_args.kwargs["created"])
+
+
+class ReuseAssetTests(MaterializerFixture):
+    def setUp(self):
+        super().setUp()
+        self._materialize(extra_fields={"source_sig": "sig-1"})
+        self.writer.reset_mock()
+        self.kept = self.item.assets.get(format=Asset.Format.COG)
+
+    def _reuse(self):
+        return self.materializer.reuse_asset(
+            self.kept, item=self.item, variable=self.variable,
+            bounds=[10, -5, 20, 5], crs="EPSG:4326", timestamp=self.ts,
+        )
+
+    def test_extra_fields_recorded_on_cog(self):
+        self.assertEqual(self.kept.extra_fields["source_sig"], "sig-1")
+
+    def test_reused_row_not_rewritten_but_kept_in_item_metadata(self):
+        modified = self.kept.modified
+
+        with patch.object(Asset.objects, "bulk_create") as bulk_create:
+            self.materializer.save_assets([self._reuse()])
+
+        bulk_create.assert_not_called()
+        self.writer.write_cog.assert_not_called()
+        self.kept.refresh_from_db()
+        self.assertEqual(self.kept.modified, modified)
+        metadata = self.writer.write_metadata.call_args[0][0]
+        self.assertEqual(metadata["variables"]["precip"]["stats"]["max"], 42.0)
+
+
+class MaterializeBlocksTests(MaterializerFixture):
+    def setUp(self):
+        super().setUp()
+        self.streamed = []
+
+        def write_cog_blocks(blocks, path, bounds, **kwargs):
+            self.streamed.extend(blocks)
+            return path
+
+        self.writer.write_cog_blocks.side_effect = write_cog_blocks
+
+    def _blocks(self):
+        yield (0, 0, 10, 5), np.full((5, 10), 1.0, dtype="float32")
+        yield (0, 5, 10, 5), np.full((5, 10), 3.0, dtype="float32")
+
+    def _materialize_blocks(self, **kwargs):
+        return self.materializer.materialize_blocks(
+            item=self.item, variable=self.variable, blocks=self._blocks(),
+            width=10, height=10, bounds=[10, -5, 20, 5], crs="EPSG:4326",
+            timestamp=self.ts, **kwargs,
+        )
+
+    def test_streamed_blocks_written_and_stats_recorded(self):
+        self._materialize_blocks()
+
+        self.assertEqual([window for window, _ in self.streamed], [(0, 0, 10, 5), (0, 5, 10, 5)])
+        self.writer.write_cog.assert_not_called()
+        cog = self.item.assets.get(format=Asset.Format.COG)
+        self.assertEqual((cog.stats_min, cog.stats_max, cog.stats_mean), (1.0, 3.0, 2.0))
+        sidecar = self.writer.write_metadata.call_args[0][0]
+        self.assertEqual(sidecar["stats"]["mean"], 2.0)
+
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.bounds, [10, -5, 20, 5])
+
+    def test_each_block_masked(self):
+        clipper = MagicMock(is_active=True)
+        clipper.apply_geometry_mask_block.side_effect = (
+            lambda block, *args, **kwargs: np.full_like(block, np.nan)
+        )
+
+        self._materialize_blocks(clipper=clipper)
+
+        self.assertEqual(clipper.apply_geometry_mask_block.call_count, 2)
+        cog = self.item.assets.get(format=Asset.Format.COG)
+        self.assertIsNone(cog.stats_min)
@@ -0,0 +1,140 @@
+"""
+Retry schedule tests — failed files go on a Redis sorted set when the
+failure commits, drain_retry_queue queues the ones that are due and still
+retryable, and the sweep leaves scheduled files to it.
+"""
+import time
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from georiva.ingestion import retry_queue
+from georiva.ingestion.models import FileIngestion
+
+
+class RetryQueueTestCase(TestCase):
+    def setUp(self):
+        from django_redis import get_redis_connection
+
+        self.redis = get_redis_connection("default")
+        self.redis.delete(retry_queue.RETRY_QUEUE_KEY)
+        self.addCleanup(self.redis.delete, retry_queue.RETRY_QUEUE_KEY)
+
+
+class ScheduleTests(RetryQueueTestCase):
+    def test_only_due_files_are_popped_once(self):
+        retry_queue.schedule_retry("incoming", "org/cat/due.nc", delay=-1)
+        retry_queue.schedule_retry("incoming", "org/cat/later.nc", delay=3600)
+
+        self.assertEqual(retry_queue.pop_due(), [("incoming", "org/cat/due.nc")])
+        self.assertEqual(retry_queue.pop_due(), [])
+        self.assertEqual(
+            retry_queue.scheduled([("incoming", "org/cat/later.nc"), ("incoming", "org/cat/due.nc")]),
+            {("incoming", "org/cat/later.nc")},
+        )
+
+    def test_failure_scheduled_when_it_commits(self):
+        FileIngestion.register(bucket="incoming", file_path="org/cat/rain.nc")
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            FileIngestion.mark_failed("incoming", "org/cat/rain.nc", "boom")
+            self.assertEqual(retry_queue.scheduled([("incoming", "org/cat/rain.nc")]), set())
+
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertEqual(
+            retry_queue.scheduled([("incoming", "org/cat/rain.nc")]), {("incoming", "org/cat/rain.nc")},
+        )
+
+    @override_settings(GEORIVA_INGESTION_RETRY_DELAY=300)
+    def test_delay_doubles_with_each_attempt(self):
+        for attempt in (1, 2):
+            retry_queue.schedule_retry("incoming", f"org/cat/{attempt}.nc", attempt=attempt)
+
+        delays = [
+            self.redis.zscore(retry_queue.RETRY_QUEUE_KEY, f"incoming|org/cat/{attempt}.nc") - time.time()
+            for attempt in (1, 2)
+        ]
+        self.assertAlmostEqual(delays[0], 300, delta=5)
+        self.assertAlmostEqual(delays[1], 600, delta=5)
+
+    def test_long_overdue_retries_not_reported_scheduled(self):
+        retry_queue.schedule_retry("incoming", "org/cat/stuck.nc", delay=-retry_queue.OVERDUE_AFTER - 60)
+        retry_queue.schedule_retry("incoming", "org/cat/due.nc", delay=-1)
+
+        self.assertEqual(
+            retry_queue.scheduled([("incoming", "org/cat/stuck.nc"), ("incoming", "org/cat/due.nc")]),
+            {("incoming", "org/cat/due.nc")},
+        )
+
+    def test_exhausted_file_not_scheduled(self):
+        FileIngestion.register(
+            bucket="incoming", file_path="org/cat/rain.nc", retry_count=FileIngestion.MAX_RETRIES,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FileIngestion.mark_failed("incoming", "org/cat/rain.nc", "boom")
+
+        self.assertEqual(retry_queue.scheduled([("incoming", "org/cat/rain.nc")]), set())
+
+    def test_unknown_file_not_scheduled(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            FileIngestion.mark_failed("incoming", "org/cat/missing.nc", "boom")
+
+        self.assertEqual(callbacks, [])
+
+
+class DrainRetryQueueTests(RetryQueueTestCase):
+    def test_due_retryable_files_queued_in_one_group(self):
+        from georiva.ingestion.tasks import drain_retry_queue
+
+        for name, retries in (("a", 1), ("b", 2), ("exhausted", FileIngestion.MAX_RETRIES)):
+            FileIngestion.register(
+                bucket="incoming", file_path=f"org/cat/{name}.nc",
+                status=FileIngestion.Status.FAILED, retry_count=retries,
+            )
+            retry_queue.schedule_retry("incoming", f"org/cat/{name}.nc", delay=-1)
+        FileIngestion.register(bucket="incoming", file_path="org/cat/done.nc", status=FileIngestion.Status.COMPLETED)
+        retry_queue.schedule_retry("incoming", "org/cat/done.nc", delay=-1)
+
+        with (
+            patch("georiva.ingestion.tasks.process_incoming_file") as mock_task,
+            patch("georiva.ingestion.tasks.group") as mock_group,
+        ):
+            queued = drain_retry_queue()
+
+        self.assertEqual(queued, 2)
+        mock_group.assert_called_once()
+        self.assertEqual(
+            sorted(c.kwargs["file_path"] for c in mock_task.s.call_args_list),
+            ["org/cat/a.nc", "org/cat/b.nc"],
+        )
+        self.assertEqual(retry_queue.pop_due(), [])
+
+    def test_sweep_leaves_scheduled_failures_to_the_drain(self):
+        from georiva.ingestion.tasks import _sweep_dispatch
+
+        for name in ("scheduled", "unscheduled"):
+            FileIngestion.register(
+                bucket="incoming", file_path=f"org/cat/{name}.nc",
+                status=FileIngestion.Status.FAILED, retry_count=1,
+            )
+        retry_queue.schedule_retry("incoming", "org/cat/scheduled.nc", delay=3600)
+        dispatched = []
+
+        with patch("georiva.ingestion.unprocessed.iter_unprocessed", return_value=iter(())):
+            _sweep_dispatch(lambda **kwargs: dispatched.append(kwargs["file_path"]))
+
+        self.assertEqual(dispatched, ["org/cat/unscheduled.nc"])
+
+    def test_retryable_rows_carry_only_an_error_snippet(self):
+        FileIngestion.register(
+            bucket="incoming", file_path="org/cat/rain.nc",
+            status=FileIngestion.Status.FAILED, retry_count=1,
+        )
+        FileIngestion.objects.filter(file_path="org/cat/rain.nc").update(error="x" * 2000)
+
+        (log,) = FileIngestion.get_retryable()
+
+        self.assertIn("error", log.get_deferred_fields())
+        self.assertEqual(log.error_snippet, "x" * 100)
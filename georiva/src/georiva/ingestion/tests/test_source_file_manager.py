@@ -0,0 +1,78 @@
+"""
+SourceFileManager download tests — small source files land on the
+memory-backed temp dir, everything else on the OS temp dir; the archive
+copy runs in the background and is dropped when the source file is kept.
+"""
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, override_settings
+
+from georiva.ingestion.handlers.source_file_manager import SourceFileManager
+
+
+class DownloadTempRootTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.ram_dir = tmp.name
+        self.origin = MagicMock()
+        self.origin.download.side_effect = lambda path, local: Path(local).write_bytes(b"x")
+
+    def _download_dir(self, size, **overrides):
+        self.origin.size.return_value = size
+        config = {"GEORIVA_RAM_TEMP_DIR": self.ram_dir, "GEORIVA_RAM_TEMP_MAX_BYTES": 1024}
+        config.update(overrides)
+        with override_settings(**config):
+            with SourceFileManager().download_to_temp(self.origin, "gfs/file.grib2") as local:
+                self.assertEqual(local.read_bytes(), b"x")
+                return local.parent.parent
+
+    def test_small_file_downloaded_to_ram_dir(self):
+        self.assertEqual(str(self._download_dir(512)), self.ram_dir)
+
+    def test_large_file_downloaded_to_disk(self):
+        self.assertNotEqual(str(self._download_dir(4096)), self.ram_dir)
+
+    def test_disabled_or_size_unknown_uses_disk(self):
+        self.assertNotEqual(
+            str(self._download_dir(512, GEORIVA_RAM_TEMP_MAX_BYTES=0)), self.ram_dir
+        )
+        self.origin.size.side_effect = OSError("no such key")
+        self.assertNotEqual(str(self._download_dir(512)), self.ram_dir)
+
+
+class BackgroundArchiveTests(SimpleTestCase):
+    def setUp(self):
+        self.sfm = SourceFileManager()
+        self.origin = MagicMock(bucket_name="georiva-sources")
+        self.catalog = MagicMock(archive_source_files=True)
+        patcher = patch("georiva.ingestion.handlers.source_file_manager.storage")
+        self.storage = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.storage.archive_raw.return_value = "org/sources/cat/file.grib2"
+
+    def _cleanup(self, success=True, errors=()):
+        result = MagicMock(success=success, errors=list(errors), archive_path="")
+        archive = self.sfm.start_archive(self.origin, "org/cat/file.grib2", self.catalog)
+        self.sfm.cleanup(self.origin, "org/cat/file.grib2", self.catalog, result, archive=archive)
+        return result
+
+    def test_success_uses_early_copy_and_deletes_source(self):
+        result = self._cleanup()
+
+        self.assertEqual(result.archive_path, "org/sources/cat/file.grib2")
+        self.storage.archive_raw.assert_called_once_with(self.origin, "org/cat/file.grib2")
+        self.origin.delete.assert_called_once_with("org/cat/file.grib2")
+
+    def test_kept_source_discards_early_copy(self):
+        self._cleanup(errors=["Partial failure for temp @ 2024-01-01: variables failed: t2m"])
+
+        self.origin.delete.assert_not_called()
+        self.storage.archive.delete.assert_called_once_with("org/sources/cat/file.grib2")
+
+    def test_not_started_without_archive_flag(self):
+        self.catalog.archive_source_files = False
+
+        self.assertIsNone(self.sfm.start_archive(self.origin, "org/cat/file.grib2", self.catalog))
@@ -32,7 +32,7 @@ class SweepStagingTests(TestCase):
     def _run_with_bucket(self, keys):
         with patch("georiva.ingestion.tasks.storage") as mock_storage, \
                 patch("georiva.ingestion.tasks.process_staging_file") as mock_task:
-            mock_storage.bucket.return_value.list_files.return_value = [
+            mock_storage.bucket.return_value.iter_files.return_value = [
                 {"path": k} for k in keys
             ]
             from georiva.ingestion.tasks import sweep_staging
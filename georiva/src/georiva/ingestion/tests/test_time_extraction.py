@@ -104,3 +104,18 @@ class ContentFallbackTests(SimpleTestCase):
             result = extract_times("unrecognised.grib2", "YYYYMMDD", file_obj=BytesIO(b"fake"))
 
         self.assertIsInstance(result, dict)
+
+    def test_content_copied_whole_to_temp_file(self):
+        content = bytes(range(256)) * (3 * 4096 + 7)  # just over 3 MB
+        seen = {}
+
+        def get_for_file(path):
+            with open(path, "rb") as f:
+                seen["content"] = f.read()
+            return None
+
+        with patch("georiva.ingestion.time_extraction.format_registry") as mock_registry:
+            mock_registry.get_for_file.side_effect = get_for_file
+            extract_times("unrecognised.grib2", "YYYYMMDD", file_obj=BytesIO(content))
+
+        self.assertEqual(seen["content"], content)
@@ -5,13 +5,16 @@ periodic Sweep and the feed page's "Check unprocessed files" action.
 Storage listing is mocked (like the sweep tests) — the behavior under test
 is classification and prefix scoping, not MinIO I/O.
 """
+from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
 from django.test import TestCase
 
+from georiva.core.models import Catalog, Collection, Item
 from georiva.core.storage import BucketType
 from georiva.ingestion.models import FileIngestion
 from georiva.ingestion.unprocessed import find_unprocessed
+from georiva.organisations.testing import make_organisation
 
 
 def _scan(listing_by_bucket, prefix=None):
@@ -19,7 +22,7 @@ def _scan(listing_by_bucket, prefix=None):
     {BucketType.X: [path, ...]}."""
     def bucket_for(bucket_type):
         bucket = MagicMock()
-        bucket.list_files.return_value = [
+        bucket.iter_files.return_value = [
             {"path": p} for p in listing_by_bucket.get(bucket_type, [])
         ]
         return bucket
@@ -101,3 +104,40 @@ class FindUnprocessedClassificationTests(TestCase):
             [f.file_path for f in found],
             ["chirps/col/a.tif", "chirps/col/c.tif"],
         )
+
+
+class FindUnprocessedQueryTests(TestCase):
+    def test_completed_file_reingested_only_without_live_items(self):
+        for name in ("live.tif", "dead.tif"):
+            FileIngestion.objects.create(
+                bucket=BucketType.SOURCES, file_path=f"cat/col/{name}",
+                status=FileIngestion.Status.COMPLETED,
+            )
+        catalog = Catalog.objects.create(
+            organisation=make_organisation(), name="Cat", slug="cat",
+            file_format="geotiff",
+        )
+        Item.objects.create(
+            collection=Collection.objects.create(catalog=catalog, slug="col", name="col"),
+            time=datetime(2024, 5, 1, tzinfo=timezone.utc),
+            source_file=f"{BucketType.SOURCES}:cat/col/live.tif",
+        )
+
+        found = _scan({BucketType.SOURCES: ["cat/col/live.tif", "cat/col/dead.tif"]})
+
+        self.assertEqual(
+            {f.file_path: f.reason for f in found}, {"cat/col/dead.tif": "reingest"},
+        )
+
+    def test_records_loaded_once_per_bucket_not_per_file(self):
+        paths = [f"cat/col/file{i}.tif" for i in range(20)]
+        for path in paths[:10]:
+            FileIngestion.objects.create(
+                bucket=BucketType.SOURCES, file_path=path,
+                status=FileIngestion.Status.PENDING,
+            )
+
+        with self.assertNumQueries(2):
+            found = _scan({BucketType.INCOMING: paths, BucketType.SOURCES: paths})
+
+        self.assertEqual(len(found), 40)
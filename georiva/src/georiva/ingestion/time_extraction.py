@@ -57,6 +57,7 @@ def _parse_stem(stem: str, format_choice: str):
 
 
 def _fill_from_content(filename: str, file_obj, result: dict):
+    import shutil
     import tempfile
 
     ext = Path(filename).suffix.lower()
@@ -67,23 +68,27 @@ def _fill_from_content(filename: str, file_obj, result: dict):
     tmp_path = None
     try:
         with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
-            tmp.write(file_obj.read())
             tmp_path = tmp.name
+            # Streamed in 1 MB chunks — a GRIB/NetCDF upload can be larger
+            # than the worker's memory headroom.
+            shutil.copyfileobj(file_obj, tmp, length=1024 * 1024)
 
         plugin = format_registry.get_for_file(tmp_path)
         if plugin is None:
             return
 
-        variables = plugin.list_variables(tmp_path)
-        if not variables:
-            return
+        with plugin:
+            variables = plugin.list_variables(tmp_path)
+            if not variables:
+                return
 
-        first_var = variables[0]
-        var_name = first_var.get("name") or first_var.get("key")
-        if not var_name:
-            return
+            first_var = variables[0]
+            var_name = first_var.get("name") or first_var.get("key")
+            if not var_name:
+                return
+
+            timestamps = plugin.get_timestamps(tmp_path, var_name)
 
-        timestamps = plugin.get_timestamps(tmp_path, var_name)
         if timestamps and "valid_time" not in result:
             result["valid_time"] = timestamps[0]
 
@@ -16,8 +16,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
+
+from django.conf import settings
 
 from georiva.core.storage.filename import validate_path
 from georiva.core.storage import BucketType, storage
@@ -86,14 +87,31 @@ def find_unprocessed(prefix: str | None = None) -> list[UnprocessedFile]:
     """Scan the incoming and sources buckets (optionally under a path
     prefix) and classify files needing Ingestion. Read-only: registers
     nothing, dispatches nothing."""
+    return list(iter_unprocessed(prefix))
+
+
+def iter_unprocessed(prefix: str | None = None) -> Iterator[UnprocessedFile]:
+    """find_unprocessed, yielding each file as the bucket listing reaches
+    it — the Sweep dispatches while the listing is still paging. Each
+    bucket's top-level (organisation) directories are listed concurrently,
+    GEORIVA_LISTING_CONCURRENCY at a time.
+
+    Each bucket's FileIngestion records, and the source files its Items
+    came from, are loaded with one query apiece up front — not one per
+    listed file."""
     from georiva.ingestion.models import FileIngestion
 
-    found = []
     for bucket_type in [BucketType.INCOMING, BucketType.SOURCES]:
         bucket = storage.bucket(bucket_type)
-        for f in bucket.list_files(recursive=True):
+        records = _tracked_records(bucket_type, prefix)
+        live = None
+
+        for f in bucket.iter_files(
+                recursive=True, concurrency=settings.GEORIVA_LISTING_CONCURRENCY,
+        ):
             path = f["path"]
-            filename = Path(path).name
+            # Object keys are always "/"-separated; no PurePath per key.
+            filename = path.rpartition("/")[2]
 
             if filename.startswith(".") or filename == ".keep":
                 continue
@@ -104,28 +122,60 @@ def find_unprocessed(prefix: str | None = None) -> list[UnprocessedFile]:
             except ValueError:
                 continue
 
-            record = FileIngestion.objects.filter(
-                bucket=bucket_type, file_path=path
-            ).first()
+            record = records.get(path)
 
             if record is None:
                 reason = "untracked"
-            elif record.force_reingest or (
-                record.status == FileIngestion.Status.COMPLETED
-                and not record.has_live_data
-            ):
-                # force_reingest wins regardless of status — matches the
-                # pre-extraction sweep.
-                reason = "reingest"
-            elif record.status == FileIngestion.Status.PENDING:
-                reason = "pending"
             else:
-                continue
-
-            found.append(UnprocessedFile(
+                status, force_reingest = record
+                if force_reingest:
+                    # force_reingest wins regardless of status — matches the
+                    # pre-extraction sweep.
+                    reason = "reingest"
+                elif status == FileIngestion.Status.COMPLETED:
+                    if live is None:
+                        live = _live_source_files(bucket_type, prefix)
+                    if f"{bucket_type}:{path}" in live:
+                        continue
+                    reason = "reingest"
+                elif status == FileIngestion.Status.PENDING:
+                    reason = "pending"
+                else:
+                    continue
+
+            yield UnprocessedFile(
                 bucket=bucket_type,
                 file_path=path,
                 reason=reason,
                 reference_time=meta.get("reference_time"),
-            ))
-    return found
+            )
+
+
+def _tracked_records(bucket_type: str, prefix: str | None) -> dict[str, tuple[str, bool]]:
+    """(status, force_reingest) of every FileIngestion record in the
+    bucket, by file path."""
+    from georiva.ingestion.models import FileIngestion
+
+    records = FileIngestion.objects.filter(bucket=bucket_type)
+    if prefix:
+        records = records.filter(file_path__startswith=prefix)
+    return {
+        file_path: (status, force_reingest)
+        for file_path, status, force_reingest in records.values_list(
+            "file_path", "status", "force_reingest",
+        ).iterator(chunk_size=5000)
+    }
+
+
+def _live_source_files(bucket_type: str, prefix: str | None) -> set[str]:
+    """Source files (``bucket:path``) in the bucket that still have Items —
+    the bulk form of ``FileIngestion.has_live_data``."""
+    from georiva.core.models import Item
+
+    return set(
+        Item.objects
+        .filter(source_file__startswith=f"{bucket_type}:{prefix or ''}")
+        .values_list("source_file", flat=True)
+        .distinct()
+        .iterator(chunk_size=5000)
+    )
@@ -334,22 +334,22 @@ def upload_wizard_upload_sample(request):
         if plugin is None:
             return JsonResponse({"error": str(_("Unsupported file format: %s") % uploaded.name)})
 
-        raw_variables = plugin.list_variables(tmp_path)
-        if not raw_variables:
-            return JsonResponse({"error": str(_("No variables found in the uploaded file."))})
+        with plugin:
+            raw_variables = plugin.list_variables(tmp_path)
+            if not raw_variables:
+                return JsonResponse({"error": str(_("No variables found in the uploaded file."))})
+
+            variables = []
+            for v in raw_variables:
+                entry = {
+                    "name": v.get("name", ""),
+                    "long_name": v.get("long_name", ""),
+                    "units": v.get("units", ""),
+                }
+                entry.update(_scan_value_range(plugin, tmp_path, v))
+                entry.update(_resolve_unit(entry["units"]))
+                variables.append(entry)
 
-        variables = []
-        for v in raw_variables:
-            entry = {
-                "name": v.get("name", ""),
-                "long_name": v.get("long_name", ""),
-                "units": v.get("units", ""),
-            }
-            entry.update(_scan_value_range(plugin, tmp_path, v))
-            entry.update(_resolve_unit(entry["units"]))
-            variables.append(entry)
-
-        plugin.clear_cache()
         return JsonResponse({"variables": variables, "sample_filename": uploaded.name})
 
     except Exception as exc:
@@ -1,35 +1,263 @@
-from datetime import datetime
-from typing import Generator, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Callable, Generator, Optional, TypeVar
 
 import numpy as np
 import pandas as pd
-import pytz
 
 from georiva.core.unit_utils import ureg
 
+try:
+    import numexpr
+except ImportError:
+    # Optional — without it a scale-and-offset conversion is two NumPy passes
+    numexpr = None
+
+#: Arrays at least this large take a scale-and-offset conversion in one
+#: numexpr pass (when numexpr is installed); below it NumPy's two passes
+#: stay in cache anyway.
+NUMEXPR_MIN_BYTES = 4 * 1024 * 1024
+
+T = TypeVar("T")
+
+
+def apply_unit_conversion(
+        data: np.ndarray,
+        source_unit=None,
+        output_unit=None,
+        out: Optional[np.ndarray] = None,
+        inplace: bool = False,
+) -> np.ndarray:
+    """
+    Convert *data* from *source_unit* to *output_unit* via pint.
+
+    With *out* the result is written into that array (which may be *data*
+    itself, or a view into a larger buffer) and *out* is returned.
+    *inplace* makes *data* its own *out* — for callers that own a float32
+    array they no longer need in source units; other dtypes still get a
+    new float32 array.
+
+    Nearly every unit conversion is affine (K → °C, Pa → hPa, m s-1 →
+    km h-1, m²/s² → gpdam), so pint is asked once per unit pair for the
+    scale and offset and the array takes a multiply-add straight into the
+    destination — no pint Quantity, and no converted temporary to copy
+    from (see ``_apply_affine``). Anything else (logarithmic units) still
+    goes through pint.
+    """
+    if out is None and inplace and _writeable_float32(data):
+        out = data
 
-def apply_unit_conversion(data: np.ndarray, source_unit=None, output_unit=None) -> np.ndarray:
     if not source_unit or not output_unit or source_unit == output_unit:
-        return data
-    quantity = ureg.Quantity(data, source_unit.pint_unit)
-    return np.asarray(quantity.to(output_unit.pint_unit).magnitude, dtype=np.float32)
+        converted = data
+    else:
+        affine = _affine_conversion(source_unit.symbol, output_unit.symbol)
+        if affine is not None:
+            return _apply_affine(data, *affine, out=out)
+        quantity = ureg.Quantity(data, source_unit.pint_unit)
+        converted = quantity.to(output_unit.pint_unit).magnitude
+    
+    if out is None:
+        return converted if converted is data else np.asarray(converted, dtype=np.float32)
+    if converted is not out:
+        np.copyto(out, converted, casting="same_kind")
+    return out
+
+
+def apply_unit_conversion_chain(
+        data: np.ndarray,
+        units,
+        out: Optional[np.ndarray] = None,
+        inplace: bool = False,
+) -> np.ndarray:
+    """
+    Convert *data* through each unit of *units* in turn — the first is
+    the source unit, the last the output unit.
+
+    Consecutive affine steps compose into one (scale, offset), so the whole
+    run is a single conversion over the array rather than one per step;
+    a non-affine step is applied on its own via ``apply_unit_conversion``.
+    *out* and *inplace* are as for ``apply_unit_conversion``.
+    """
+    units = [unit for unit in units if unit]
+    scale, offset, pending = 1.0, 0.0, False
+    for previous, unit in zip(units, units[1:]):
+        if previous == unit:
+            continue
+        affine = _affine_conversion(previous.symbol, unit.symbol)
+        if affine is not None:
+            step_scale, step_offset = affine
+            scale, offset = scale * step_scale, offset * step_scale + step_offset
+            pending = True
+            continue
+        # Flush the affine run so far, then take this step through pint;
+        # either way the result is a new array this call can reuse.
+        if pending:
+            data = _apply_affine(data, scale, offset, inplace=inplace)
+            scale, offset, pending = 1.0, 0.0, False
+        data = apply_unit_conversion(data, previous, unit, inplace=inplace)
+        inplace = True
+
+    if pending:
+        return _apply_affine(data, scale, offset, out=out, inplace=inplace)
+    return apply_unit_conversion(data, out=out, inplace=inplace)
+
+
+def _apply_affine(
+        data: np.ndarray,
+        scale: float,
+        offset: float,
+        out: Optional[np.ndarray] = None,
+        inplace: bool = False,
+) -> np.ndarray:
+    """
+    ``data × scale + offset`` as float32, into *out*.
+
+    A pure offset (K → °C) or pure scale (Pa → hPa) is one ufunc pass. A
+    scale and an offset both is one numexpr pass over large float32
+    arrays, and a multiply then an in-place add otherwise.
+    """
+    if out is None and inplace and _writeable_float32(data):
+        out = data
+    if out is None:
+        out = np.empty(data.shape, dtype=np.float32)
+
+    if scale == 1.0:
+        np.add(data, offset, out=out, casting="unsafe")
+    elif not offset:
+        np.multiply(data, scale, out=out, casting="unsafe")
+    elif (
+            numexpr is not None
+            and data.nbytes >= NUMEXPR_MIN_BYTES
+            and data.dtype == np.float32
+            and out.dtype == np.float32
+    ):
+        # float32 operands keep numexpr from computing in float64
+        numexpr.evaluate(
+            "x * scale + offset",
+            local_dict={"x": data, "scale": np.float32(scale), "offset": np.float32(offset)},
+            out=out,
+        )
+    else:
+        np.multiply(data, scale, out=out, casting="unsafe")
+        np.add(out, offset, out=out)
+    return out
+
+
+def _writeable_float32(data) -> bool:
+    return (
+        isinstance(data, np.ndarray)
+        and data.dtype == np.float32
+        and data.flags.writeable
+    )
+
+
+@lru_cache(maxsize=256)
+def _affine_conversion(source_symbol: str, output_symbol: str) -> Optional[tuple[float, float]]:
+    """
+    (scale, offset) with output = source × scale + offset, or None when the
+    conversion is not affine.
+
+    Probed by converting a few values through pint exactly as
+    ``apply_unit_conversion`` would, and checking they fit one line.
+    """
+    probe = np.array([0.0, 1.0, 2.0, 1000.0, -1000.0])
+    try:
+        with np.errstate(all="ignore"):
+            converted = ureg.Quantity(probe, ureg(source_symbol)).to(ureg(output_symbol)).magnitude
+    except Exception:
+        return None
+    converted = np.asarray(converted, dtype=np.float64)
+    offset = converted[0]
+    scale = converted[1] - offset
+    if not np.all(np.isfinite(converted)) or not np.allclose(
+            converted, probe * scale + offset, rtol=1e-9, atol=1e-9,
+    ):
+        return None
+    return float(scale), float(offset)
 
 
 def iter_windows(
         width: int,
         height: int,
-        block_size: int = 2048
+        block_size: int = 2048,
+        offset: tuple[int, int] = (0, 0),
+        native_block: Optional[tuple[int, int]] = None,
 ) -> Generator[tuple[int, int, int, int], None, None]:
     """
     Yield (x_offset, y_offset, width, height) windows for chunked processing.
+
+    *offset* is the (x, y) position of the width × height read window in
+    the source grid. Window edges fall on source-grid multiples of
+    block_size rather than of the read window, so the first row / column
+    may be narrower: a power-of-two source block (GeoTIFF tiles are 256 or
+    512) then lies inside exactly one window instead of being decoded again
+    by each window that straddles it.
+
+    *native_block* is the source's internal (rows, cols) block shape, as
+    rasterio's ``block_shapes`` gives it. Each axis's block_size is rounded
+    up to a multiple of it, so blocks that do not divide 2048 — 300-pixel
+    tiles, 1000-row strips — are still never split between windows. A
+    block larger than block_size (a full-width strip of a wide grid) is
+    left to the default cuts rather than growing every window past it.
     """
-    for y in range(0, height, block_size):
-        h = min(block_size, height - y)
-        for x in range(0, width, block_size):
-            w = min(block_size, width - x)
+    x_off, y_off = offset
+    x_block = y_block = block_size
+    if native_block:
+        rows, cols = native_block
+        x_block = _snap_up(block_size, cols)
+        y_block = _snap_up(block_size, rows)
+    columns = list(_aligned_spans(width, x_block, x_off))
+    for y, h in _aligned_spans(height, y_block, y_off):
+        for x, w in columns:
             yield x, y, w, h
 
 
+def process_tiles(
+        width: int,
+        height: int,
+        fn: Callable[[int, int, int, int], T],
+        block_size: int = 2048,
+        offset: tuple[int, int] = (0, 0),
+        native_block: Optional[tuple[int, int]] = None,
+        max_workers: int = 1,
+) -> list[T]:
+    """
+    Call ``fn(x, y, w, h)`` for every ``iter_windows`` window and return
+    the results in window order.
+
+    With *max_workers* > 1 the tiles run on a thread pool — rasterio reads
+    and NumPy kernels release the GIL — so *fn* must only touch its own
+    tile. The pool takes every window up front, so *fn* should write its
+    tile into a shared output or return something small (per-tile stats),
+    not the tile itself. Consuming the results re-raises the first failure.
+    """
+    windows = list(iter_windows(
+        width, height, block_size=block_size, offset=offset, native_block=native_block,
+    ))
+    workers = min(max_workers, len(windows))
+    if workers <= 1:
+        return [fn(*window) for window in windows]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="georiva-tiles") as pool:
+        return list(pool.map(lambda window: fn(*window), windows))
+
+
+def _snap_up(size: int, multiple: int) -> int:
+    """*size* rounded up to a multiple of *multiple*, if that is 1..size."""
+    if not 1 <= multiple <= size:
+        return size
+    return -(-size // multiple) * multiple
+
+
+def _aligned_spans(length: int, block_size: int, start: int):
+    """(position, size) spans of [0, length) cut at source multiples of block_size."""
+    pos = 0
+    while pos < length:
+        end = min(length, ((start + pos) // block_size + 1) * block_size - start)
+        yield pos, end - pos
+        pos = end
+
+
 def normalize_bounds(bounds: list | tuple) -> list:
     """
     Normalise bounds to valid WGS84 range.
@@ -59,41 +287,168 @@ def ensure_utc(dt) -> Optional[datetime]:
     Coerce any datetime-like value to a timezone-aware UTC datetime.
 
     Handles: str, pandas Timestamp, numpy datetime64, and Python datetime.
-    Naive datetimes are assumed to be UTC.
+    Naive datetimes are assumed to be UTC. Plain datetimes — what plugins
+    return — take a fast path; the stdlib UTC tzinfo is used throughout.
     """
     if dt is None:
         return None
     
-    if isinstance(dt, str):
-        dt = pd.Timestamp(dt).to_pydatetime()
-    
-    if isinstance(dt, pd.Timestamp):
-        dt = dt.to_pydatetime()
-    
-    if isinstance(dt, np.datetime64):
+    # Exact type: pd.Timestamp subclasses datetime but must be unwrapped
+    if type(dt) is not datetime:
         dt = pd.Timestamp(dt).to_pydatetime()
     
     if dt.tzinfo is None:
-        return pytz.utc.localize(dt)
+        return dt.replace(tzinfo=timezone.utc)
     
-    return dt.astimezone(pytz.utc)
+    return dt.astimezone(timezone.utc)
+
+
+#: Nodata value of quantized COGs; valid pixels span -32767..32767.
+QUANTIZED_NODATA = -32768
+
+
+def quantization(value_min: float, value_max: float) -> tuple[float, float]:
+    """
+    (scale, offset) mapping value_min..value_max onto the 65534 int16 steps
+    -32767..32767, so that ``value = stored * scale + offset`` — the GDAL
+    band scale/offset convention readers decode with.
+    """
+    scale = (value_max - value_min) / 65534
+    return scale, value_min + 32767 * scale
 
 
-def compute_stats(data: np.ndarray) -> dict:
+def quantize(data: np.ndarray, scale: float, offset: float) -> np.ndarray:
+    """
+    Encode a float array as int16 under *scale* / *offset* (see
+    ``quantization``). Values outside the range are clamped to it; NaN
+    becomes QUANTIZED_NODATA.
+    """
+    scaled = (data - offset) / scale
+    np.clip(scaled, -32767, 32767, out=scaled)
+    np.rint(scaled, out=scaled)
+    out = np.empty(data.shape, dtype=np.int16)
+    with np.errstate(invalid="ignore"):
+        # NaN casts to garbage here; it is overwritten just below
+        np.copyto(out, scaled, casting="unsafe")
+    out[np.isnan(data)] = QUANTIZED_NODATA
+    return out
+
+
+class RunningStats:
+    """
+    Mergeable min/max/mean/std accumulator over blocks of a raster.
+
+    Feeding a raster block by block gives the same result as reducing it
+    whole, while only one block ever has to be resident. Block moments are
+    combined with the parallel-variance update (Chan et al.), which stays
+    numerically stable when blocks have very different means.
+
+    NaN pixels are ignored, matching the nan* reductions.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, block: np.ndarray) -> None:
+        values = block.ravel()
+        nan = np.isnan(values)
+        # Dense blocks (the common case for unclipped data) skip the
+        # boolean compaction copy entirely.
+        if nan.any():
+            values = values[~nan]
+        n = values.size
+        if n == 0:
+            return
+
+        # The squared deviations are summed from the centred values in
+        # float64: sumsq - sum * mean cancels catastrophically when the
+        # spread is tiny next to the mean (e.g. pressure in Pa).
+        block_mean = float(np.add.reduce(values, dtype=np.float64)) / n
+        centred = values.astype(np.float64) - block_mean
+        block_m2 = float(np.einsum('i,i->', centred, centred))
+
+        self._combine(
+            n, block_mean, block_m2, float(values.min()), float(values.max()),
+        )
+
+    def merge(self, other: "RunningStats") -> None:
+        """Fold in another accumulator — e.g. one per concurrently read tile."""
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    def _combine(self, n: int, mean: float, m2: float, minimum: float, maximum: float) -> None:
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+
+    def result(self) -> dict:
+        if self.count == 0:
+            return {"min": None, "max": None, "mean": None, "std": None}
+        return {
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "std": float(np.sqrt(self.m2 / self.count)),
+        }
+
+
+def compute_stats(data: np.ndarray, max_pixels: int = 0) -> dict:
     """
     Compute basic descriptive statistics from a masked float array.
 
-    Uses nanmin/nanmax/nanmean/nanstd so that NaN nodata pixels
-    (introduced by clipping or source data) are excluded.
+    NaN nodata pixels (introduced by clipping or source data) are excluded.
+    Runs as a single RunningStats block — one NaN scan, then min, max,
+    sum and centred sum of squares — rather than four separate nan*
+    reductions, each of which re-scans the array for NaNs.
+
+    With *max_pixels* set and exceeded, mean/std come from a regular grid
+    subsample of about max_pixels pixels (as GDAL's approximate statistics
+    do); min/max are still exact. 0 (the default) always computes exactly.
 
     Returns None values on failure — stats should not abort asset creation.
     """
     try:
-        return {
-            "min": float(np.nanmin(data)),
-            "max": float(np.nanmax(data)),
-            "mean": float(np.nanmean(data)),
-            "std": float(np.nanstd(data)),
-        }
+        data = np.asarray(data)
+        
+        if max_pixels and data.ndim == 2 and data.size > max_pixels:
+            stats = _compute_sampled_stats(data, max_pixels)
+            if stats is not None:
+                return stats
+        
+        stats = RunningStats()
+        stats.update(data)
+        return stats.result()
     except Exception:
         return {"min": None, "max": None, "mean": None, "std": None}
+
+
+def _compute_sampled_stats(data: np.ndarray, max_pixels: int) -> Optional[dict]:
+    """
+    Mean/std from every step-th row and column, min/max from the full array.
+
+    Sampling both axes (rather than every n-th element of the flat array)
+    avoids the stride locking onto a single column when it divides the width.
+    Returns None if the sample holds no valid pixels — the caller then falls
+    back to exact stats.
+    """
+    step = int(np.ceil(np.sqrt(data.size / max_pixels)))
+    
+    sample = RunningStats()
+    sample.update(np.ascontiguousarray(data[::step, ::step]))
+    stats = sample.result()
+    
+    if stats["min"] is None:
+        return None
+    
+    stats["min"] = float(np.nanmin(data))
+    stats["max"] = float(np.nanmax(data))
+    return stats
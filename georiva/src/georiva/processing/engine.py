@@ -118,12 +118,14 @@ def _register_item(out_item, recipe: BaseRecipe, input_hash: str):
     return item
 
 
-def _register_asset(item, oa, writer, materializer, clipper=None):
+def _register_asset(item, oa, writer, materializer, clipper=None, defer_save=False):
     """Materialize an array asset through the shared ingestion sequence, or
     copy a passthrough object as-is. Returns ``(assets, grid)`` where ``grid``
     is the ``(bounds, width, height)`` the array was actually written with
     (post-crop) — ``run_unit`` stamps the item with it — or None for
-    passthrough/skipped assets.
+    passthrough/skipped assets. With *defer_save* the rows — array and
+    passthrough alike — come back unsaved, for one
+    ``materializer.save_assets`` call per item.
 
     An array OutputAsset always yields the served pair — COG + JSON sidecar —
     via ``AssetMaterializer``, exactly what ingestion writes. Visual textures
@@ -160,6 +162,7 @@ def _register_asset(item, oa, writer, materializer, clipper=None):
             clipper=clipper,
             stats=stats,
             checksum=oa.checksum,
+            defer_save=defer_save,
         )
         height, width = data.shape[:2]
         return assets, (list(bounds), width, height)
@@ -170,21 +173,24 @@ def _register_asset(item, oa, writer, materializer, clipper=None):
         data = storage.bucket(src_bucket_type).read_bytes(src_href)
         href = writer.bucket.save(path, data)
         stats = oa.stats or {}
+        fields = {
+            "href": href,
+            "roles": list(oa.roles),
+            "checksum": oa.checksum,
+            "width": oa.width,
+            "height": oa.height,
+            "stats_min": stats.get("min"),
+            "stats_max": stats.get("max"),
+            "stats_mean": stats.get("mean"),
+            "stats_std": stats.get("std"),
+        }
+        if defer_save:
+            return [Asset(item=item, variable=oa.variable, format=oa.format, **fields)], None
         asset, _ = Asset.objects.update_or_create(
             item=item,
             variable=oa.variable,
             format=oa.format,
-            defaults={
-                "href": href,
-                "roles": list(oa.roles),
-                "checksum": oa.checksum,
-                "width": oa.width,
-                "height": oa.height,
-                "stats_min": stats.get("min"),
-                "stats_max": stats.get("max"),
-                "stats_mean": stats.get("mean"),
-                "stats_std": stats.get("std"),
-            },
+            defaults=fields,
         )
         return [asset], None
 
@@ -384,15 +390,22 @@ def run_unit(recipe: BaseRecipe, unit: ProductionUnit, *, writer=None, worker_id
         with transaction.atomic():
             item = _register_item(out_item, recipe, ihash)
             item_grid = None
+            pending = []
             for j, oa in enumerate(out_assets, 1):
                 logger.info(
                     "[unit %s] %s   asset %d/%d — variable=%s format=%s roles=%s",
                     pos, tag, j, len(out_assets),
                     getattr(oa.variable, "slug", "?"), oa.format, ",".join(oa.roles),
                 )
-                _, grid = _register_asset(item, oa, writer, materializer, clipper)
+                assets, grid = _register_asset(
+                    item, oa, writer, materializer, clipper, defer_save=True,
+                )
+                pending.extend(assets)
                 if item_grid is None and grid is not None:
                     item_grid = grid
+            # Every asset row upserted in one statement per item
+            if pending:
+                materializer.save_assets(pending)
             if item_grid is not None:
                 # The grid the arrays were actually written with (post-crop) —
                 # the one source of truth the map places the PNG by.
@@ -1,10 +1,11 @@
 """
 Reading stored rasters back for derivation.
 
-One reader, one contract: single band, float32, nodata mapped to NaN, and
-always north-up — a south-up raster (positive row pitch, ``transform.e > 0``)
-is flipped so row 0 is north, the orientation every downstream consumer
-assumes (parity with ``formats/geotiff.py`` at ingestion time).
+One reader, one contract: single band, float32 (a quantized COG's band
+scale/offset applied), nodata mapped to NaN, and always north-up — a
+south-up raster (positive row pitch, ``transform.e > 0``) is flipped so
+row 0 is north, the orientation every downstream consumer assumes
+(parity with ``formats/geotiff.py`` at ingestion time).
 """
 import numpy as np
 
@@ -22,6 +23,9 @@ def read_north_up(bucket_type, href):
         data = src.read(1).astype("float32")
         if src.nodata is not None:
             data = np.where(data == src.nodata, np.nan, data)
+        scale, offset = src.scales[0], src.offsets[0]
+        if (scale, offset) != (1.0, 0.0):
+            data = data * np.float32(scale) + np.float32(offset)
         if src.transform.e > 0:
             data = np.flipud(data)
         bounds = list(src.bounds)
@@ -302,6 +302,36 @@ class RegisterAssetMaterializationTests(_PromotionFixture):
         self.assertEqual(grid, ([0, 0, 1, 1], 2, 3))
         self.assertFalse(item.assets.filter(format=Asset.Format.PNG).exists())
 
+    def test_deferred_passthrough_asset_saved_with_the_batch(self):
+        from georiva.core.models import Asset
+        from georiva.processing.engine import _register_asset
+        from georiva.processing.recipe import OutputAsset
+
+        writer = _mock_writer()
+        item = self._item()
+        materializer = self._materializer(writer)
+
+        with patch("georiva.core.storage.storage") as storage:
+            storage.bucket.return_value.read_bytes.return_value = b"tiff"
+            assets, grid = _register_asset(
+                item,
+                OutputAsset(variable=self.variable, roles=["data"], format="cog",
+                            passthrough=("sources", "in/file.tif"),
+                            width=2, height=3, checksum="abc"),
+                writer,
+                materializer,
+                defer_save=True,
+            )
+
+        self.assertIsNone(grid)
+        self.assertIsNone(assets[0].pk)
+        self.assertFalse(item.assets.exists())
+
+        materializer.save_assets(assets)
+
+        saved = item.assets.get(format=Asset.Format.COG)
+        self.assertEqual((saved.width, saved.height, saved.checksum), (2, 3, "abc"))
+
     def test_explicit_png_output_asset_is_skipped(self):
         import numpy as np
 
@@ -592,8 +592,7 @@ class Loader:
     
     def _store_file(self, local_path: Path, storage_path: str):
         """Store file in permanent storage for this feed's target tier."""
-        with open(local_path, 'rb') as f:
-            self._tier_bucket.save(storage_path, f)
+        self._tier_bucket.upload(local_path, storage_path)
     
     # =========================================================================
     # Temp Directory Management
@@ -96,6 +96,6 @@ class TargetTierRoutingTests(TestCase):
                 loader._store_file(Path(tmp.name), "cmip6/tas/series.nc")
 
             mock_storage.bucket.assert_called_with(BucketType.STAGING)
-            self.assertTrue(bucket.save.called)
+            self.assertTrue(bucket.upload.called)
         finally:
             os.unlink(tmp.name)
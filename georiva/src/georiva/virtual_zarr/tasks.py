@@ -91,7 +91,7 @@ def _run_build(manifest: VirtualZarrManifest) -> None:
         queryset=Asset.objects.filter(
             variable=variable,
             format=Asset.Format.COG,
-        ).only("href", "item_id"),  # only columns we need
+        ).only("href", "item_id", "extra_fields"),  # only columns we need
         to_attr="cog_assets",
     )
     
@@ -104,6 +104,7 @@ def _run_build(manifest: VirtualZarrManifest) -> None:
     )
     
     rows = []
+    encodings = set()
     skipped = 0
     for item in items_qs.iterator(chunk_size=500):
         if not item.cog_assets:
@@ -114,6 +115,7 @@ def _run_build(manifest: VirtualZarrManifest) -> None:
             "date": pd.Timestamp(item.time),
             "url": config.url_for(item.cog_assets[0].href),
         })
+        encodings.add(_cog_encoding(item.cog_assets[0]))
     
     if skipped:
         logger.warning(
@@ -128,6 +130,18 @@ def _run_build(manifest: VirtualZarrManifest) -> None:
             "Ingest data before building the manifest."
         )
     
+    # One manifest array has one dtype and one scale: float32 COGs and
+    # quantized ones — or quantized ones from before value_min/value_max
+    # were edited — cannot be concatenated into it.
+    if len(encodings) > 1:
+        raise ValueError(
+            f"COG assets of {collection}/{variable.slug} are stored with "
+            f"{len(encodings)} different encodings (quantize or the value "
+            "range changed between ingestions). Re-ingest them so they "
+            "share one before building the manifest."
+        )
+    (encoding,) = encodings
+    
     url_df = pd.DataFrame(rows)
     item_count = len(url_df)
     
@@ -150,6 +164,7 @@ def _run_build(manifest: VirtualZarrManifest) -> None:
             url_df=url_df,
             output_path=tmp_path,
             variable_name=variable.slug,
+            encoding=dict(zip(("scale", "offset", "nodata"), encoding)) if encoding else None,
         )
         
         # ------------------------------------------------------------------
@@ -196,6 +211,14 @@ def _run_build(manifest: VirtualZarrManifest) -> None:
     )
 
 
+def _cog_encoding(asset: Asset) -> tuple | None:
+    """(scale, offset, nodata) of a quantized COG Asset, None for float32."""
+    extra = asset.extra_fields or {}
+    if "scale" not in extra:
+        return None
+    return extra["scale"], extra["offset"], extra["nodata"]
+
+
 # =============================================================================
 # Sweep task
 # =============================================================================
@@ -261,6 +261,7 @@ class VirtualZarrBuilder:
             url_df: pd.DataFrame,
             output_path: str | Path,
             variable_name: str = "data",
+            encoding: dict | None = None,
     ) -> Path:
         """
         Build and serialise a kerchunk manifest.
@@ -274,6 +275,12 @@ class VirtualZarrBuilder:
         variable_name : str
             Name for the data variable in the output dataset.  The raw IFD
             index variable (``"0"``) is renamed to this value.
+        encoding : dict or None
+            ``scale`` / ``offset`` / ``nodata`` shared by every COG when they
+            are quantized int16 (see ``AssetMaterializer._encoding``). Written
+            as the CF ``scale_factor`` / ``add_offset`` / ``missing_value``
+            attributes, so readers decode the stored codes to values and
+            mask the nodata code.
 
         Returns
         -------
@@ -293,6 +300,13 @@ class VirtualZarrBuilder:
         if raw_var != variable_name:
             combined = combined.rename({raw_var: variable_name})
         
+        if encoding:
+            combined[variable_name].attrs.update(
+                scale_factor=encoding["scale"],
+                add_offset=encoding["offset"],
+                missing_value=encoding["nodata"],
+            )
+        
         logger.info("Rewriting chunk URLs to s3:// URIs…")
         combined = combined.vz.rename_paths(self.config.s3_uri_for)
         
@@ -1,5 +1,6 @@
 import json
 import logging
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Annotated, Optional
 
@@ -9,6 +10,7 @@ from fastapi import Depends, HTTPException, Path, Query
 from rio_tiler.models import ImageData
 from rio_tiler.types import ColorMapType
 from titiler.core.algorithm.base import BaseAlgorithm
+from titiler.core.dependencies import DatasetParams
 
 from app.config import (
     DJANGO_BASE_URL,
@@ -216,3 +218,19 @@ def SemanticRescale(
 ) -> Optional[BaseAlgorithm]:
     """Return a rescale algorithm using vmin/vmax from the tile config."""
     return RescaleAlgorithm(vmin=tile_config["vmin"], vmax=tile_config["vmax"])
+
+
+@dataclass
+class SemanticDatasetParams(DatasetParams):
+    """Dataset options with ``unscale`` on by default.
+
+    Quantized variables are stored as int16 with a band scale/offset; tile
+    configs hold vmin/vmax in the variable's units, so every read decodes
+    to those units first. A float COG has scale 1 / offset 0 and is
+    unaffected.
+    """
+
+    unscale: Annotated[
+        bool,
+        Query(description="Apply the band scale/offset to decode stored values."),
+    ] = True
@@ -17,6 +17,7 @@ from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 from app.config import TTL_ROOT_PATH
 from app.dependencies import (
     SemanticColorMap,
+    SemanticDatasetParams,
     SemanticPathParams,
     SemanticRescale,
     SemanticTileConfig,
@@ -38,6 +39,7 @@ TILE_ROUTE_PREFIX = "/{org_slug}/{catalog_slug}/{collection_slug}/{variable_slug
 
 cog = TilerFactory(
     path_dependency=SemanticPathParams,
+    dataset_dependency=SemanticDatasetParams,
     colormap_dependency=SemanticColorMap,
     process_dependency=SemanticRescale,
     router_prefix=TILE_ROUTE_PREFIX,
@@ -103,7 +105,8 @@ def encoded_preview(
     safe for exactly that reason: a range change arrives as a different URL.
     """
     with Reader(src_path) as src:
-        img = src.preview(max_size=max_size)
+        # Decode quantized COGs so the range below applies to real values
+        img = src.preview(max_size=max_size, unscale=True)
 
     img.rescale(in_range=((tile_config["vmin"], tile_config["vmax"]),))
 